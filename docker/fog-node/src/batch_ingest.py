@@ -0,0 +1,142 @@
+"""
+Batch Ingest
+Expande playlists/feeds con una sola sesion yt-dlp y crea + encola sus jobs en bloque
+"""
+import logging
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import yt_dlp
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on entries taken from a single playlist/feed
+MAX_BATCH_ENTRIES = 1000
+JOB_TTL_SECONDS = 30 * 24 * 60 * 60
+# Conditional puts in flight while creating a batch's jobs
+CREATE_CONCURRENCY = 16
+
+
+def expand_sources(source_urls: List[str], max_entries: int = MAX_BATCH_ENTRIES) -> List[str]:
+    """
+    Entry URLs of playlists/feeds (RSS goes through yt-dlp's generic
+    extractor). One YoutubeDL instance serves every source, and
+    extract_flat avoids resolving each entry here - the fog node that
+    processes the entry does that.
+    """
+    ydl_opts = {
+        'quiet': True,
+        'no_warnings': True,
+        'extract_flat': 'in_playlist',
+        'playlistend': max_entries,
+    }
+
+    urls = []
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        for source_url in source_urls:
+            info = ydl.extract_info(source_url, download=False)
+            entries = info.get('entries')
+            if entries is None:
+                # Not a playlist: the source is a single media URL
+                urls.append(info.get('webpage_url') or source_url)
+                continue
+            for entry in entries:
+                if not entry:
+                    continue
+                url = entry.get('webpage_url') or entry.get('url')
+                if url and url.startswith('http'):
+                    urls.append(url)
+                if len(urls) >= max_entries:
+                    break
+            logger.info(f"Expanded {source_url} into {len(urls)} entries so far")
+
+    # Keep the feed order, drop duplicates
+    return list(dict.fromkeys(urls))[:max_entries]
+
+
+def create_jobs(jobs_table, batch_id: str, urls: List[str], user_id: str,
+                model_size: str, tier: str,
+                admission_seconds: Optional[int] = None) -> List[Dict]:
+    """
+    Job items for every URL. Job ids derive from (batch, url) and each
+    put is conditional on the job not existing yet, so a redelivered batch
+    keeps the jobs it already created - and whatever progress they made -
+    instead of resetting them to pending. Those come back as stored, so
+    the caller can enqueue only the ones still pending. What the batch
+    paid at admission is split over its jobs, so the post-processor
+    settles each one against its real duration, as it does for single
+    submissions.
+    """
+    created_at = int(datetime.utcnow().timestamp())
+    jobs = [
+        {
+            "jobId": str(uuid.uuid5(uuid.NAMESPACE_URL, f"{batch_id}:{url}")),
+            "batchId": batch_id,
+            "createdAt": created_at,
+            "userId": user_id,
+            "url": url,
+            "status": "pending",
+            "progress": 0,
+            "message": f"Job created from batch {batch_id}",
+            "modelSize": model_size,
+            "tier": tier,
+            "ttl": created_at + JOB_TTL_SECONDS
+        }
+        for url in urls
+    ]
+    if admission_seconds is not None and jobs:
+        share, extra = divmod(int(admission_seconds), len(jobs))
+        for i, job in enumerate(jobs):
+            job["admissionSeconds"] = share + (1 if i < extra else 0)
+
+    exists = jobs_table.meta.client.exceptions.ConditionalCheckFailedException
+
+    def put_job(job: Dict) -> Dict:
+        # BatchWriteItem takes no conditions, so each job is its own put
+        try:
+            jobs_table.put_item(
+                Item=job,
+                ConditionExpression="attribute_not_exists(jobId)",
+                ReturnValuesOnConditionCheckFailure="ALL_OLD"
+            )
+            return job
+        except exists as e:
+            return e.response.get("Item") or jobs_table.get_item(
+                Key={"jobId": job["jobId"]}
+            ).get("Item", job)
+
+    if not jobs:
+        return jobs
+    with ThreadPoolExecutor(max_workers=min(CREATE_CONCURRENCY, len(jobs))) as executor:
+        jobs = list(executor.map(put_job, jobs))
+
+    logger.info(f"Created {len(jobs)} jobs for batch {batch_id}")
+    return jobs
+
+
+def enqueue_jobs(job_queue, jobs: List[Dict], send_concurrency: int):
+    """
+    Work queue messages for the jobs, `send_concurrency` SendMessageBatch
+    calls at a time. This only bounds how fast the batch is enqueued; how
+    many of its jobs run at once is up to the fleet consuming the queue.
+    """
+    messages = [
+        {
+            "type": "process",
+            "url": job["url"],
+            "job_id": job["jobId"],
+            "model_size": job["modelSize"]
+        }
+        for job in jobs
+    ]
+    groups = [messages[i:i + 10] for i in range(0, len(messages), 10)]
+    if not groups:
+        return
+
+    with ThreadPoolExecutor(max_workers=max(1, min(send_concurrency, len(groups)))) as executor:
+        # list() re-raises the first failed send
+        list(executor.map(job_queue.send_batch, groups))
+
+    logger.info(f"Enqueued {len(messages)} jobs in {len(groups)} requests")
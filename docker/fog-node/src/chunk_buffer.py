@@ -0,0 +1,143 @@
+"""
+Chunk Buffers
+Buffers preasignados y reutilizables para el chunker: ffmpeg escribe con readinto
+directamente detras de un hueco para la cabecera WAV, y los uploads leen vistas sin copiar
+"""
+import io
+import os
+import struct
+import threading
+from typing import List, Optional
+
+WAV_HEADER_SIZE = 44
+
+
+def write_wav_header(buf, data_size: int, sample_rate: int, channels: int):
+    """Write a 16-bit PCM WAV header into the first 44 bytes of buf"""
+    byte_rate = sample_rate * channels * 2
+    struct.pack_into(
+        '<4sI4s4sIHHIIHH4sI', buf, 0,
+        b'RIFF', data_size + 36, b'WAVE',
+        b'fmt ', 16, 1, channels, sample_rate, byte_rate, channels * 2, 16,
+        b'data', data_size
+    )
+
+
+class BufferPool:
+    """Process-wide free list of equally sized bytearrays"""
+
+    def __init__(self, buffer_size: int, max_free: int = 16):
+        self.buffer_size = buffer_size
+        self.max_free = max_free
+        self._free: List[bytearray] = []
+        self._lock = threading.Lock()
+
+    def get(self) -> bytearray:
+        with self._lock:
+            if self._free:
+                return self._free.pop()
+        return bytearray(self.buffer_size)
+
+    def put(self, buf: bytearray):
+        with self._lock:
+            if len(self._free) < self.max_free:
+                self._free.append(buf)
+
+
+class JobBuffers:
+    """
+    A job's share of the pool. At most `ceiling_bytes` of buffers are out
+    at once (minimum two: one being filled, one uploading); acquire()
+    blocks until an upload returns one, which also back-pressures ffmpeg.
+    """
+
+    def __init__(self, pool: BufferPool, ceiling_bytes: int):
+        self.pool = pool
+        self.limit = max(2, ceiling_bytes // pool.buffer_size)
+        self._slots = threading.Semaphore(self.limit)
+        self._lock = threading.Lock()
+        self.held = 0
+        self.peak = 0
+
+    def acquire(self) -> bytearray:
+        self._slots.acquire()
+        with self._lock:
+            self.held += 1
+            self.peak = max(self.peak, self.held)
+        return self.pool.get()
+
+    def release(self, buf: bytearray):
+        self.pool.put(buf)
+        with self._lock:
+            self.held -= 1
+        self._slots.release()
+
+    @property
+    def peak_bytes(self) -> int:
+        return self.peak * self.pool.buffer_size
+
+
+def read_chunk(stream, buf: bytearray) -> Optional[memoryview]:
+    """
+    Fill buf after the header slot with up to one chunk of PCM using
+    readinto (no intermediate bytes objects). Returns a view over header
+    + data, or None at end of stream. The header is written by the caller.
+    """
+    view = memoryview(buf)
+    filled = WAV_HEADER_SIZE
+    while filled < len(buf):
+        n = stream.readinto(view[filled:])
+        if not n:
+            break
+        filled += n
+    if filled == WAV_HEADER_SIZE:
+        return None
+    return view[:filled]
+
+
+class ViewReader(io.RawIOBase):
+    """
+    Seekable file-like body over a memoryview, so boto3 can checksum,
+    send and retry the upload without copying the chunk
+    """
+
+    def __init__(self, view: memoryview):
+        self._view = view
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        n = min(len(b), len(self._view) - self._pos)
+        b[:n] = self._view[self._pos:self._pos + n]
+        self._pos += n
+        return n
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            self._pos = offset
+        elif whence == io.SEEK_CUR:
+            self._pos += offset
+        else:
+            self._pos = len(self._view) + offset
+        self._pos = max(0, min(self._pos, len(self._view)))
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+    def __len__(self) -> int:
+        return len(self._view)
+
+
+def current_rss_bytes() -> int:
+    """Resident set size of this process (Linux /proc), 0 if unavailable"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return 0
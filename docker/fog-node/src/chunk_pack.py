@@ -0,0 +1,150 @@
+"""
+Chunk Pack Writer
+Empaqueta varios chunks WAV en un solo objeto S3 (multipart) + indice de offsets
+"""
+import json
+import logging
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# S3 multipart parts must be at least 5 MiB (except the last one)
+MIN_PART_SIZE = 5 * 1024 * 1024
+
+
+def pack_key(job_id: str, pack_num: int) -> str:
+    return f"audio/{job_id}/packs/pack_{pack_num:03d}.bin"
+
+
+def index_key(job_id: str, pack_num: int) -> str:
+    # The trigger Lambda is notified on the ".index.json" suffix
+    return f"audio/{job_id}/packs/pack_{pack_num:03d}.index.json"
+
+
+class ChunkPackWriter:
+    """
+    Streams WAV chunks into multipart "chunk pack" objects.
+
+    Each pack holds up to `max_chunks` chunks so transcription of the first
+    packs can start while the rest of the media is still streaming. When a
+    pack is sealed its index (chunk id -> byte offset/length) is written
+    next to it; that index object is what triggers transcription.
+    """
+
+    def __init__(self, s3_client, bucket: str, job_id: str, max_chunks: int,
+                 start_pack: int = 0):
+        self.s3 = s3_client
+        self.bucket = bucket
+        self.job_id = job_id
+        self.max_chunks = max(1, max_chunks)
+
+        # Resumed jobs continue after the packs that were already sealed
+        self.pack_num = start_pack
+        self._upload_id: Optional[str] = None
+        self._parts: List[Dict] = []
+        self._part_buffer = bytearray()
+        self._offset = 0
+        self._index: List[Dict] = []
+
+    def add(self, chunk_id: int, chunk_wav: bytes, duration: float) -> Dict:
+        """Append one WAV chunk, returns its location inside the pack"""
+        if self._upload_id is None:
+            self._start_pack()
+
+        entry = {
+            "chunk_id": chunk_id,
+            "offset": self._offset,
+            "length": len(chunk_wav),
+            "duration": duration
+        }
+        self._index.append(entry)
+        self._part_buffer += chunk_wav
+        self._offset += len(chunk_wav)
+
+        if len(self._part_buffer) >= MIN_PART_SIZE:
+            self._flush_part()
+
+        location = dict(entry, s3_key=pack_key(self.job_id, self.pack_num))
+
+        if len(self._index) >= self.max_chunks:
+            self._seal_pack()
+
+        return location
+
+    @property
+    def is_sealed(self) -> bool:
+        """True when every chunk added so far is in a completed pack"""
+        return self._upload_id is None
+
+    def close(self):
+        """Seal the pack in progress (if any)"""
+        if self._upload_id is not None:
+            self._seal_pack()
+
+    def abort(self):
+        """Abort the multipart upload in progress after a failure"""
+        if self._upload_id is None:
+            return
+        try:
+            self.s3.abort_multipart_upload(
+                Bucket=self.bucket,
+                Key=pack_key(self.job_id, self.pack_num),
+                UploadId=self._upload_id
+            )
+        except Exception as e:
+            logger.error(f"Error aborting pack upload: {e}")
+        self._upload_id = None
+
+    def _start_pack(self):
+        response = self.s3.create_multipart_upload(
+            Bucket=self.bucket,
+            Key=pack_key(self.job_id, self.pack_num),
+            ContentType="application/octet-stream"
+        )
+        self._upload_id = response["UploadId"]
+        self._parts = []
+        self._part_buffer = bytearray()
+        self._offset = 0
+        self._index = []
+
+    def _flush_part(self):
+        if not self._part_buffer:
+            return
+        part_number = len(self._parts) + 1
+        response = self.s3.upload_part(
+            Bucket=self.bucket,
+            Key=pack_key(self.job_id, self.pack_num),
+            UploadId=self._upload_id,
+            PartNumber=part_number,
+            Body=bytes(self._part_buffer)
+        )
+        self._parts.append({"PartNumber": part_number, "ETag": response["ETag"]})
+        self._part_buffer = bytearray()
+
+    def _seal_pack(self):
+        self._flush_part()
+        key = pack_key(self.job_id, self.pack_num)
+
+        self.s3.complete_multipart_upload(
+            Bucket=self.bucket,
+            Key=key,
+            UploadId=self._upload_id,
+            MultipartUpload={"Parts": self._parts}
+        )
+
+        self.s3.put_object(
+            Bucket=self.bucket,
+            Key=index_key(self.job_id, self.pack_num),
+            Body=json.dumps({
+                "job_id": self.job_id,
+                "pack_key": key,
+                "chunks": self._index
+            }),
+            ContentType="application/json"
+        )
+
+        logger.info(
+            f"Sealed pack {key} with {len(self._index)} chunks ({self._offset} bytes)")
+
+        self._upload_id = None
+        self.pack_num += 1
@@ -0,0 +1,119 @@
+"""
+Direct Whisper Streaming
+Envia chunks WAV directo al Whisper Service por una conexion keep-alive
+"""
+import http.client
+import json
+import logging
+import time
+from typing import Optional
+from urllib.parse import urlencode
+
+logger = logging.getLogger(__name__)
+
+
+class WhisperStreamClient:
+    """
+    Pushes chunks to one whisper instance over a persistent HTTP/1.1
+    connection. The service advertises free intake slots in
+    X-Stream-Credits; with no credits left the client waits on
+    /stream/credits instead of sending a body that would be rejected.
+    """
+
+    def __init__(self, host: str, port: int = 8080, timeout: float = 30,
+                 max_wait: float = 120, max_connect_errors: int = 3):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.max_wait = max_wait
+        self.max_connect_errors = max_connect_errors
+
+        self.credits = 1
+        self.failed = False
+        # Address of the instance behind the DNS name taking our chunks
+        self.peer = host
+        self._conn: Optional[http.client.HTTPConnection] = None
+        self._connect_errors = 0
+
+    def send(self, job_id: str, chunk_id: int, chunk_wav: bytes,
+             archive_key: str = None) -> bool:
+        """
+        Deliver one chunk. Returns False when the service cannot take it,
+        so the caller falls back to the S3-triggered path.
+        """
+        if self.failed:
+            return False
+
+        path = f"/stream/{job_id}/chunks/{chunk_id}"
+        if archive_key:
+            path += "?" + urlencode({"archive_key": archive_key})
+
+        deadline = time.monotonic() + self.max_wait
+        while time.monotonic() < deadline:
+            try:
+                if self.credits <= 0:
+                    self._wait_for_credits(deadline)
+
+                conn = self._connection()
+                conn.request("POST", path, body=chunk_wav, headers={
+                    "Content-Type": "audio/wav",
+                    "Content-Length": str(len(chunk_wav))
+                })
+                response = conn.getresponse()
+                response.read()
+                self._connect_errors = 0
+
+                if response.status == 202:
+                    self.credits = int(response.getheader("X-Stream-Credits", "1"))
+                    if conn.sock is not None:
+                        self.peer = conn.sock.getpeername()[0]
+                    return True
+
+                if response.status in (429, 503):
+                    self.credits = 0
+                    time.sleep(float(response.getheader("Retry-After", "1")))
+                    continue
+
+                logger.error(
+                    f"Whisper rejected chunk {chunk_id}: HTTP {response.status}")
+                return False
+
+            except (http.client.HTTPException, OSError) as e:
+                self.close()
+                self._connect_errors += 1
+                logger.warning(
+                    f"Direct stream error ({self._connect_errors}): {e}")
+                if self._connect_errors >= self.max_connect_errors:
+                    logger.error("Direct streaming disabled for this job")
+                    self.failed = True
+                    return False
+                time.sleep(1)
+
+        logger.error(f"Timed out pushing chunk {chunk_id} to whisper")
+        return False
+
+    def close(self):
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
+
+    def _connection(self) -> http.client.HTTPConnection:
+        if self._conn is None:
+            self._conn = http.client.HTTPConnection(
+                self.host, self.port, timeout=self.timeout)
+        return self._conn
+
+    def _wait_for_credits(self, deadline: float):
+        """Poll the (bodyless) credits endpoint until a slot frees up"""
+        while time.monotonic() < deadline:
+            conn = self._connection()
+            conn.request("GET", "/stream/credits")
+            response = conn.getresponse()
+            data = json.loads(response.read() or b"{}")
+            self.credits = int(data.get("credits", 0))
+            if self.credits > 0:
+                return
+            time.sleep(0.5)
@@ -0,0 +1,103 @@
+"""
+Format Selection
+Elige el formato de origen que menos bytes necesita para entregar voz a 16 kHz mono
+"""
+import os
+from typing import Dict, List, Optional, Tuple
+
+# Quality floors: below these, speech recognition degrades
+MIN_AUDIO_KBPS = float(os.getenv('MIN_AUDIO_KBPS', '24'))
+MIN_SAMPLE_RATE = 16000
+
+# Cheaper to decode and better per bit at low bitrates, in that order
+CODEC_PREFERENCE = ('opus', 'mp4a', 'aac', 'vorbis', 'mp3')
+
+
+def _codec_rank(acodec: Optional[str]) -> int:
+    acodec = (acodec or '').lower()
+    for rank, name in enumerate(CODEC_PREFERENCE):
+        if acodec.startswith(name):
+            return rank
+    return len(CODEC_PREFERENCE)
+
+
+def has_audio(fmt: Dict) -> bool:
+    return fmt.get('acodec') != 'none' and bool(fmt.get('url'))
+
+
+def is_audio_only(fmt: Dict) -> bool:
+    return has_audio(fmt) and fmt.get('vcodec') == 'none'
+
+
+def estimate_bytes(fmt: Dict, duration: Optional[float]) -> Optional[int]:
+    """Bytes to stream the whole format: exact size, else bitrate x duration"""
+    size = fmt.get('filesize') or fmt.get('filesize_approx')
+    if size:
+        return int(size)
+    kbps = fmt.get('tbr') or fmt.get('abr')
+    if kbps and duration:
+        return int(kbps * 1000 / 8 * duration)
+    return None
+
+
+def meets_floor(fmt: Dict) -> bool:
+    abr = fmt.get('abr')
+    asr = fmt.get('asr')
+    if abr and abr < MIN_AUDIO_KBPS:
+        return False
+    if asr and asr < MIN_SAMPLE_RATE:
+        return False
+    return True
+
+
+def best_format(formats: List[Dict]) -> Optional[Dict]:
+    """What 'bestaudio/best' would pick: highest bitrate audio-only, else best overall"""
+    audio = [f for f in formats if is_audio_only(f)]
+    if audio:
+        return max(audio, key=lambda f: f.get('abr') or f.get('tbr') or 0)
+    with_audio = [f for f in formats if has_audio(f)]
+    # yt-dlp lists formats worst to best
+    return with_audio[-1] if with_audio else None
+
+
+def select_format(info: Dict) -> Tuple[Optional[Dict], Optional[Dict]]:
+    """
+    Returns (chosen, best) formats from a yt-dlp info dict.
+
+    Ranking: audio-only before muxed video, formats meeting the quality
+    floors before those that don't, then fewest estimated bytes, then
+    codec preference. Formats with unknown size sort after known ones.
+    """
+    formats = [f for f in info.get('formats') or [] if has_audio(f)]
+    # Storyboards and the like carry no audio anyway, but be explicit
+    formats = [f for f in formats if f.get('ext') != 'mhtml']
+    if not formats:
+        return None, None
+
+    duration = info.get('duration')
+
+    def rank(fmt: Dict):
+        size = estimate_bytes(fmt, duration)
+        return (
+            not is_audio_only(fmt),
+            not meets_floor(fmt),
+            size is None,
+            size or 0,
+            _codec_rank(fmt.get('acodec'))
+        )
+
+    return min(formats, key=rank), best_format(formats)
+
+
+def describe(fmt: Optional[Dict], duration: Optional[float]) -> Dict:
+    """Compact summary of a format for logs and the job record"""
+    if not fmt:
+        return {}
+    return {
+        'format_id': fmt.get('format_id'),
+        'ext': fmt.get('ext'),
+        'acodec': fmt.get('acodec'),
+        'abr': fmt.get('abr'),
+        'audio_only': is_audio_only(fmt),
+        'bytes': estimate_bytes(fmt, duration)
+    }
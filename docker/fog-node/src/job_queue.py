@@ -0,0 +1,181 @@
+"""
+Job Queue
+Cola durable (SQS) entre url_processor y los fog nodes, con un
+sustituto local en SQLite para pruebas y ejecucion offline
+"""
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+# SQS limits
+MAX_BATCH = 10
+MAX_WAIT_SECONDS = 20
+
+
+class SqsJobQueue:
+    """
+    Jobs queue on SQS. Messages are dicts:
+    {"id", "receipt", "body", "receive_count"}
+    Dead-lettering is done by the queue's redrive policy.
+    """
+
+    def __init__(self, sqs_client, queue_url: str):
+        self.sqs = sqs_client
+        self.queue_url = queue_url
+
+    def send(self, body: Dict):
+        self.sqs.send_message(QueueUrl=self.queue_url, MessageBody=json.dumps(body))
+
+    def send_batch(self, bodies: List[Dict]):
+        """Up to MAX_BATCH messages in one SendMessageBatch call"""
+        response = self.sqs.send_message_batch(
+            QueueUrl=self.queue_url,
+            Entries=[
+                {"Id": str(i), "MessageBody": json.dumps(body)}
+                for i, body in enumerate(bodies[:MAX_BATCH])
+            ]
+        )
+        if response.get("Failed"):
+            raise RuntimeError(f"SendMessageBatch failed for {response['Failed']}")
+
+    def receive(self, max_messages: int, wait_seconds: int = MAX_WAIT_SECONDS) -> List[Dict]:
+        response = self.sqs.receive_message(
+            QueueUrl=self.queue_url,
+            MaxNumberOfMessages=max(1, min(max_messages, MAX_BATCH)),
+            WaitTimeSeconds=min(wait_seconds, MAX_WAIT_SECONDS),
+            AttributeNames=["ApproximateReceiveCount"]
+        )
+        return [
+            {
+                "id": m["MessageId"],
+                "receipt": m["ReceiptHandle"],
+                "body": json.loads(m["Body"]),
+                "receive_count": int(
+                    m.get("Attributes", {}).get("ApproximateReceiveCount", 1))
+            }
+            for m in response.get("Messages", [])
+        ]
+
+    def extend(self, message: Dict, seconds: int):
+        """Heartbeat: keep the lease while the job is still running"""
+        self.sqs.change_message_visibility(
+            QueueUrl=self.queue_url,
+            ReceiptHandle=message["receipt"],
+            VisibilityTimeout=seconds
+        )
+
+    def delete(self, message: Dict):
+        self.sqs.delete_message(
+            QueueUrl=self.queue_url, ReceiptHandle=message["receipt"])
+
+
+class SqliteJobQueue:
+    """
+    Local stand-in with the same semantics as SqsJobQueue: visibility
+    timeout leases, heartbeats, and dead-lettering after `max_receives`.
+    """
+
+    def __init__(self, path: str = ":memory:", visibility_timeout: int = 300,
+                 max_receives: int = 5):
+        self.visibility_timeout = visibility_timeout
+        self.max_receives = max_receives
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS messages ("
+            " id TEXT PRIMARY KEY, body TEXT NOT NULL, visible_at REAL NOT NULL,"
+            " receive_count INTEGER NOT NULL DEFAULT 0, receipt TEXT,"
+            " dead INTEGER NOT NULL DEFAULT 0, seq INTEGER)")
+        self._db.commit()
+        self._seq = 0
+
+    def send(self, body: Dict):
+        with self._lock:
+            self._seq += 1
+            self._db.execute(
+                "INSERT INTO messages (id, body, visible_at, seq) VALUES (?, ?, ?, ?)",
+                (str(uuid.uuid4()), json.dumps(body), time.time(), self._seq))
+            self._db.commit()
+
+    def send_batch(self, bodies: List[Dict]):
+        for body in bodies[:MAX_BATCH]:
+            self.send(body)
+
+    def receive(self, max_messages: int, wait_seconds: int = MAX_WAIT_SECONDS) -> List[Dict]:
+        deadline = time.time() + wait_seconds
+        while True:
+            messages = self._receive_now(max(1, min(max_messages, MAX_BATCH)))
+            if messages or time.time() >= deadline:
+                return messages
+            time.sleep(0.1)
+
+    def extend(self, message: Dict, seconds: int):
+        with self._lock:
+            self._db.execute(
+                "UPDATE messages SET visible_at = ? WHERE id = ? AND receipt = ?",
+                (time.time() + seconds, message["id"], message["receipt"]))
+            self._db.commit()
+
+    def delete(self, message: Dict):
+        with self._lock:
+            self._db.execute(
+                "DELETE FROM messages WHERE id = ? AND receipt = ?",
+                (message["id"], message["receipt"]))
+            self._db.commit()
+
+    def dead_letters(self) -> List[Dict]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT body FROM messages WHERE dead = 1 ORDER BY seq").fetchall()
+        return [json.loads(body) for (body,) in rows]
+
+    def _receive_now(self, limit: int) -> List[Dict]:
+        now = time.time()
+        with self._lock:
+            # Redrive: messages received too often go to the dead-letter set
+            self._db.execute(
+                "UPDATE messages SET dead = 1"
+                " WHERE dead = 0 AND visible_at <= ? AND receive_count >= ?",
+                (now, self.max_receives))
+
+            rows = self._db.execute(
+                "SELECT id, body, receive_count FROM messages"
+                " WHERE dead = 0 AND visible_at <= ? ORDER BY seq LIMIT ?",
+                (now, limit)).fetchall()
+
+            messages = []
+            for message_id, body, receive_count in rows:
+                receipt = str(uuid.uuid4())
+                self._db.execute(
+                    "UPDATE messages SET visible_at = ?, receipt = ?,"
+                    " receive_count = receive_count + 1 WHERE id = ?",
+                    (now + self.visibility_timeout, receipt, message_id))
+                messages.append({
+                    "id": message_id,
+                    "receipt": receipt,
+                    "body": json.loads(body),
+                    "receive_count": receive_count + 1
+                })
+            self._db.commit()
+        return messages
+
+
+def make_job_queue(queue_url: str, sqs_client=None, visibility_timeout: int = 300):
+    """
+    SQS queue for https:// URLs; "sqlite:///path" (or "sqlite://" for
+    in-memory) selects the local stand-in.
+    """
+    if not queue_url:
+        return None
+    if queue_url.startswith("sqlite://"):
+        path = queue_url[len("sqlite://"):].lstrip("/") or ":memory:"
+        if path != ":memory:":
+            path = "/" + path
+        return SqliteJobQueue(path, visibility_timeout=visibility_timeout)
+    return SqsJobQueue(sqs_client, queue_url)
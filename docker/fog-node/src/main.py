@@ -4,18 +4,36 @@ Procesa video/audio SIN descargar archivo completo
 Usa FFmpeg pipe para streaming directo
 """
 import os
+import asyncio
 import logging
+import socket
 import subprocess
 import hashlib
 import json
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Optional
 from datetime import datetime
 
 from fastapi import FastAPI, HTTPException, BackgroundTasks
 from pydantic import BaseModel, HttpUrl
 import boto3
+from boto3.dynamodb.conditions import Attr, Key
 import yt_dlp
 
+from src.batch_ingest import create_jobs, enqueue_jobs, expand_sources
+from src.chunk_buffer import (
+    WAV_HEADER_SIZE, BufferPool, JobBuffers, ViewReader, current_rss_bytes,
+    read_chunk, write_wav_header
+)
+from src.chunk_pack import ChunkPackWriter
+from src.direct_stream import WhisperStreamClient
+from src.format_select import describe, select_format
+from src.job_queue import make_job_queue
+from src.resolver import StreamResolver
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -40,15 +58,62 @@ JOBS_TABLE_NAME = os.getenv('JOBS_TABLE')
 CHUNK_DURATION = 30  # seconds per chunk
 SAMPLE_RATE = 16000  # Hz
 CHANNELS = 1  # Mono
+# "objects": one S3 object per chunk, "pack": multipart chunk packs + index
+CHUNK_PACKING = os.getenv('CHUNK_PACKING', 'objects')
+PACK_MAX_CHUNKS = int(os.getenv('PACK_MAX_CHUNKS', '40'))  # 20 min per pack
+# "s3": chunks reach whisper via S3 events, "direct": pushed to whisper,
+# S3 only keeps an archive copy (archive/{job_id}/chunks/...)
+STREAM_MODE = os.getenv('STREAM_MODE', 's3')
+WHISPER_SERVICE_DNS = os.getenv('WHISPER_SERVICE_DNS')
+ARCHIVE_WORKERS = 4
+# Resumable ingestion: jobs stuck in "streaming" longer than this are
+# re-dispatched from their last checkpoint by the sweeper
+STALL_TIMEOUT = int(os.getenv('STALL_TIMEOUT_SECONDS', '300'))
+SWEEP_INTERVAL = int(os.getenv('SWEEP_INTERVAL_SECONDS', '60'))
+MAX_RESUMES = int(os.getenv('MAX_RESUMES', '3'))
+NODE_ID = socket.gethostname()
+# Pull-based work queue (SQS URL, or sqlite:///path for the local stand-in)
+JOBS_QUEUE_URL = os.getenv('JOBS_QUEUE_URL')
+MAX_CONCURRENT_JOBS = int(os.getenv('MAX_CONCURRENT_JOBS', '2'))
+QUEUE_VISIBILITY_TIMEOUT = int(os.getenv('QUEUE_VISIBILITY_TIMEOUT', '300'))
+# Chunk buffers a single job may hold at once (filling + uploading);
+# a job that hits the ceiling waits for its uploads before reading more
+JOB_MEMORY_CEILING = int(os.getenv('JOB_MEMORY_CEILING_BYTES', str(8 * 1024 * 1024)))
+# Bulk ingestion: parent batch records and SendMessageBatch calls in flight
+BATCHES_TABLE_NAME = os.getenv('BATCHES_TABLE')
+BATCH_SEND_CONCURRENCY = int(os.getenv('BATCH_SEND_CONCURRENCY', '4'))
+# Chunk dispatch ledger: directly streamed chunks are recorded there (like
+# the trigger does for S3 chunks) so hedging can replay them from the archive
+CHUNKS_TABLE_NAME = os.getenv('CHUNKS_TABLE')
+LEDGER_TTL_SECONDS = 7 * 24 * 3600
 
 # DynamoDB table
 jobs_table = dynamodb.Table(JOBS_TABLE_NAME) if JOBS_TABLE_NAME else None
+batches_table = dynamodb.Table(BATCHES_TABLE_NAME) if BATCHES_TABLE_NAME else None
+chunks_table = dynamodb.Table(CHUNKS_TABLE_NAME) if CHUNKS_TABLE_NAME else None
+
+# Work queue
+job_queue = make_job_queue(
+    JOBS_QUEUE_URL,
+    boto3.client('sqs') if JOBS_QUEUE_URL else None,
+    QUEUE_VISIBILITY_TIMEOUT
+)
+
+# Jobs currently streaming on this node (capacity for the queue consumer)
+active_jobs = set()
+
+# Reusable chunk buffers: WAV header slot + 30 s of 16-bit PCM
+buffer_pool = BufferPool(
+    WAV_HEADER_SIZE + CHUNK_DURATION * SAMPLE_RATE * 2 * CHANNELS,
+    max_free=4 * MAX_CONCURRENT_JOBS
+)
 
 
 class ProcessRequest(BaseModel):
     url: HttpUrl
     job_id: str
     model_size: str = "medium"
+    resume: bool = False  # continue from the job's last checkpoint
 
 
 class ProcessStatus(BaseModel):
@@ -152,7 +217,8 @@ async def process_media(request: ProcessRequest, background_tasks: BackgroundTas
         process_streaming_task,
         url,
         job_id,
-        request.model_size
+        request.model_size,
+        request.resume
     )
 
     return {
@@ -163,12 +229,16 @@ async def process_media(request: ProcessRequest, background_tasks: BackgroundTas
     }
 
 
-def get_stream_url(url: str) -> str:
+def get_stream_url(url: str) -> Dict:
     """
     Extract direct stream URL using yt-dlp
+    Picks the format that needs the fewest bytes for 16 kHz mono speech
+    (see format_select) instead of 'bestaudio/best'. Returns the URL plus
+    the chosen and best formats for the job record.
     """
     try:
         ydl_opts = {
+            # Only used when the extractor lists no formats
             'format': 'bestaudio/best',
             'quiet': True,
             'no_warnings': True,
@@ -176,7 +246,21 @@ def get_stream_url(url: str) -> str:
 
         with yt_dlp.YoutubeDL(ydl_opts) as ydl:
             info = ydl.extract_info(url, download=False)
-            return info['url']
+
+        duration = info.get('duration')
+        chosen, best = select_format(info)
+        if not chosen:
+            return {'url': info['url'], 'duration': duration, 'chosen': {}, 'best': {}}
+
+        chosen_info = describe(chosen, duration)
+        best_info = describe(best, duration)
+        logger.info(
+            f"Selected format {chosen_info['format_id']} "
+            f"({chosen_info['acodec']}, {chosen_info['abr']} kbps, "
+            f"~{chosen_info['bytes']} bytes) over best {best_info.get('format_id')} "
+            f"(~{best_info.get('bytes')} bytes)")
+        return {'url': chosen['url'], 'duration': duration,
+                'chosen': chosen_info, 'best': best_info}
     except Exception as e:
         logger.error(f"yt-dlp extraction failed: {str(e)}")
         
@@ -184,47 +268,101 @@ def get_stream_url(url: str) -> str:
         lower_url = url.lower()
         if any(lower_url.endswith(ext) for ext in ['.mp3', '.wav', '.mp4', '.mkv', '.ogg', '.flac', '.webm']):
             logger.info("URL appears to be a direct media file, attempting to use directly...")
-            return url
+            return {'url': url, 'duration': None, 'chosen': {}, 'best': {}}
             
         # CRITICAL: Do NOT return the original URL, as FFmpeg cannot handle it.
         # We must fail the job here to see the actual error.
         raise Exception(f"Failed to resolve stream URL: {str(e)}")
 
 
-async def process_streaming_task(url: str, job_id: str, model_size: str):
+async def process_streaming_task(url: str, job_id: str, model_size: str,
+                                 resume: bool = False):
     """
     Background task para procesamiento streaming
+    Corre en un thread para no bloquear el event loop (heartbeats, sweeper)
+    """
+    active_jobs.add(job_id)
+    try:
+        return await asyncio.to_thread(
+            process_streaming_job, url, job_id, model_size, resume)
+    finally:
+        active_jobs.discard(job_id)
+
+
+def process_streaming_job(url: str, job_id: str, model_size: str,
+                          resume: bool = False):
+    """
+    Procesamiento streaming de un job
     NO descarga el archivo completo
     """
     try:
-        logger.info(f"Starting streaming processing for job {job_id}")
-        update_job_status(job_id, "streaming", 5,
-                          "Starting FFmpeg pipe streaming")
+        checkpoint = get_checkpoint(job_id) if resume else {}
+        start_chunk = checkpoint.get('chunk', 0)
 
-        # 1. Obtener metadata sin descargar
+        logger.info(
+            f"Starting streaming processing for job {job_id} "
+            f"(from chunk {start_chunk})")
+        # A resumed job keeps the progress it already reached (None leaves
+        # it unchanged) instead of moving back to the start values
+        update_job_status(job_id, "streaming", None if resume else 5,
+                          "Starting FFmpeg pipe streaming",
+                          nodeId=NODE_ID)
+
+        # 1. Obtener metadata sin descargar (cacheada por URL)
         logger.info(f"Resolving stream URL for {url}")
-        stream_url = get_stream_url(url)
+        source = resolver.resolve(url)
+        stream_url = source['url']
+        logger.info(
+            f"Resolved in {source['resolve_seconds']}s "
+            f"(cached: {source['cached']}, metadata from {source['metadata']['source']})")
+        if source['chosen']:
+            # Ingest bytes of the chosen format vs what bestaudio would fetch
+            update_job_status(
+                job_id, "streaming", None if resume else 7,
+                f"Selected source format {source['chosen']['format_id']}",
+                sourceFormat=source['chosen']['format_id'],
+                sourceBytes=source['chosen']['bytes'],
+                bestSourceBytes=source['best'].get('bytes')
+            )
 
-        logger.info(f"Getting metadata for stream")
-        metadata = get_media_metadata(stream_url)
+        metadata = source['metadata']
         duration = metadata.get('duration', 0)
 
         logger.info(f"Media duration: {duration}s")
-        update_job_status(job_id, "streaming", 10,
-                          f"Media duration: {duration}s")
+        # mediaSeconds/expectedChunks let the whisper service report
+        # progress and ETA as chunks are transcribed
+        update_job_status(job_id, "streaming", None if resume else 10,
+                          f"Media duration: {duration}s",
+                          resolveMs=int(source['resolve_seconds'] * 1000),
+                          resolveCached=source['cached'],
+                          mediaSeconds=int(duration or 0),
+                          expectedChunks=int((duration or 0) / CHUNK_DURATION) + 1)
 
         # 2. Procesar con FFmpeg pipe (NO descarga completa)
         logger.info(f"Starting FFmpeg streaming for {url}")
-        chunks_info = stream_and_chunk_audio(stream_url, job_id, duration)
+        ingest_started = time.time()
+        chunks_info, memory = stream_and_chunk_audio(
+            stream_url, job_id, duration,
+            start_chunk=start_chunk,
+            start_pack=checkpoint.get('pack', 0)
+        )
+        total_chunks = start_chunk + len(chunks_info)
+        logger.info(f"Memory for job {job_id}: {memory}")
 
         logger.info(
             f"Streaming completed. Processed {len(chunks_info)} chunks")
+        # Ingest throughput for the ETA estimator (only whole runs)
+        if start_chunk == 0:
+            memory["ingestSeconds"] = int(time.time() - ingest_started)
+        # The job completes when the post-processor merges the transcript;
+        # progress now belongs to the whisper service
         update_job_status(
             job_id,
-            "completed",
-            100,
-            f"Streaming processing completed - {len(chunks_info)} chunks created",
-            totalChunks=len(chunks_info)
+            "transcribing",
+            None,
+            f"Streaming processing completed - {total_chunks} chunks created",
+            totalChunks=total_chunks,
+            **memory
         )
 
         # 3. Store metadata
@@ -232,7 +370,7 @@ async def process_streaming_task(url: str, job_id: str, model_size: str):
             "job_id": job_id,
             "status": "completed",
             "audio_duration": duration,
-            "chunks_count": len(chunks_info),
+            "chunks_count": total_chunks,
             "chunks": chunks_info,
             "processing_method": "streaming_no_download",
             "model_size": model_size
@@ -243,6 +381,8 @@ async def process_streaming_task(url: str, job_id: str, model_size: str):
 
     except Exception as e:
         logger.error(f"Error processing job {job_id}: {e}", exc_info=True)
+        # A retry must not reuse a stream URL that may be the cause
+        resolver.invalidate(url)
         update_job_status(job_id, "failed", 0, f"Processing failed: {str(e)}")
         raise
 
@@ -294,16 +434,42 @@ def get_media_metadata(url: str) -> Dict:
         return {'duration': 0, 'has_audio': True}
 
 
-def stream_and_chunk_audio(url: str, job_id: str, total_duration: float) -> list:
+# yt-dlp extraction + metadata, cached per URL for resumes and retries
+resolver = StreamResolver(
+    get_stream_url,
+    get_media_metadata,
+    default_ttl=int(os.getenv('RESOLVE_CACHE_TTL_SECONDS', '1800'))
+)
+
+
+def stream_and_chunk_audio(url: str, job_id: str, total_duration: float,
+                           start_chunk: int = 0, start_pack: int = 0) -> list:
     """
     Procesa audio usando FFmpeg pipe
     NO descarga el archivo completo - streaming directo
+    Con start_chunk > 0 retoma desde el checkpoint (ffmpeg -ss)
+    Lee el PCM con readinto en buffers reutilizables (ver chunk_buffer);
+    devuelve (chunks_info, estadisticas de memoria)
     """
     chunks_info = []
+    buffers = JobBuffers(buffer_pool, JOB_MEMORY_CEILING)
+    peak_rss = 0
+    peak_concurrency = 1
+    packer = None
+    direct = None
+    archive_pool = None
+    archive_futures = []
+    # (chunk_num, future) of direct-mode archive uploads not yet confirmed
+    pending_archive = deque()
 
     # FFmpeg command for streaming RAW PCM (no header issues)
+    # Input seeking to the checkpoint; chunk boundaries are exact sample
+    # counts so the resumed chunks line up with the ones already stored
+    seek = ['-ss', str(start_chunk * CHUNK_DURATION)] if start_chunk else []
+
     ffmpeg_cmd = [
         'ffmpeg',
+        *seek,
         '-i', url,
         '-f', 's16le',       # Raw PCM signed 16-bit little-endian
         '-acodec', 'pcm_s16le',
@@ -316,61 +482,125 @@ def stream_and_chunk_audio(url: str, job_id: str, total_duration: float) -> list
     logger.info(f"Starting FFmpeg pipe for {job_id}")
 
     try:
+        # Unbuffered: readinto() goes straight from the pipe into our buffer
         process = subprocess.Popen(
             ffmpeg_cmd,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
-            bufsize=10**8
+            bufsize=0
         )
 
-        # Calculate chunk size in bytes
-        # 30 seconds * 16000 Hz * 2 bytes * 1 channel
-        chunk_size_bytes = CHUNK_DURATION * SAMPLE_RATE * 2 * CHANNELS
-
-        chunk_num = 0
+        chunk_num = start_chunk
         total_chunks = int(total_duration / CHUNK_DURATION) + 1
 
+        if CHUNK_PACKING == 'pack':
+            packer = ChunkPackWriter(
+                s3_client, PROCESSED_BUCKET, job_id, PACK_MAX_CHUNKS,
+                start_pack=start_pack)
+
+        if STREAM_MODE == 'direct' and WHISPER_SERVICE_DNS:
+            direct = WhisperStreamClient(WHISPER_SERVICE_DNS)
+            archive_pool = ThreadPoolExecutor(max_workers=ARCHIVE_WORKERS)
+
         logger.info(f"Starting to process chunks (expected: {total_chunks})")
 
         while True:
-            # Read raw PCM chunk
-            pcm_data = process.stdout.read(chunk_size_bytes)
+            # Read raw PCM chunk (30 s) behind the header slot
+            buf = buffers.acquire()
+            chunk_wav = read_chunk(process.stdout, buf)
 
-            if not pcm_data:
+            if chunk_wav is None:
+                buffers.release(buf)
                 break
 
-            # Create distinct WAV header for THIS chunk
-            wav_header = create_wav_header(len(pcm_data))
-            chunk_wav = wav_header + pcm_data
-
-            chunk_key = f"audio/{job_id}/chunks/chunk_{chunk_num:03d}.wav"
-
-            logger.info(
-                f"Uploading chunk {chunk_num} ({len(chunk_wav)} bytes)")
-
-            s3_client.put_object(
-                Bucket=PROCESSED_BUCKET,
-                Key=chunk_key,
-                Body=chunk_wav,
-                ContentType='audio/wav'
-            )
-
-            chunks_info.append({
-                'chunk_id': chunk_num,
-                's3_key': chunk_key,
-                'duration': len(pcm_data) / (SAMPLE_RATE * 2 * CHANNELS),
-                'size_bytes': len(chunk_wav)
-            })
+            # Distinct WAV header for THIS chunk, written in place
+            pcm_size = len(chunk_wav) - WAV_HEADER_SIZE
+            write_wav_header(buf, pcm_size, SAMPLE_RATE, CHANNELS)
+
+            chunk_duration = pcm_size / (SAMPLE_RATE * 2 * CHANNELS)
+            archive_key = f"archive/{job_id}/chunks/chunk_{chunk_num:03d}.wav"
+            # Archive uploads keep the buffer until they finish
+            buffer_in_flight = False
+
+            try:
+                delivered = direct and direct.send(
+                    job_id, chunk_num, chunk_wav, archive_key)
+            except Exception:
+                buffers.release(buf)
+                raise
+
+            if delivered:
+                # Archive copy for durability/replay; outside audio/ so it
+                # does not trigger a second transcription. The chunk enters
+                # the ledger only once the copy exists.
+                future = archive_pool.submit(
+                    archive_streamed_chunk, job_id, chunk_num, archive_key,
+                    chunk_wav, direct.peer)
+                future.add_done_callback(lambda _, b=buf: buffers.release(b))
+                buffer_in_flight = True
+                archive_futures.append(future)
+                pending_archive.append((chunk_num, future))
+                chunks_info.append({
+                    'chunk_id': chunk_num,
+                    's3_key': archive_key,
+                    'duration': chunk_duration,
+                    'size_bytes': len(chunk_wav),
+                    'delivery': 'direct'
+                })
+            elif packer:
+                logger.info(
+                    f"Packing chunk {chunk_num} ({len(chunk_wav)} bytes)")
+                try:
+                    chunks_info.append(dict(
+                        packer.add(chunk_num, chunk_wav, chunk_duration),
+                        size_bytes=len(chunk_wav),
+                        delivery='pack'
+                    ))
+                finally:
+                    buffers.release(buf)
+            else:
+                chunk_key = f"audio/{job_id}/chunks/chunk_{chunk_num:03d}.wav"
+
+                logger.info(
+                    f"Uploading chunk {chunk_num} ({len(chunk_wav)} bytes)")
+
+                try:
+                    upload_chunk(chunk_key, chunk_wav)
+                finally:
+                    buffers.release(buf)
+
+                chunks_info.append({
+                    'chunk_id': chunk_num,
+                    's3_key': chunk_key,
+                    'duration': chunk_duration,
+                    'size_bytes': len(chunk_wav)
+                })
+
+            if not buffer_in_flight:
+                del chunk_wav
 
             chunk_num += 1
-
-            # Update progress
-            progress = min(90, 10 + (chunk_num / total_chunks) * 80)
+            peak_rss = max(peak_rss, current_rss_bytes())
+            peak_concurrency = max(peak_concurrency, len(active_jobs))
+
+            # Checkpoint: next chunk to produce, once everything before it
+            # is durable (in pack mode only when a pack has been sealed; in
+            # direct mode only up to the oldest unfinished archive upload)
+            checkpoint = {}
+            if not packer or packer.is_sealed:
+                checkpoint = checkpoint_fields(
+                    durable_chunk(chunk_num, pending_archive),
+                    packer.pack_num if packer else 0)
+
+            # Ingest progress (also the heartbeat the sweeper watches).
+            # Job progress is set by the whisper service as chunks complete.
             update_job_status(
                 job_id,
                 "streaming",
-                progress,
-                f"Processed {chunk_num}/{total_chunks} chunks via streaming"
+                None,
+                f"Processed {chunk_num}/{total_chunks} chunks via streaming",
+                ingestProgress=int(min(100, chunk_num / total_chunks * 100)),
+                **checkpoint
             )
 
         process.wait(timeout=30)
@@ -380,46 +610,478 @@ def stream_and_chunk_audio(url: str, job_id: str, total_duration: float) -> list
             logger.error(f"FFmpeg error: {stderr}")
             raise Exception(f"FFmpeg failed: {stderr}")
 
-        return chunks_info
+        if packer:
+            packer.close()
+
+        wait_for_archive(archive_futures)
+
+        memory = {
+            "peakRssMb": round(peak_rss / 2**20),
+            # Node RSS split across the jobs streaming alongside this one
+            "peakRssPerJobMb": round(peak_rss / 2**20 / peak_concurrency),
+            "peakBufferBytes": buffers.peak_bytes,
+            "concurrentJobs": peak_concurrency
+        }
+        return chunks_info, memory
 
     except Exception as e:
         if 'process' in locals():
             process.kill()
+        if packer:
+            packer.abort()
         raise Exception(f"Streaming error: {str(e)}")
+    finally:
+        if direct:
+            direct.close()
+        if archive_pool:
+            archive_pool.shutdown(wait=True)
+
+
+def upload_chunk(chunk_key: str, chunk_wav: memoryview):
+    """Upload one WAV chunk to the processed bucket, reading the buffer in place"""
+    s3_client.put_object(
+        Bucket=PROCESSED_BUCKET,
+        Key=chunk_key,
+        Body=ViewReader(chunk_wav),
+        ContentLength=len(chunk_wav),
+        ContentType='audio/wav'
+    )
+
+
+def archive_streamed_chunk(job_id: str, chunk_num: int, archive_key: str,
+                           chunk_wav: memoryview, instance: str):
+    """Archive a chunk pushed to whisper, then record it in the ledger"""
+    upload_chunk(archive_key, chunk_wav)
+    record_stream_dispatch(job_id, chunk_num, archive_key, instance)
+
+
+def record_stream_dispatch(job_id: str, chunk_num: int, archive_key: str,
+                           instance: str):
+    """
+    Ledger entry of a directly streamed chunk: outstanding until whisper's
+    completion write, so a crashed or failed transcription gets replayed
+    from the archive copy by the trigger's straggler sweep
+    """
+    if not chunks_table:
+        return
+
+    now = int(time.time())
+    try:
+        chunks_table.update_item(
+            Key={"jobId": job_id, "chunkId": chunk_num},
+            UpdateExpression=(
+                "SET dispatchedAt = :now, instance = :host, #src = :src,"
+                " outstanding = :one, #ttl = :ttl"
+            ),
+            # Whisper may already have finished it
+            ConditionExpression="attribute_not_exists(completedAt)",
+            ExpressionAttributeNames={"#src": "source", "#ttl": "ttl"},
+            ExpressionAttributeValues={
+                ":now": now,
+                ":host": instance,
+                ":src": {"s3_key": archive_key},
+                ":one": "1",
+                ":ttl": now + LEDGER_TTL_SECONDS
+            }
+        )
+    except dynamodb.meta.client.exceptions.ConditionalCheckFailedException:
+        pass
+
+
+def wait_for_archive(futures: list):
+    """Wait for background archive uploads; failures are logged, not fatal"""
+    failed = 0
+    for future in futures:
+        try:
+            future.result()
+        except Exception as e:
+            failed += 1
+            logger.error(f"Error archiving chunk: {e}")
+    if failed:
+        logger.warning(f"{failed}/{len(futures)} archive uploads failed")
+
+
+def durable_chunk(next_chunk: int, pending_archive: deque) -> int:
+    """
+    First chunk that is not durable yet: the oldest direct-mode archive
+    upload still running or failed (a failed one is produced again on
+    resume), else next_chunk
+    """
+    while pending_archive:
+        future = pending_archive[0][1]
+        if not future.done() or future.exception() is not None:
+            return pending_archive[0][0]
+        pending_archive.popleft()
+    return next_chunk
+
+
+def checkpoint_fields(next_chunk: int, next_pack: int) -> Dict:
+    """Job attributes recording the last durable position"""
+    return {
+        "checkpointChunk": next_chunk,
+        "checkpointOffset": next_chunk * CHUNK_DURATION * SAMPLE_RATE,  # samples
+        "checkpointPack": next_pack
+    }
+
+
+def get_checkpoint(job_id: str) -> Dict:
+    """Read the last durable chunk/pack of a job (empty = start from 0)"""
+    if not jobs_table:
+        return {}
+
+    item = jobs_table.get_item(Key={"jobId": job_id}).get("Item", {})
+    if "checkpointChunk" not in item:
+        return {}
+
+    return {
+        'chunk': int(item["checkpointChunk"]),
+        'offset': int(item.get("checkpointOffset", 0)),
+        'pack': int(item.get("checkpointPack", 0))
+    }
+
+
+def claim_stalled_job(item: Dict, token: str = None) -> bool:
+    """
+    Take over a stalled job. The conditional write on updatedAt makes sure
+    only one fog node wins when several sweepers see the same job. With a
+    token, the node that dequeues the resume message redeems it (see
+    claim_queued_job).
+    """
+    token_expr = ", claimToken = :token" if token else ""
+    token_values = {":token": token} if token else {}
+    try:
+        jobs_table.update_item(
+            Key={"jobId": item["jobId"]},
+            UpdateExpression="SET updatedAt = :now, nodeId = :node, "
+                             "resumeCount = if_not_exists(resumeCount, :zero) + :one"
+                             + token_expr,
+            ConditionExpression="#status = :streaming AND updatedAt = :seen",
+            ExpressionAttributeNames={"#status": "status"},
+            ExpressionAttributeValues={
+                ":now": int(datetime.utcnow().timestamp()),
+                ":node": NODE_ID,
+                ":zero": 0,
+                ":one": 1,
+                ":streaming": "streaming",
+                ":seen": item["updatedAt"],
+                **token_values
+            }
+        )
+        return True
+    except dynamodb.meta.client.exceptions.ConditionalCheckFailedException:
+        return False
+
+
+def claim_queued_job(job_id: str, token: str = None) -> bool:
+    """
+    Own a dequeued job before streaming it, so one job never runs on two
+    nodes. A message claims a job nobody owns (new, or released after a
+    failed attempt), or one whose heartbeat went stale (its node died and
+    SQS redelivered the message); a sweeper's resume message claims with
+    its one-time token. Anything else means another node has the job.
+    """
+    if not jobs_table:
+        return True
+
+    condition = ("(#status IN (:pending, :failed) AND attribute_not_exists(nodeId)) OR "
+                 "(#status IN (:pending, :streaming) AND updatedAt < :stale)")
+    values = {
+        ":pending": "pending",
+        ":streaming": "streaming",
+        ":failed": "failed",
+        ":stale": int(datetime.utcnow().timestamp()) - STALL_TIMEOUT
+    }
+    if token:
+        condition += " OR (claimToken = :token AND #status = :streaming)"
+        values[":token"] = token
+    try:
+        jobs_table.update_item(
+            Key={"jobId": job_id},
+            UpdateExpression="SET nodeId = :node, updatedAt = :now REMOVE claimToken",
+            ConditionExpression=condition,
+            ExpressionAttributeNames={"#status": "status"},
+            ExpressionAttributeValues={
+                ":node": NODE_ID,
+                ":now": int(datetime.utcnow().timestamp()),
+                **values
+            }
+        )
+        return True
+    except dynamodb.meta.client.exceptions.ConditionalCheckFailedException:
+        return False
+
+
+def release_queued_job(job_id: str):
+    """Give up ownership after a failed attempt so the message's retry can claim it"""
+    if not jobs_table:
+        return
+
+    try:
+        jobs_table.update_item(
+            Key={"jobId": job_id},
+            UpdateExpression="REMOVE nodeId",
+            ConditionExpression="nodeId = :node",
+            ExpressionAttributeValues={":node": NODE_ID}
+        )
+    except dynamodb.meta.client.exceptions.ConditionalCheckFailedException:
+        pass
+    except Exception as e:
+        logger.error(f"Error releasing job {job_id}: {e}")
+
+
+def find_stalled_jobs() -> list:
+    """Jobs in "streaming" whose heartbeat (updatedAt) is older than STALL_TIMEOUT"""
+    cutoff = int(datetime.utcnow().timestamp()) - STALL_TIMEOUT
+    items = []
+    kwargs = {
+        "IndexName": "StatusIndex",
+        "KeyConditionExpression": Key("status").eq("streaming"),
+        "FilterExpression": Attr("updatedAt").lt(cutoff)
+    }
+
+    while True:
+        response = jobs_table.query(**kwargs)
+        items.extend(response.get("Items", []))
+        if "LastEvaluatedKey" not in response:
+            return items
+        kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+async def sweep_stalled_jobs():
+    """Re-dispatch stalled jobs from their checkpoint"""
+    for item in find_stalled_jobs():
+        job_id = item["jobId"]
+
+        if int(item.get("resumeCount", 0)) >= MAX_RESUMES:
+            logger.error(f"Job {job_id} stalled {MAX_RESUMES} times, giving up")
+            update_job_status(job_id, "failed", 0,
+                              "Processing failed: too many resumes")
+            continue
+
+        # Queued resumes carry a token: the dead node's own message, once
+        # redelivered, can no longer claim the job
+        token = str(uuid.uuid4()) if job_queue else None
+        if not claim_stalled_job(item, token):
+            continue
+
+        logger.info(
+            f"Resuming stalled job {job_id} from chunk "
+            f"{item.get('checkpointChunk', 0)}")
+
+        if job_queue:
+            # Any node with free capacity picks it up
+            job_queue.send({
+                "type": "process",
+                "url": item["url"],
+                "job_id": job_id,
+                "model_size": item.get("modelSize", "medium"),
+                "resume": True,
+                "claim_token": token
+            })
+        else:
+            asyncio.create_task(process_streaming_task(
+                item["url"], job_id, item.get("modelSize", "medium"), resume=True))
+
+
+async def sweeper_loop():
+    while True:
+        await asyncio.sleep(SWEEP_INTERVAL)
+        try:
+            await sweep_stalled_jobs()
+        except Exception as e:
+            logger.error(f"Sweeper error: {e}", exc_info=True)
+
+
+@app.on_event("startup")
+async def start_sweeper():
+    if jobs_table:
+        asyncio.create_task(sweeper_loop())
+
+
+async def queue_consumer_loop():
+    """
+    Long-poll the work queue, pulling only as many jobs as there are free
+    slots on this node
+    """
+    while True:
+        free = MAX_CONCURRENT_JOBS - len(active_jobs)
+        if free <= 0:
+            await asyncio.sleep(1)
+            continue
+
+        try:
+            messages = await asyncio.to_thread(job_queue.receive, free)
+        except Exception as e:
+            logger.error(f"Queue receive error: {e}")
+            await asyncio.sleep(5)
+            continue
+
+        for message in messages:
+            # Reserve the slot now so the next receive sees it taken
+            active_jobs.add(message["body"].get("job_id"))
+            asyncio.create_task(run_queued_job(message))
+
+
+async def run_queued_job(message: Dict):
+    """
+    Run one queued job while heart-beating its lease. The message is only
+    deleted on success; otherwise it becomes visible again and is retried
+    (from the checkpoint) until the queue dead-letters it.
+    """
+    body = message["body"]
+    job_id = body.get("job_id")
+    heartbeat = asyncio.create_task(queue_heartbeat(message))
+
+    try:
+        if body.get("type") == "expand_batch":
+            await asyncio.to_thread(process_batch, body)
+            await asyncio.to_thread(job_queue.delete, message)
+            return
+
+        if body.get("type", "process") != "process":
+            raise ValueError(f"Unknown message type: {body.get('type')}")
+
+        logger.info(
+            f"Dequeued job {job_id} (receive #{message['receive_count']})")
+        if not await asyncio.to_thread(claim_queued_job, job_id, body.get("claim_token")):
+            logger.info(f"Job {job_id} is owned by another node, dropping message")
+            await asyncio.to_thread(job_queue.delete, message)
+            return
+        await process_streaming_task(
+            body["url"],
+            job_id,
+            body.get("model_size", "medium"),
+            body.get("resume", False) or message["receive_count"] > 1
+        )
+        await asyncio.to_thread(job_queue.delete, message)
+    except Exception as e:
+        logger.error(f"Queued job {job_id} failed, leaving it for retry: {e}")
+        if job_id:
+            await asyncio.to_thread(release_queued_job, job_id)
+    finally:
+        heartbeat.cancel()
+        active_jobs.discard(job_id)
+
+
+def process_batch(body: Dict):
+    """
+    Bulk submission from url_processor: expand playlist/feed sources,
+    create its jobs and enqueue the ones still pending for the fleet
+    """
+    batch_id = body["batch_id"]
+    if not batches_table:
+        # Nothing to track the batch in: drop it rather than have every
+        # redelivery fail the same way until the queue dead-letters it
+        logger.error(f"Dropping batch {batch_id}: BATCHES_TABLE not configured")
+        return
+
+    batch = batches_table.get_item(Key={"batchId": batch_id}).get("Item", {})
+    if batch.get("status") == "submitted":
+        logger.info(f"Batch {batch_id} already submitted, skipping redelivery")
+        return
+
+    try:
+        update_batch(batch_id, "expanding", "Expanding sources")
+        urls = list(body.get("urls", []))
+        if body.get("sources"):
+            urls += expand_sources(body["sources"])
+        urls = list(dict.fromkeys(urls))
+
+        jobs = create_jobs(
+            jobs_table, batch_id, urls,
+            body.get("user_id", "anonymous"),
+            body.get("model_size", "medium"),
+            body.get("tier", "standard"),
+            body.get("admission_seconds")
+        )
+        # A redelivered batch finds the jobs it created before; those that
+        # already started or finished are not queued again
+        pending = [job for job in jobs if job.get("status") == "pending"]
+        enqueue_jobs(
+            job_queue, pending,
+            min(int(body.get("send_concurrency") or BATCH_SEND_CONCURRENCY),
+                BATCH_SEND_CONCURRENCY * 4)
+        )
+        update_batch(batch_id, "submitted", f"{len(pending)} jobs queued",
+                     totalJobs=len(jobs))
+    except Exception as e:
+        logger.error(f"Batch {batch_id} failed: {e}", exc_info=True)
+        update_batch(batch_id, "failed", f"Batch failed: {e}")
+        raise
+
+
+def update_batch(batch_id: str, status: str, message: str, **fields):
+    """Update the parent batch record"""
+    names = {"#status": "status"}
+    values = {
+        ":status": status,
+        ":message": message,
+        ":updated": int(datetime.utcnow().timestamp())
+    }
+    expr = "SET #status = :status, message = :message, updatedAt = :updated"
+    for key, value in fields.items():
+        expr += f", {key} = :{key}"
+        values[f":{key}"] = value
+
+    batches_table.update_item(
+        Key={"batchId": batch_id},
+        UpdateExpression=expr,
+        ExpressionAttributeNames=names,
+        ExpressionAttributeValues=values
+    )
+
+
+async def queue_heartbeat(message: Dict):
+    """Extend the visibility timeout while the job runs"""
+    while True:
+        await asyncio.sleep(QUEUE_VISIBILITY_TIMEOUT / 2)
+        try:
+            await asyncio.to_thread(
+                job_queue.extend, message, QUEUE_VISIBILITY_TIMEOUT)
+        except Exception as e:
+            logger.error(f"Queue heartbeat error: {e}")
+
+
+@app.on_event("startup")
+async def start_queue_consumer():
+    if job_queue:
+        asyncio.create_task(queue_consumer_loop())
+
+
+@app.post("/resume/{job_id}")
+async def resume_job(job_id: str, background_tasks: BackgroundTasks):
+    """Manually resume a job from its last checkpoint"""
+    if not jobs_table:
+        raise HTTPException(status_code=503, detail="DynamoDB not configured")
+
+    item = jobs_table.get_item(Key={"jobId": job_id}).get("Item")
+    if not item:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    background_tasks.add_task(
+        process_streaming_task,
+        item["url"],
+        job_id,
+        item.get("modelSize", "medium"),
+        True
+    )
+
+    return {
+        "job_id": job_id,
+        "status": "resuming",
+        "checkpoint_chunk": int(item.get("checkpointChunk", 0))
+    }
 
 
 def create_wav_header(data_size: int) -> bytes:
     """Create a valid WAV header for 16-bit Mono 16kHz PCM"""
-    import struct
-    
-    # RIFF chunk
-    header = b'RIFF'
-    header += struct.pack('<I', data_size + 36)   # ChunkSize (Total - 8)
-    header += b'WAVE'
-    
-    # fmt subchunk
-    header += b'fmt '
-    header += struct.pack('<I', 16)               # Subchunk1Size (16 for PCM)
-    header += struct.pack('<H', 1)                # AudioFormat (1 = PCM)
-    header += struct.pack('<H', CHANNELS)         # NumChannels
-    header += struct.pack('<I', SAMPLE_RATE)      # SampleRate
-    
-    byte_rate = SAMPLE_RATE * CHANNELS * 2        # 16-bit = 2 bytes
-    header += struct.pack('<I', byte_rate)        # ByteRate
-    
-    block_align = CHANNELS * 2
-    header += struct.pack('<H', block_align)      # BlockAlign
-    header += struct.pack('<H', 16)               # BitsPerSample
-    
-    # data subchunk
-    header += b'data'
-    header += struct.pack('<I', data_size)        # Subchunk2Size
-    
-    return header
-
-
-def update_job_status(job_id: str, status: str, progress: float, message: str, **kwargs):
-    """Update job status in DynamoDB"""
+    header = bytearray(WAV_HEADER_SIZE)
+    write_wav_header(header, data_size, SAMPLE_RATE, CHANNELS)
+    return bytes(header)
+
+
+def update_job_status(job_id: str, status: str, progress: Optional[float], message: str, **kwargs):
+    """Update job status in DynamoDB (progress None leaves it as it is)"""
     if not jobs_table:
         logger.warning("DynamoDB table not configured, skipping status update")
         return
@@ -428,12 +1090,14 @@ def update_job_status(job_id: str, status: str, progress: float, message: str, *
         expression_names = {"#status": "status"}
         expression_values = {
             ":status": status,
-            ":progress": int(progress),
             ":message": message,
             ":updated": int(datetime.utcnow().timestamp())
         }
         
-        update_expr = "SET #status = :status, progress = :progress, message = :message, updatedAt = :updated"
+        update_expr = "SET #status = :status, message = :message, updatedAt = :updated"
+        if progress is not None:
+            update_expr += ", progress = :progress"
+            expression_values[":progress"] = int(progress)
 
         # Add any extra fields passed in kwargs (e.g., totalChunks)
         for key, value in kwargs.items():
@@ -479,6 +1143,12 @@ async def get_metrics():
         "processing_method": "streaming_no_download",
         "version": "3.0.0",
         "chunk_duration": CHUNK_DURATION,
+        "chunk_packing": CHUNK_PACKING,
+        "stream_mode": STREAM_MODE,
+        "active_jobs": len(active_jobs),
+        "max_concurrent_jobs": MAX_CONCURRENT_JOBS,
+        "rss_mb": round(current_rss_bytes() / 2**20),
+        "job_memory_ceiling_mb": round(JOB_MEMORY_CEILING / 2**20, 1),
         "sample_rate": SAMPLE_RATE,
         "channels": CHANNELS
     }
@@ -0,0 +1,108 @@
+"""
+Stream Resolver
+Cache de extraccion yt-dlp por URL (TTL acotado por la expiracion de URLs firmadas)
+y metadata reutilizada de yt-dlp, con ffprobe solo como respaldo
+"""
+import calendar
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+logger = logging.getLogger(__name__)
+
+# YouTube-style path parameter (.../expire/1700000000/...)
+_PATH_EXPIRE = re.compile(r'/expire/(\d+)')
+
+
+def signed_url_expiry(stream_url: str) -> Optional[float]:
+    """Epoch at which a signed media URL stops working, if it says so"""
+    parsed = urlparse(stream_url)
+    query = {k.lower(): v[0] for k, v in parse_qs(parsed.query).items()}
+
+    for name in ('expire', 'expires', 'exp'):
+        value = query.get(name)
+        if value and value.isdigit():
+            return float(value)
+
+    # SigV4 presigned: X-Amz-Date (20240101T000000Z) + X-Amz-Expires seconds
+    if 'x-amz-date' in query and query.get('x-amz-expires', '').isdigit():
+        try:
+            signed_at = calendar.timegm(
+                time.strptime(query['x-amz-date'], '%Y%m%dT%H%M%SZ'))
+            return signed_at + int(query['x-amz-expires'])
+        except ValueError:
+            pass
+
+    match = _PATH_EXPIRE.search(parsed.path)
+    if match:
+        return float(match.group(1))
+    return None
+
+
+class StreamResolver:
+    """
+    Resolves a page URL into a stream URL + media metadata.
+
+    `extract(url)` returns at least {'url', 'duration'} (yt-dlp); `probe(stream_url)`
+    is the ffprobe fallback, only run when extraction gave no duration.
+    Results are cached per URL until `default_ttl` or the signed stream
+    URL's expiry minus `safety_margin`, whichever comes first, so resumed
+    and retried jobs skip both steps.
+    """
+
+    def __init__(self, extract: Callable[[str], Dict], probe: Callable[[str], Dict],
+                 default_ttl: int = 1800, safety_margin: int = 120,
+                 max_entries: int = 256):
+        self.extract = extract
+        self.probe = probe
+        self.default_ttl = default_ttl
+        self.safety_margin = safety_margin
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def resolve(self, url: str) -> Dict:
+        """Returns the extraction result plus 'metadata', 'cached' and 'resolve_seconds'"""
+        start = time.time()
+        with self._lock:
+            entry = self._cache.get(url)
+            if entry and entry['expires_at'] > start:
+                self._cache.move_to_end(url)
+                return dict(entry['value'], cached=True, resolve_seconds=0.0)
+            self._cache.pop(url, None)
+
+        source = self.extract(url)
+        duration = source.get('duration')
+        if duration:
+            metadata = {
+                'duration': float(duration),
+                'format': (source.get('chosen') or {}).get('ext'),
+                'has_audio': True,
+                'source': 'yt-dlp'
+            }
+        else:
+            logger.info("No duration from extraction, falling back to ffprobe")
+            metadata = dict(self.probe(source['url']), source='ffprobe')
+
+        value = dict(source, metadata=metadata)
+        expires_at = start + self.default_ttl
+        expiry = signed_url_expiry(source['url'])
+        if expiry:
+            expires_at = min(expires_at, expiry - self.safety_margin)
+
+        if expires_at > time.time():
+            with self._lock:
+                self._cache[url] = {'value': value, 'expires_at': expires_at}
+                while len(self._cache) > self.max_entries:
+                    self._cache.popitem(last=False)
+
+        return dict(value, cached=False, resolve_seconds=round(time.time() - start, 3))
+
+    def invalidate(self, url: str):
+        """Forget a URL, e.g. after ffmpeg could not open its stream"""
+        with self._lock:
+            self._cache.pop(url, None)
@@ -3,18 +3,33 @@ Whisper Transcription Service
 Procesa chunks de audio usando OpenAI Whisper
 """
 import os
+import asyncio
 import logging
 import json
+import shutil
+import socket
 import tempfile
+import threading
 import time
-from typing import Dict, List
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional
 from datetime import datetime
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel
 import boto3
+from botocore.exceptions import ClientError
 import whisper
 
+from src import chunk_format
+from src.scheduler import FairScheduler
+from src.telemetry import (
+    REGISTRY, PHASE_SECONDS, LOAD, HEDGE_OUTCOMES, HEDGE_SAVED_SECONDS,
+    ChunkTimer, observe_chunk
+)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -38,7 +53,22 @@ PROCESSED_BUCKET = os.getenv('PROCESSED_AUDIO_BUCKET')
 TRANSCRIPTION_BUCKET = os.getenv('TRANSCRIPTION_BUCKET')
 JOBS_TABLE = os.getenv('JOBS_TABLE')
 TRANSCRIPTIONS_TABLE = os.getenv('TRANSCRIPTIONS_TABLE')
+# Chunk dispatch ledger: first result wins when a chunk was hedged
+CHUNKS_TABLE = os.getenv('CHUNKS_TABLE')
+INSTANCE_ID = socket.gethostname()
+LEDGER_TTL_SECONDS = 7 * 24 * 3600
 WHISPER_MODEL_NAME = os.getenv('WHISPER_MODEL', 'small')
+# Label for the hardware/decoding profile this task runs with (metrics only)
+WHISPER_PROFILE = os.getenv('WHISPER_PROFILE', 'default')
+# Direct fog -> whisper streaming: chunks buffered before pushing back
+STREAM_QUEUE_SIZE = int(os.getenv('STREAM_QUEUE_SIZE', '8'))
+# ETA extrapolation needs a few chunk completions to measure throughput
+ETA_MIN_CHUNKS = 3
+# Fair scheduling: chunks per round-robin turn for each priority tier
+TIER_WEIGHTS = json.loads(os.getenv('TIER_WEIGHTS', '{"premium": 4, "standard": 2, "batch": 1}'))
+DEFAULT_TIER = os.getenv('DEFAULT_TIER', 'standard')
+# Threads pulling from the scheduler (the model is shared, keep it low)
+SCHEDULER_WORKERS = int(os.getenv('SCHEDULER_WORKERS', '1'))
 
 # Load Whisper model
 logger.info(f"Loading Whisper model: {WHISPER_MODEL_NAME}")
@@ -53,13 +83,25 @@ except Exception as e:
 jobs_table = dynamodb.Table(JOBS_TABLE) if JOBS_TABLE else None
 trans_table = dynamodb.Table(
     TRANSCRIPTIONS_TABLE) if TRANSCRIPTIONS_TABLE else None
+chunks_table = dynamodb.Table(CHUNKS_TABLE) if CHUNKS_TABLE else None
+
+
+class PackChunk(BaseModel):
+    chunk_id: int
+    offset: int
+    length: int
 
 
 class TranscriptionRequest(BaseModel):
     job_id: str
-    s3_keys: List[str]
+    s3_keys: List[str] = []
+    # Chunk pack mode: byte ranges inside a single pack object
+    pack_key: Optional[str] = None
+    chunks: List[PackChunk] = []
     model_size: str = "small"
     language: str = None
+    # Set by the trigger when re-dispatching a straggler chunk
+    hedge: bool = False
 
 
 @app.get("/")
@@ -114,142 +156,345 @@ def check_dynamodb() -> bool:
 
 
 @app.post("/transcribe")
-async def transcribe_audio(
-    request: TranscriptionRequest,
-    background_tasks: BackgroundTasks
-):
+async def transcribe_audio(request: TranscriptionRequest):
     """
     Transcribe audio chunks from S3
+    Chunks are queued in the fair scheduler under their job
     """
     if not whisper_model:
         raise HTTPException(status_code=503, detail="Whisper model not loaded")
 
-    if not request.s3_keys:
+    if request.chunks and not request.pack_key:
+        raise HTTPException(status_code=400, detail="Pack chunks require pack_key")
+
+    sources = chunk_sources(request)
+    if not sources:
         raise HTTPException(status_code=400, detail="No S3 keys provided")
 
     logger.info(f"Received transcription request for job {request.job_id}")
-    logger.info(f"Chunks to process: {len(request.s3_keys)}")
+    logger.info(f"Chunks to process: {len(sources)}")
 
-    # Start transcription in background
-    background_tasks.add_task(
-        transcribe_chunks_task,
+    tier = await asyncio.to_thread(job_tier, request.job_id)
+    enqueued_at = time.time()
+    LOAD.add(len(sources))
+    scheduler.submit(
         request.job_id,
-        request.s3_keys,
-        request.language
+        [
+            {"job_id": request.job_id, "source": source, "language": request.language,
+             "tier": tier, "enqueued_at": enqueued_at, "intake": "batch"}
+            for source in sources
+        ],
+        # A hedge exists because the chunk is already late
+        front=request.hedge
     )
 
     return {
         "job_id": request.job_id,
         "status": "processing",
-        "chunks_count": len(request.s3_keys),
-        "message": f"Transcription started with {WHISPER_MODEL_NAME} model"
+        "chunks_count": len(sources),
+        "tier": tier,
+        "message": f"Transcription queued with {WHISPER_MODEL_NAME} model"
     }
 
 
-async def transcribe_chunks_task(
+# Per-job queues served fairly across jobs and priority tiers
+scheduler = FairScheduler(TIER_WEIGHTS, DEFAULT_TIER)
+
+# userId/API key tiers are resolved by url_processor and stored on the job
+_tier_cache: "OrderedDict[str, str]" = OrderedDict()
+TIER_CACHE_SIZE = 1024
+
+
+def job_tier(job_id: str) -> str:
+    """Priority tier of a job (cached)"""
+    tier = _tier_cache.get(job_id)
+    if tier:
+        return tier
+
+    tier = DEFAULT_TIER
+    if jobs_table:
+        try:
+            item = jobs_table.get_item(
+                Key={"jobId": job_id}, ProjectionExpression="tier").get("Item")
+            if item and item.get("tier"):
+                tier = item["tier"]
+        except Exception as e:
+            logger.error(f"Error reading tier of job {job_id}: {e}")
+
+    _tier_cache[job_id] = tier
+    while len(_tier_cache) > TIER_CACHE_SIZE:
+        _tier_cache.popitem(last=False)
+    return tier
+
+
+@app.on_event("startup")
+async def start_workers():
+    """Start the threads that drain the scheduler"""
+    for n in range(SCHEDULER_WORKERS):
+        threading.Thread(
+            target=scheduler_worker, name=f"scheduler-worker-{n}", daemon=True
+        ).start()
+
+
+def scheduler_worker():
+    """
+    Take chunks in fair order and transcribe them, downloading the next
+    chunk while the current one is being transcribed
+    """
+    with ThreadPoolExecutor(max_workers=1) as prefetcher:
+        upcoming = None
+        while True:
+            try:
+                if upcoming is None:
+                    item = scheduler.get()
+                    fetch = prefetcher.submit(fetch_to_temp, item["source"])
+                else:
+                    item, fetch = upcoming
+
+                following = scheduler.get(timeout=0)
+                upcoming = (
+                    (following, prefetcher.submit(fetch_to_temp, following["source"]))
+                    if following else None
+                )
+
+                source = item["source"]
+                logger.info(
+                    f"Processing chunk {source['chunk_id']} of job {item['job_id']} "
+                    f"(tier {item['tier']}): {source['s3_key']}")
+                process_chunk(item["job_id"], source, item["language"],
+                              item["enqueued_at"], fetch)
+            except Exception as e:
+                logger.error(f"Scheduler worker error: {e}", exc_info=True)
+
+
+@app.get("/stream/credits")
+async def stream_credits():
+    """Free intake slots for directly streamed chunks"""
+    return {"credits": max(0, STREAM_QUEUE_SIZE - scheduler.pending("stream"))}
+
+
+@app.post("/stream/{job_id}/chunks/{chunk_id}")
+async def stream_chunk(
     job_id: str,
-    s3_keys: List[str],
-    language: str = None
+    chunk_id: int,
+    request: Request,
+    language: str = None,
+    archive_key: str = None
 ):
     """
-    Background task to transcribe multiple chunks
+    Low-latency intake: the fog node POSTs the WAV chunk body directly
+    over a keep-alive connection. Free queue slots are returned in
+    X-Stream-Credits; a full queue answers 503 + Retry-After so the
+    sender backs off (flow control).
     """
-    start_time = time.time()
+    if not whisper_model:
+        raise HTTPException(status_code=503, detail="Whisper model not loaded")
+
+    # Always drain the body so the keep-alive connection stays usable
+    body = await request.body()
+    if not body:
+        raise HTTPException(status_code=400, detail="Empty chunk body")
 
+    if scheduler.pending("stream") >= STREAM_QUEUE_SIZE:
+        return Response(
+            status_code=503,
+            headers={"Retry-After": "1", "X-Stream-Credits": "0"}
+        )
+
+    source = {
+        # Where the fog node archives the chunk (replay / chunk metadata)
+        "s3_key": archive_key or f"stream/{job_id}/chunk_{chunk_id:03d}.wav",
+        "chunk_id": chunk_id,
+        "data": body
+    }
+    tier = await asyncio.to_thread(job_tier, job_id)
+    LOAD.add()
+    scheduler.submit(job_id, [{
+        "job_id": job_id, "source": source, "language": language,
+        "tier": tier, "enqueued_at": time.time(), "intake": "stream"
+    }])
+
+    credits = max(0, STREAM_QUEUE_SIZE - scheduler.pending("stream"))
+    return Response(
+        status_code=202,
+        headers={"X-Stream-Credits": str(credits)}
+    )
+
+
+def parse_chunk_id(s3_key: str) -> int:
+    """Chunk ID from key (audio/{job_id}/chunks/chunk_001.wav)"""
     try:
-        logger.info(f"Starting transcription for job {job_id}")
-        
-        # NOTE: In this architecture, status updates should probably be more granular
-        # or handled by a coordinator to avoid race conditions on the "status" field.
-        # For now, we will log efficient updates.
+        chunk_filename = s3_key.split('/')[-1] # chunk_001.wav
+        chunk_id_str = chunk_filename.split('_')[1].split('.')[0] # 001
+        return int(chunk_id_str)
+    except:
+        return 0 # Fallback
+
+
+def chunk_sources(request: TranscriptionRequest) -> List[Dict]:
+    """Normalize a request into chunk sources (whole objects or pack ranges)"""
+    sources = [
+        {"s3_key": key, "chunk_id": parse_chunk_id(key), "hedge": request.hedge}
+        for key in request.s3_keys
+    ]
+    for chunk in request.chunks:
+        sources.append({
+            "s3_key": request.pack_key,
+            "chunk_id": chunk.chunk_id,
+            "offset": chunk.offset,
+            "length": chunk.length,
+            "hedge": request.hedge
+        })
+    return sources
+
+
+def fetch_chunk(source: Dict, dest_path: str):
+    """Download a chunk, using a ranged GET when it lives inside a pack"""
+    if source.get("data") is not None:
+        # Pushed directly by the fog node, nothing to download
+        with open(dest_path, 'wb') as f:
+            f.write(source["data"])
+    elif source.get("length"):
+        start = source["offset"]
+        end = start + source["length"] - 1
+        response = s3_client.get_object(
+            Bucket=PROCESSED_BUCKET,
+            Key=source["s3_key"],
+            Range=f"bytes={start}-{end}"
+        )
+        with open(dest_path, 'wb') as f:
+            shutil.copyfileobj(response["Body"], f)
+    else:
+        s3_client.download_file(
+            PROCESSED_BUCKET, source["s3_key"], dest_path)
 
-        total_chunks = len(s3_keys)
 
-        for idx, s3_key in enumerate(s3_keys):
-            try:
-                logger.info(
-                    f"Processing chunk {idx+1}/{total_chunks}: {s3_key}")
-
-                # Download chunk from S3
-                temp_file = tempfile.NamedTemporaryFile(
-                    delete=False, suffix='.wav')
-                s3_client.download_file(
-                    PROCESSED_BUCKET, s3_key, temp_file.name)
-
-                # Transcribe chunk
-                result = transcribe_with_whisper(
-                    temp_file.name,
-                    language
-                )
+def fetch_to_temp(source: Dict) -> str:
+    """Fetch a chunk into a temp .wav file and return its path"""
+    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.wav')
+    temp_file.close()
+    try:
+        fetch_chunk(source, temp_file.name)
+    except Exception:
+        os.unlink(temp_file.name)
+        raise
+    return temp_file.name
 
-                # Identify chunk ID from key (audio/{job_id}/chunks/chunk_001.wav)
-                try:
-                    chunk_filename = s3_key.split('/')[-1] # chunk_001.wav
-                    chunk_id_str = chunk_filename.split('_')[1].split('.')[0] # 001
-                    chunk_id = int(chunk_id_str)
-                except:
-                    chunk_id = 0 # Fallback
-
-                # Adjust timestamps based on chunk position
-                chunk_offset = chunk_id * 30  # 30 seconds per chunk strict assumption
-                for seg in result['segments']:
-                    seg['start'] += chunk_offset
-                    seg['end'] += chunk_offset
-                
-                # Cleanup temp file
-                os.unlink(temp_file.name)
-                
-                # Save CHUNK transcription
-                chunk_data = {
-                    "job_id": job_id,
-                    "chunk_id": chunk_id,
-                    "text": result['text'],
-                    "segments": result['segments'],
-                    "language": result.get("language", "unknown"),
-                    "model_used": WHISPER_MODEL_NAME,
-                    "s3_key": s3_key,
-                    "timestamp": int(datetime.utcnow().timestamp())
-                }
-                
-                save_chunk_transcription(job_id, chunk_filename, chunk_data)
-
-                # Update progress (blind fire)
-                update_job_status(
-                    job_id,
-                    "processing",
-                    0, # Progress calculation is hard in distributed mode without coordinator
-                    f"Transcribed chunk {chunk_id}"
-                )
 
-                logger.info(
-                    f"Chunk {chunk_id} transcribed successfully")
+def process_chunk(job_id: str, source: Dict, language: str = None,
+                  enqueued_at: float = None, prefetched: Future = None) -> bool:
+    """
+    Fetch, transcribe and save one chunk. Returns False on failure.
+    With `prefetched`, the download phase only measures the wait for it.
+    """
+    s3_key = source["s3_key"]
+    chunk_id = source["chunk_id"]
+    chunk_filename = f"chunk_{chunk_id:03d}.wav"
+    timer = ChunkTimer()
+    # Chunks of one request run sequentially, so later ones wait longer
+    timer.record("queue_wait", max(0.0, time.time() - (enqueued_at or time.time())))
+    temp_path = None
+    processing_seconds = None
+    claimed = False
 
-            except Exception as e:
-                logger.error(f"Error transcribing chunk {s3_key}: {e}")
-                continue
+    try:
+        # Download chunk from S3 (or spill the streamed bytes to disk)
+        with timer.phase("download"):
+            if prefetched is not None:
+                temp_path = prefetched.result()
+            else:
+                temp_path = fetch_to_temp(source)
+
+        # Transcribe chunk
+        result = transcribe_with_whisper(
+            temp_path,
+            language,
+            timer
+        )
+
+        # Adjust timestamps based on chunk position
+        chunk_offset = chunk_id * 30  # 30 seconds per chunk strict assumption
+        for seg in result['segments']:
+            seg['start'] += chunk_offset
+            seg['end'] += chunk_offset
         
-        # We do NOT mark job as completed here, because we only processed a subset of chunks.
-        # The Post-Processor will determine completion.
+        # Save CHUNK transcription
+        chunk_data = {
+            "job_id": job_id,
+            "chunk_id": chunk_id,
+            "text": result['text'],
+            "segments": result['segments'],
+            "language": result.get("language", "unknown"),
+            "model_used": WHISPER_MODEL_NAME,
+            "s3_key": s3_key,
+            "timestamp": int(datetime.utcnow().timestamp())
+        }
 
-    except Exception as e:
-        logger.error(f"Error in transcription task: {e}", exc_info=True)
-        # Don't fail the whole job just for one chunk failure in this context
+        # Upload time of this chunk is only known after the write,
+        # so the stored telemetry covers the phases before it
+        chunk_data["telemetry"] = observe_chunk(
+            timer, WHISPER_MODEL_NAME, WHISPER_PROFILE,
+            result["audio_duration"], result["tokens"])
+
+        # First result wins: a hedged copy may be running elsewhere
+        claimed, winner = claim_chunk(job_id, chunk_id, source.get("hedge", False))
+        if not claimed:
+            record_hedge_loss(job_id, chunk_id, source.get("hedge", False), winner)
+            processing_seconds = chunk_data["telemetry"]["processing_seconds"]
+            return True
+
+        with timer.phase("upload"):
+            save_chunk_transcription(job_id, chunk_filename, chunk_data)
+        PHASE_SECONDS.observe(
+            timer.phases["upload"], phase="upload",
+            model=WHISPER_MODEL_NAME, profile=WHISPER_PROFILE)
+
+        # Progress and ETA from the chunks done so far (blind fire)
+        update_transcription_progress(job_id, chunk_id)
+
+        logger.info(
+            f"Chunk {chunk_id} transcribed successfully "
+            f"({chunk_data['telemetry']})")
+        processing_seconds = chunk_data["telemetry"]["processing_seconds"]
+        return True
 
+    except Exception as e:
+        logger.error(f"Error transcribing chunk {s3_key} ({chunk_id}): {e}")
+        observe_chunk(timer, WHISPER_MODEL_NAME, WHISPER_PROFILE,
+                      0, 0, ok=False)
+        # Lets the trigger's straggler sweep re-dispatch it right away
+        mark_chunk_failed(job_id, chunk_id, claimed, replay_source(source))
+        return False
+    finally:
+        LOAD.done(processing_seconds)
+        # Cleanup temp file
+        if temp_path and os.path.exists(temp_path):
+            os.unlink(temp_path)
 
 
-def transcribe_with_whisper(audio_path: str, language: str = None) -> Dict:
+def transcribe_with_whisper(audio_path: str, language: str = None,
+                            timer: ChunkTimer = None) -> Dict:
     """Transcribe using Whisper"""
+    timer = timer or ChunkTimer()
     try:
-        result = whisper_model.transcribe(
-            audio_path,
-            language=language,
-            task="transcribe",
-            verbose=False
-        )
+        # Decode separately so ffmpeg time is not counted as inference
+        with timer.phase("decode"):
+            audio = whisper.load_audio(audio_path)
+        audio_duration = len(audio) / whisper.audio.SAMPLE_RATE
+
+        with timer.phase("inference"):
+            result = whisper_model.transcribe(
+                audio,
+                language=language,
+                task="transcribe",
+                verbose=False
+            )
 
         # Format segments
         formatted_segments = []
+        tokens = 0
         for seg in result.get("segments", []):
+            tokens += len(seg.get("tokens", []))
             formatted_segments.append({
                 "id": seg.get("id"),
                 "start": seg.get("start"),
@@ -261,7 +506,9 @@ def transcribe_with_whisper(audio_path: str, language: str = None) -> Dict:
         return {
             "text": result["text"],
             "segments": formatted_segments,
-            "language": result.get("language", "unknown")
+            "language": result.get("language", "unknown"),
+            "audio_duration": audio_duration,
+            "tokens": tokens
         }
     except Exception as e:
         logger.error(f"Whisper transcription error: {e}")
@@ -269,26 +516,169 @@ def transcribe_with_whisper(audio_path: str, language: str = None) -> Dict:
 
 
 def save_chunk_transcription(job_id: str, chunk_filename: str, data: Dict):
-    """Save chunk transcription to S3"""
+    """Save chunk transcription to S3 (compact .tcb encoding)"""
     if not TRANSCRIPTION_BUCKET:
         logger.warning("Transcription bucket not configured")
         return
 
     try:
-        # e.g. transcriptions/{job_id}/chunks/chunk_001.json
-        chunk_name = chunk_filename.replace('.wav', '.json')
+        # e.g. transcriptions/{job_id}/chunks/chunk_001.tcb
+        chunk_name = chunk_filename.replace('.wav', chunk_format.SUFFIX)
         key = f"transcriptions/{job_id}/chunks/{chunk_name}"
 
         s3_client.put_object(
             Bucket=TRANSCRIPTION_BUCKET,
             Key=key,
-            Body=json.dumps(data, indent=2),
-            ContentType="application/json"
+            Body=chunk_format.encode_chunk(data),
+            ContentType=chunk_format.CONTENT_TYPE
         )
 
         logger.info(f"Saved chunk transcription to S3: {key}")
     except Exception as e:
         logger.error(f"Error saving chunk to S3: {e}")
+        # Fail the chunk so the ledger claim is released
+        raise
+
+
+def claim_chunk(job_id: str, chunk_id: int, hedge: bool):
+    """
+    Conditional completion write on the dispatch ledger.
+    Returns (won, ledger item of the winner when we lost).
+    """
+    if not chunks_table:
+        return True, None
+
+    now = int(time.time())
+    try:
+        chunks_table.update_item(
+            Key={"jobId": job_id, "chunkId": chunk_id},
+            UpdateExpression=(
+                "SET completedAt = :now, winner = :me, wonByHedge = :hedge,"
+                " #ttl = if_not_exists(#ttl, :ttl) REMOVE outstanding, failedAt"
+            ),
+            ConditionExpression="attribute_not_exists(completedAt)",
+            ExpressionAttributeNames={"#ttl": "ttl"},
+            ExpressionAttributeValues={
+                ":now": now,
+                ":me": INSTANCE_ID,
+                ":hedge": hedge,
+                ":ttl": now + LEDGER_TTL_SECONDS
+            }
+        )
+    except ClientError as e:
+        if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+            logger.error(f"Error claiming chunk {chunk_id}: {e}")
+            return True, None  # Ledger unavailable: never drop results
+        item = chunks_table.get_item(
+            Key={"jobId": job_id, "chunkId": chunk_id}).get("Item", {})
+        return False, item
+
+    if hedge:
+        HEDGE_OUTCOMES.inc(outcome="won")
+        update_job_counters(job_id, hedgeWins=1)
+    return True, None
+
+
+def record_hedge_loss(job_id: str, chunk_id: int, hedge: bool, winner: Dict):
+    """
+    Discarded duplicate. When the original loses to a hedge, the time the
+    hedge finished ahead of it is the latency the hedge saved.
+    """
+    completed_at = float(winner.get("completedAt", time.time()))
+    if hedge:
+        HEDGE_OUTCOMES.inc(outcome="lost")
+        update_job_counters(job_id, hedgeLosses=1)
+        logger.info(f"Hedged chunk {chunk_id} of job {job_id} lost, result discarded")
+        return
+
+    if not winner.get("wonByHedge"):
+        # Redelivered dispatch of a chunk that was already done
+        logger.info(f"Chunk {chunk_id} of job {job_id} already completed, result discarded")
+        return
+
+    saved = max(0, int(time.time() - completed_at))
+    HEDGE_SAVED_SECONDS.inc(saved)
+    update_job_counters(job_id, hedgeSavedSeconds=saved)
+    logger.info(
+        f"Chunk {chunk_id} of job {job_id} was already completed by "
+        f"{winner.get('winner')} ({saved}s earlier), result discarded")
+
+
+def replay_source(source: Dict) -> Optional[Dict]:
+    """Ledger form of a chunk source, None when it cannot be fetched again"""
+    if "offset" in source:
+        return {"pack_key": source["s3_key"], "chunk_id": source["chunk_id"],
+                "offset": source["offset"], "length": source["length"]}
+    if source["s3_key"].startswith("stream/"):
+        return None  # streamed without an archive copy
+    return {"s3_key": source["s3_key"]}
+
+
+def mark_chunk_failed(job_id: str, chunk_id: int, claimed: bool,
+                      source: Optional[Dict] = None):
+    """Reopen the ledger entry of a failed chunk (releasing our claim)"""
+    if not chunks_table:
+        return
+
+    try:
+        if claimed and source:
+            # Our claim may have created the item (a streamed chunk that
+            # finished before the fog node recorded it): add what the
+            # straggler sweep needs to find (OutstandingIndex) and replay it
+            now = int(time.time())
+            chunks_table.update_item(
+                Key={"jobId": job_id, "chunkId": chunk_id},
+                UpdateExpression=(
+                    "SET failedAt = :now, outstanding = :one,"
+                    " dispatchedAt = if_not_exists(dispatchedAt, :now),"
+                    " #src = if_not_exists(#src, :src)"
+                    " REMOVE completedAt, winner, wonByHedge"
+                ),
+                ConditionExpression="winner = :me",
+                ExpressionAttributeNames={"#src": "source"},
+                ExpressionAttributeValues={
+                    ":now": now, ":one": "1", ":me": INSTANCE_ID, ":src": source}
+            )
+        elif claimed:
+            chunks_table.update_item(
+                Key={"jobId": job_id, "chunkId": chunk_id},
+                UpdateExpression=(
+                    "SET failedAt = :now, outstanding = :one"
+                    " REMOVE completedAt, winner, wonByHedge"
+                ),
+                ConditionExpression="winner = :me",
+                ExpressionAttributeValues={
+                    ":now": int(time.time()), ":one": "1", ":me": INSTANCE_ID}
+            )
+        else:
+            chunks_table.update_item(
+                Key={"jobId": job_id, "chunkId": chunk_id},
+                UpdateExpression="SET failedAt = :now",
+                # Only chunks dispatched by the trigger can be re-dispatched
+                ConditionExpression=(
+                    "attribute_exists(dispatchedAt) AND "
+                    "attribute_not_exists(completedAt)"
+                ),
+                ExpressionAttributeValues={":now": int(time.time())}
+            )
+    except ClientError as e:
+        if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+            logger.error(f"Error marking chunk {chunk_id} failed: {e}")
+
+
+def update_job_counters(job_id: str, **counters):
+    """Atomic ADD of hedging counters on the job record"""
+    if not jobs_table:
+        return
+
+    try:
+        jobs_table.update_item(
+            Key={"jobId": job_id},
+            UpdateExpression="ADD " + ", ".join(f"{name} :{name}" for name in counters),
+            ExpressionAttributeValues={f":{name}": value for name, value in counters.items()}
+        )
+    except Exception as e:
+        logger.error(f"Error updating job counters: {e}")
 
 
 def save_transcription(data: Dict):
@@ -347,6 +737,64 @@ def save_to_s3(job_id: str, data: Dict):
         logger.error(f"Error saving to S3: {e}")
 
 
+def update_transcription_progress(job_id: str, chunk_id: int):
+    """
+    Count a transcribed chunk and refresh the job's progress (share of the
+    chunks done, 10-95%: the post-processor sets 100) and ETA, extrapolated
+    from this job's own pace since its first chunk plus the merge estimate
+    stored at submission. Status and updatedAt stay with the fog node (the
+    sweeper reads updatedAt as its ingest heartbeat).
+    """
+    if not jobs_table:
+        return
+
+    now = int(time.time())
+    try:
+        job = jobs_table.update_item(
+            Key={"jobId": job_id},
+            UpdateExpression=(
+                "SET message = :message, firstChunkAt = if_not_exists(firstChunkAt, :now)"
+                " ADD chunksDone :one"
+            ),
+            ExpressionAttributeValues={
+                ":message": f"Transcribed chunk {chunk_id}",
+                ":now": now,
+                ":one": 1
+            },
+            ReturnValues="ALL_NEW"
+        )["Attributes"]
+
+        done = int(job["chunksDone"])
+        # totalChunks is exact but only known once ingest has finished
+        total = int(job.get("totalChunks") or job.get("expectedChunks") or 0)
+        if not total:
+            return
+
+        progress = int(10 + 85 * min(1.0, done / total))
+        update_expr = "SET progress = :progress"
+        values = {":progress": progress}
+
+        elapsed = now - int(job["firstChunkAt"])
+        if done >= ETA_MIN_CHUNKS and elapsed > 0:
+            remaining = max(0, total - done) * elapsed / (done - 1)
+            eta = int(remaining + int(job.get("etaMergeSeconds", 0)))
+            update_expr += ", etaSeconds = :eta, estimatedCompletionAt = :at"
+            values.update({":eta": eta, ":at": now + eta})
+
+        # Never move backwards (out-of-order chunks, or already completed)
+        jobs_table.update_item(
+            Key={"jobId": job_id},
+            UpdateExpression=update_expr,
+            ConditionExpression="attribute_not_exists(progress) OR progress <= :progress",
+            ExpressionAttributeValues=values
+        )
+    except ClientError as e:
+        if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+            logger.error(f"Error updating job progress: {e}")
+    except Exception as e:
+        logger.error(f"Error updating job progress: {e}")
+
+
 def update_job_status(job_id: str, status: str, progress: int, message: str):
     """Update job status in DynamoDB"""
     if not jobs_table:
@@ -368,6 +816,29 @@ def update_job_status(job_id: str, status: str, progress: int, message: str):
         logger.error(f"Error updating job status: {e}")
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus metrics"""
+    return PlainTextResponse(
+        REGISTRY.render(),
+        media_type="text/plain; version=0.0.4"
+    )
+
+
+@app.get("/stats")
+async def stats():
+    """Current load, polled by the trigger Lambda's router"""
+    return {
+        **LOAD.snapshot(),
+        "stream_credits": max(0, STREAM_QUEUE_SIZE - scheduler.pending("stream")),
+        "tiers": scheduler.stats(),
+        "accepting": whisper_model is not None,
+        "model": WHISPER_MODEL_NAME,
+        "profile": WHISPER_PROFILE,
+        "timestamp": time.time()
+    }
+
+
 @app.get("/models")
 async def get_models():
     """Get available models"""
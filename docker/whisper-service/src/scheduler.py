@@ -0,0 +1,130 @@
+"""
+Fair Scheduler
+Colas por job servidas con deficit round-robin, ponderado por tier de prioridad
+"""
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+from src.telemetry import QUEUE_WAIT_SECONDS
+
+# Queue waits kept per tier for the percentiles on /stats
+WAIT_WINDOW = 256
+
+
+def _percentile(values: List[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return round(ordered[index], 3)
+
+
+class FairScheduler:
+    """
+    One FIFO per job; active jobs are served round-robin with a deficit
+    counter, so each turn a job may take `quantum * weight(tier)` chunks.
+    A 480-chunk episode therefore gets one chunk per round instead of
+    holding the whole intake, and a clip submitted after it starts right
+    away. Items are dicts with at least job_id, tier and enqueued_at.
+    """
+
+    def __init__(self, weights: Dict[str, float], default_tier: str = "standard",
+                 quantum: float = 1.0):
+        self.weights = weights
+        self.default_tier = default_tier
+        self.quantum = quantum
+        self._queues: Dict[str, deque] = {}
+        self._deficit: Dict[str, float] = {}
+        self._active = deque()
+        self._pending_by_intake: Dict[str, int] = {}
+        self._waits: Dict[str, deque] = {}
+        self._cond = threading.Condition()
+
+    def weight(self, tier: str) -> float:
+        return max(0.01, float(self.weights.get(tier, 1)))
+
+    def submit(self, job_id: str, items: List[Dict], front: bool = False):
+        """Queue items for a job; `front` puts them ahead of the job's backlog"""
+        with self._cond:
+            queue = self._queues.get(job_id)
+            if queue is None:
+                queue = self._queues[job_id] = deque()
+                self._deficit[job_id] = 0.0
+                self._active.append(job_id)
+            if front:
+                queue.extendleft(reversed(items))
+            else:
+                queue.extend(items)
+            for item in items:
+                intake = item.get("intake", "batch")
+                self._pending_by_intake[intake] = self._pending_by_intake.get(intake, 0) + 1
+            self._cond.notify(len(items))
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Dict]:
+        """Next item in fair order; None if nothing arrives within timeout"""
+        deadline = None if timeout is None else time.time() + timeout
+        with self._cond:
+            while not self._active:
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+
+            while True:
+                job_id = self._active[0]
+                queue = self._queues[job_id]
+                if self._deficit[job_id] < 1:
+                    # New turn for this job
+                    self._deficit[job_id] += self.quantum * self.weight(
+                        queue[0].get("tier", self.default_tier))
+                    if self._deficit[job_id] < 1:
+                        self._active.rotate(-1)
+                        continue
+
+                item = queue.popleft()
+                self._deficit[job_id] -= 1
+                if not queue:
+                    # Idle jobs do not bank credit
+                    self._active.popleft()
+                    del self._queues[job_id]
+                    del self._deficit[job_id]
+                elif self._deficit[job_id] < 1:
+                    self._active.rotate(-1)
+                break
+
+            intake = item.get("intake", "batch")
+            self._pending_by_intake[intake] -= 1
+            tier = item.get("tier", self.default_tier)
+            wait = max(0.0, time.time() - item["enqueued_at"])
+            self._waits.setdefault(tier, deque(maxlen=WAIT_WINDOW)).append(wait)
+
+        QUEUE_WAIT_SECONDS.observe(wait, tier=tier)
+        return item
+
+    def pending(self, intake: Optional[str] = None) -> int:
+        with self._cond:
+            if intake is None:
+                return sum(self._pending_by_intake.values())
+            return self._pending_by_intake.get(intake, 0)
+
+    def stats(self) -> Dict:
+        """Queued jobs/chunks and recent queue wait percentiles per tier"""
+        with self._cond:
+            tiers: Dict[str, Dict] = {}
+            for job_id, queue in self._queues.items():
+                tier = queue[0].get("tier", self.default_tier)
+                entry = tiers.setdefault(tier, {"jobs": 0, "chunks": 0})
+                entry["jobs"] += 1
+                entry["chunks"] += len(queue)
+            waits = {tier: list(values) for tier, values in self._waits.items()}
+
+        for tier, values in waits.items():
+            entry = tiers.setdefault(tier, {"jobs": 0, "chunks": 0})
+            entry["wait_p50_seconds"] = _percentile(values, 50)
+            entry["wait_p95_seconds"] = _percentile(values, 95)
+            entry["weight"] = self.weight(tier)
+        for tier, entry in tiers.items():
+            entry.setdefault("weight", self.weight(tier))
+        return tiers
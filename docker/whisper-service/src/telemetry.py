@@ -0,0 +1,300 @@
+"""
+Whisper Service Telemetry
+Contadores e histogramas en memoria, expuestos en formato Prometheus
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Tuple
+
+# Buckets in seconds, tuned for 30 s chunks on CPU
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+# Real-time factor: processing seconds per audio second
+RTF_BUCKETS = (0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1, 1.5, 2, 4)
+# Generated tokens per processing second
+TOKENS_PER_SECOND_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+def _label_key(labels: Dict[str, str]) -> Tuple:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: Tuple, extra: Iterable[Tuple[str, str]] = ()) -> str:
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    body = ",".join(
+        '{}="{}"'.format(k, v.replace("\\", "\\\\").replace('"', '\\"'))
+        for k, v in pairs
+    )
+    return "{" + body + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """Monotonic counter with labels"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, value: float = 1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+    def render(self) -> list:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(k)} {_format_value(v)}"
+                for k, v in items]
+
+
+class Gauge(Counter):
+    """Value that can go up and down"""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def dec(self, value: float = 1, **labels):
+        self.inc(-value, **labels)
+
+    def get(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(_label_key(labels), 0)
+
+
+class Histogram:
+    """Cumulative histogram with fixed buckets"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, buckets: Iterable[float]):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._series: Dict[Tuple, dict] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = {"counts": [0] * len(self.buckets), "sum": 0.0,
+                          "count": 0}
+                self._series[key] = series
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["counts"][i] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    def render(self) -> list:
+        with self._lock:
+            items = sorted(
+                (k, {"counts": list(s["counts"]), "sum": s["sum"],
+                     "count": s["count"]})
+                for k, s in self._series.items()
+            )
+        lines = []
+        for key, series in items:
+            for bound, count in zip(self.buckets, series["counts"]):
+                labels = _format_labels(key, [("le", _format_value(bound))])
+                lines.append(f"{self.name}_bucket{labels} {count}")
+            lines.append(
+                f"{self.name}_sum{_format_labels(key)} "
+                f"{_format_value(series['sum'])}")
+            lines.append(
+                f"{self.name}_count{_format_labels(key)} {series['count']}")
+        return lines
+
+
+class Registry:
+    """Holds every metric exposed on /metrics"""
+
+    def __init__(self):
+        self._metrics = []
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        metric = Counter(name, help_text)
+        self._metrics.append(metric)
+        return metric
+
+    def gauge(self, name: str, help_text: str) -> Gauge:
+        metric = Gauge(name, help_text)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, help_text: str,
+                  buckets: Iterable[float] = LATENCY_BUCKETS) -> Histogram:
+        metric = Histogram(name, help_text, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+PHASE_SECONDS = REGISTRY.histogram(
+    "whisper_phase_seconds",
+    "Time spent in each chunk phase (queue_wait, download, decode, inference, upload)")
+CHUNK_SECONDS = REGISTRY.histogram(
+    "whisper_chunk_seconds",
+    "End-to-end processing time per chunk, excluding queue wait")
+REALTIME_FACTOR = REGISTRY.histogram(
+    "whisper_realtime_factor",
+    "Inference seconds per second of audio", RTF_BUCKETS)
+TOKENS_PER_SECOND = REGISTRY.histogram(
+    "whisper_tokens_per_second",
+    "Decoded tokens per inference second", TOKENS_PER_SECOND_BUCKETS)
+CHUNKS_TOTAL = REGISTRY.counter(
+    "whisper_chunks_total", "Chunks processed, by outcome")
+AUDIO_SECONDS_TOTAL = REGISTRY.counter(
+    "whisper_audio_seconds_total", "Seconds of audio transcribed")
+TOKENS_TOTAL = REGISTRY.counter(
+    "whisper_tokens_total", "Tokens decoded")
+
+
+class ChunkTimer:
+    """Times the phases of a single chunk"""
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + (
+                time.perf_counter() - start)
+
+    def record(self, name: str, seconds: float):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def as_dict(self) -> Dict[str, float]:
+        return {name: round(seconds, 4) for name, seconds in self.phases.items()}
+
+
+def observe_chunk(timer: ChunkTimer, model: str, profile: str,
+                  audio_seconds: float, tokens: int, ok: bool = True) -> Dict:
+    """
+    Feed a finished chunk into the aggregates.
+    Returns the per-chunk summary attached to the chunk JSON.
+    """
+    labels = {"model": model, "profile": profile}
+
+    for name, seconds in timer.phases.items():
+        PHASE_SECONDS.observe(seconds, phase=name, **labels)
+
+    CHUNKS_TOTAL.inc(status="ok" if ok else "error", **labels)
+    if not ok:
+        return {"phases": timer.as_dict()}
+
+    processing = sum(
+        seconds for name, seconds in timer.phases.items()
+        if name != "queue_wait")
+    inference = timer.phases.get("inference", 0.0)
+
+    CHUNK_SECONDS.observe(processing, **labels)
+    AUDIO_SECONDS_TOTAL.inc(audio_seconds, **labels)
+    TOKENS_TOTAL.inc(tokens, **labels)
+
+    rtf = inference / audio_seconds if audio_seconds > 0 else None
+    tps = tokens / inference if inference > 0 else None
+    if rtf is not None:
+        REALTIME_FACTOR.observe(rtf, **labels)
+    if tps is not None:
+        TOKENS_PER_SECOND.observe(tps, **labels)
+
+    return {
+        "phases": timer.as_dict(),
+        "processing_seconds": round(processing, 4),
+        "audio_seconds": round(audio_seconds, 3),
+        "tokens": tokens,
+        "realtime_factor": round(rtf, 4) if rtf is not None else None,
+        "tokens_per_second": round(tps, 2) if tps is not None else None,
+        "model": model,
+        "profile": profile
+    }
+
+
+PENDING_CHUNKS = REGISTRY.gauge(
+    "whisper_pending_chunks", "Chunks accepted and not yet finished")
+
+
+class LoadTracker:
+    """
+    Outstanding work on this instance, reported on /stats so the trigger
+    can route chunks to the least-loaded instance.
+    """
+
+    def __init__(self, alpha: float = 0.2, initial_chunk_seconds: float = 10.0):
+        self.alpha = alpha
+        self.ewma_chunk_seconds = initial_chunk_seconds
+        self.pending = 0
+        self._lock = threading.Lock()
+
+    def add(self, chunks: int = 1):
+        with self._lock:
+            self.pending += chunks
+        PENDING_CHUNKS.inc(chunks)
+
+    def done(self, processing_seconds: float = None):
+        """One chunk finished; successful ones update the per-chunk EWMA"""
+        with self._lock:
+            self.pending = max(0, self.pending - 1)
+            if processing_seconds is not None:
+                self.ewma_chunk_seconds += self.alpha * (
+                    processing_seconds - self.ewma_chunk_seconds)
+        PENDING_CHUNKS.dec()
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            pending = self.pending
+            ewma = self.ewma_chunk_seconds
+        return {
+            "pending_chunks": pending,
+            "ewma_chunk_seconds": round(ewma, 3),
+            "outstanding_seconds": round(pending * ewma, 3)
+        }
+
+
+LOAD = LoadTracker()
+
+
+HEDGE_OUTCOMES = REGISTRY.counter(
+    "whisper_hedge_outcomes_total",
+    "Hedged chunk copies that won or lost the completion race")
+HEDGE_SAVED_SECONDS = REGISTRY.counter(
+    "whisper_hedge_saved_seconds_total",
+    "Seconds by which hedged copies beat the original dispatch")
+
+
+QUEUE_WAIT_SECONDS = REGISTRY.histogram(
+    "whisper_queue_wait_seconds",
+    "Time chunks wait in the fair scheduler, by priority tier")
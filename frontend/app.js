@@ -18,7 +18,10 @@ document.addEventListener('DOMContentLoaded', () => {
     const previewText = document.getElementById('preview-text');
 
     let currentJobId = null;
-    let pollInterval = null;
+    let socket = null;
+    let pingInterval = null;
+    let polling = false;
+    let lastEtag = null;
 
     // --- Event Listeners ---
     submitBtn.addEventListener('click', handleSubmit);
@@ -49,10 +52,11 @@ document.addEventListener('DOMContentLoaded', () => {
             currentJobId = data.jobId;
 
             showLog(`Job created! ID: ${currentJobId}`);
+            if (data.estimatedTime) showLog(`Estimated time: ${data.estimatedTime}`);
             updateStatus("Processing", "Phase 1: Streaming", 10);
 
             statusContainer.classList.remove('hidden');
-            startPolling();
+            watchJob();
 
         } catch (error) {
             console.error(error);
@@ -61,66 +65,125 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     }
 
-    function startPolling() {
-        if (pollInterval) clearInterval(pollInterval);
+    // Push updates over WebSocket; polling only when it is unavailable or drops
+    function watchJob() {
+        if (!CONFIG.WS_URL || !('WebSocket' in window)) return startPolling();
+
+        stopWatching();
+        const jobId = currentJobId;
+        socket = new WebSocket(`${CONFIG.WS_URL}?jobId=${encodeURIComponent(jobId)}`);
+
+        socket.onopen = () => {
+            showLog("Live updates connected");
+            // One read for anything that changed before the socket opened
+            fetchStatus().catch(error => console.warn("Status fetch error:", error));
+            // API Gateway drops connections idle for 10 minutes
+            pingInterval = setInterval(() => {
+                if (socket && socket.readyState === WebSocket.OPEN) {
+                    socket.send(JSON.stringify({ action: 'ping' }));
+                }
+            }, 5 * 60 * 1000);
+        };
+
+        socket.onmessage = (event) => {
+            const data = JSON.parse(event.data);
+            if (data.type !== 'job' || data.jobId !== currentJobId) return;
+            if (data.status === 'completed') {
+                // Download links are presigned by GET /jobs/{id}
+                lastEtag = null;
+                fetchStatus().catch(error => console.warn("Status fetch error:", error));
+            } else {
+                handleStatusUpdate(data);
+            }
+        };
+
+        socket.onclose = () => {
+            clearInterval(pingInterval);
+            socket = null;
+            if (currentJobId === jobId && !polling) {
+                showLog("Live updates unavailable, falling back to polling");
+                startPolling();
+            }
+        };
+    }
 
-        pollInterval = setInterval(async () => {
-            if (!currentJobId) return;
+    function stopWatching() {
+        clearInterval(pingInterval);
+        if (socket) {
+            socket.onclose = null;
+            socket.close();
+            socket = null;
+        }
+    }
 
-            try {
-                const response = await fetch(`${CONFIG.API_URL}/jobs/${currentJobId}`);
-                const data = await response.json();
+    // Conditional GET: the API answers 304 (no body) while the job is unchanged.
+    // With wait > 0 it holds the request until the job changes (long poll).
+    async function fetchStatus(wait = 0) {
+        const headers = lastEtag ? { 'If-None-Match': lastEtag } : {};
+        const response = await fetch(`${CONFIG.API_URL}/jobs/${currentJobId}?wait=${wait}`, { headers });
+        if (response.status === 304) return false;
 
-                handleStatusUpdate(data);
+        lastEtag = response.headers.get('ETag');
+        handleStatusUpdate(await response.json());
+        return true;
+    }
 
-            } catch (error) {
-                console.warn("Polling error:", error);
+    function startPolling() {
+        polling = true;
+        const jobId = currentJobId;
+
+        (async () => {
+            while (polling && currentJobId === jobId) {
+                try {
+                    if (!await fetchStatus(20)) {
+                        await sleep(1000);
+                    }
+                } catch (error) {
+                    console.warn("Polling error:", error);
+                    await sleep(5000);
+                }
             }
-        }, 5000); // Poll every 5s
+        })();
     }
 
-    function handleStatusUpdate(data) {
-        // Calculate progress based on totalChunks if available
-        let progress = 0;
-        let statusMsg = "Processing...";
-        let badge = "Processing";
+    function sleep(ms) {
+        return new Promise(resolve => setTimeout(resolve, ms));
+    }
 
+    function handleStatusUpdate(data) {
         if (data.status === "completed") {
-            progress = 100;
             finishJob(data);
             return;
         }
 
-        if (data.status === "processing") {
-            // Estimate progress
-            if (data.totalChunks && data.totalChunks > 0) {
-                // If we have total chunks, check if we have specific progress
-                // For now, we simulate based on time or just keep it moving
-                // Since our API currently only returns status, we can't be precise yet
-                // But we can check message
-            }
-
-            // Simple heuristics based on message
-            if (data.message.includes("Transcribed chunk")) {
-                statusMsg = data.message;
-                badge = "Phase 2: Transcribing";
-                progress = 50; // Approximated
+        // The whisper service reports progress (share of chunks transcribed)
+        // and an ETA measured from the job's own pace
+        const progress = data.progress != null ? Number(data.progress) : 10;
+        const badge = data.status === "streaming" ? "Phase 1: Streaming"
+            : data.status === "transcribing" || progress > 10 ? "Phase 2: Transcribing"
+            : "Processing";
 
-                // Try to parse "Transcribed chunk X"
-                const match = data.message.match(/chunk (\d+)/);
-                if (match && data.totalChunks) {
-                    progress = (parseInt(match[1]) / parseInt(data.totalChunks)) * 90;
-                }
-            } else {
-                progress = 20;
-            }
-        }
+        let statusMsg = data.message || "Processing...";
+        const eta = formatEta(data);
+        if (eta) statusMsg += ` (${eta} left)`;
 
         updateStatus(statusMsg, badge, progress);
     }
 
+    function formatEta(data) {
+        let seconds = data.estimatedCompletionAt != null
+            ? Number(data.estimatedCompletionAt) - Date.now() / 1000
+            : data.etaSeconds != null ? Number(data.etaSeconds) : null;
+        if (seconds == null || isNaN(seconds)) return null;
+        seconds = Math.max(0, Math.round(seconds));
+        if (seconds < 60) return "less than a minute";
+        const minutes = Math.round(seconds / 60);
+        return minutes < 60 ? `~${minutes} min` : `~${Math.floor(minutes / 60)} h ${minutes % 60} min`;
+    }
+
     function finishJob(data) {
-        clearInterval(pollInterval);
+        polling = false;
+        stopWatching();
         setLoading(false);
         updateStatus("Job Completed!", "Done", 100);
         showLog("Transcription finished successfully!");
@@ -159,11 +222,12 @@ document.addEventListener('DOMContentLoaded', () => {
             downloadJson.href = data.downloadUrlJson;
             downloadJson.classList.remove('disabled');
 
-            // Fetch preview content safely using the presigned URL
-            fetch(data.downloadUrlTxt)
-                .then(res => res.text())
-                .then(text => {
-                    previewText.textContent = text.substring(0, 1000) + (text.length > 1000 ? "..." : "");
+            // Preview: only the first two minutes, not the whole transcript
+            fetch(`${CONFIG.API_URL}/jobs/${currentJobId}/segments?start=0&end=120`)
+                .then(res => res.json())
+                .then(window => {
+                    const text = window.segments.map(s => s.text.trim()).join(" ");
+                    previewText.textContent = text.substring(0, 1000) + "...";
                 })
                 .catch(err => console.warn("Could not load preview", err));
         }
@@ -190,6 +254,9 @@ document.addEventListener('DOMContentLoaded', () => {
     }
 
     function resetUI() {
+        polling = false;
+        lastEtag = null;
+        stopWatching();
         statusContainer.classList.add('hidden');
         resultsContainer.classList.add('hidden');
         logConsole.innerHTML = '';
@@ -1,4 +1,6 @@
 const CONFIG = {
     // API URL from Terraform Output (to be updated automatically or manually)
-    API_URL: "https://b5urobtgp7.execute-api.us-east-1.amazonaws.com/prod"
+    API_URL: "https://b5urobtgp7.execute-api.us-east-1.amazonaws.com/prod",
+    // WebSocket URL (terraform output websocket_url); empty = polling only
+    WS_URL: ""
 };
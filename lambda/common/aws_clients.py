@@ -0,0 +1,68 @@
+"""
+Lazily built, shared AWS clients for the Lambda handlers
+
+Building a boto3 client or resource loads and parses its service model,
+which is most of a handler's init time after the SDK import itself. The
+handlers declare their clients and tables at module level as usual, but
+get stand-ins that build the real object on first use and keep it for the
+life of the container, so a cold start only pays for what the invoked
+route touches (url_processor's ECS client is only built on the direct
+fog node fallback path, for example).
+"""
+import threading
+
+import boto3
+
+# RLock: a table builds the shared dynamodb resource while holding it.
+# One lock for everything: boto3's default session is not thread safe.
+_lock = threading.RLock()
+_built = {}
+
+
+def _get(key, factory):
+    obj = _built.get(key)
+    if obj is None:
+        with _lock:
+            obj = _built.get(key)
+            if obj is None:
+                obj = _built[key] = factory()
+    return obj
+
+
+def get_client(service: str, **kwargs):
+    """Cached boto3 client, built now"""
+    key = ("client", service, tuple(sorted(kwargs.items())))
+    return _get(key, lambda: boto3.client(service, **kwargs))
+
+
+def get_resource(service: str):
+    """Cached boto3 resource, built now"""
+    return _get(("resource", service), lambda: boto3.resource(service))
+
+
+def get_table(name: str):
+    """Cached DynamoDB Table on the shared dynamodb resource, built now"""
+    return _get(("table", name), lambda: get_resource("dynamodb").Table(name))
+
+
+class Lazy:
+    """Stands in for a client, resource or table until an attribute is used"""
+
+    def __init__(self, factory):
+        self._factory = factory
+
+    def __getattr__(self, name):
+        # Only called for attributes not found on the stand-in itself
+        return getattr(self._factory(), name)
+
+
+def client(service: str, **kwargs) -> Lazy:
+    return Lazy(lambda: get_client(service, **kwargs))
+
+
+def resource(service: str) -> Lazy:
+    return Lazy(lambda: get_resource(service))
+
+
+def table(name: str) -> Lazy:
+    return Lazy(lambda: get_table(name))
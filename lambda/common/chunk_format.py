@@ -0,0 +1,116 @@
+"""
+Compact binary format for per-chunk transcription results (.tcb)
+
+Layout:
+    b"TC" | version (1 byte) | gzip(payload)
+
+payload (little-endian):
+    u32 header_len | header JSON (job_id, chunk_id, language, ...)
+    u32 n          | f32[n] starts | f32[n] ends | f32[n] confidences (NaN = none)
+    u32[n+1] text offsets into the UTF-8 blob | UTF-8 segment text blob
+
+The chunk text is the concatenation of the segment texts, exactly as
+Whisper builds it, so it is not stored twice.
+
+Single source: the whisper service image gets a copy at build time
+(scripts/build-docker.sh, scripts/deploy.sh).
+"""
+import gzip
+import json
+import math
+import struct
+from typing import Dict, List
+
+MAGIC = b"TC"
+FORMAT_VERSION = 1
+SUFFIX = ".tcb"
+CONTENT_TYPE = "application/octet-stream"
+
+_SEGMENT_FIELDS = ("id", "start", "end", "text", "confidence")
+
+
+def encode_chunk(data: Dict) -> bytes:
+    """Encode a chunk result dict (as built by the whisper service)"""
+    segments = data.get("segments") or []
+    header = {k: v for k, v in data.items() if k not in ("segments", "text")}
+    if not segments and data.get("text"):
+        # Keep text for chunks Whisper returned without segments
+        header["text"] = data["text"]
+    header_bytes = json.dumps(header, separators=(",", ":"), default=str).encode("utf-8")
+
+    n = len(segments)
+    starts = [float(s.get("start") or 0.0) for s in segments]
+    ends = [float(s.get("end") or 0.0) for s in segments]
+    confidences = [
+        float(s["confidence"]) if s.get("confidence") is not None else math.nan
+        for s in segments
+    ]
+
+    offsets = [0]
+    blob = bytearray()
+    for seg in segments:
+        blob += (seg.get("text") or "").encode("utf-8")
+        offsets.append(len(blob))
+
+    payload = b"".join([
+        struct.pack("<I", len(header_bytes)),
+        header_bytes,
+        struct.pack("<I", n),
+        struct.pack(f"<{n}f", *starts),
+        struct.pack(f"<{n}f", *ends),
+        struct.pack(f"<{n}f", *confidences),
+        struct.pack(f"<{n + 1}I", *offsets),
+        bytes(blob),
+    ])
+
+    return MAGIC + bytes([FORMAT_VERSION]) + gzip.compress(payload, compresslevel=6)
+
+
+def decode_chunk(raw: bytes) -> Dict:
+    """Decode a .tcb object back into the chunk result dict"""
+    if raw[:2] != MAGIC:
+        raise ValueError("Not a transcript chunk object")
+    version = raw[2]
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported chunk format version: {version}")
+
+    payload = gzip.decompress(raw[3:])
+    pos = 0
+
+    (header_len,) = struct.unpack_from("<I", payload, pos)
+    pos += 4
+    header = json.loads(payload[pos:pos + header_len].decode("utf-8"))
+    pos += header_len
+
+    (n,) = struct.unpack_from("<I", payload, pos)
+    pos += 4
+    starts = struct.unpack_from(f"<{n}f", payload, pos)
+    pos += 4 * n
+    ends = struct.unpack_from(f"<{n}f", payload, pos)
+    pos += 4 * n
+    confidences = struct.unpack_from(f"<{n}f", payload, pos)
+    pos += 4 * n
+    offsets = struct.unpack_from(f"<{n + 1}I", payload, pos)
+    pos += 4 * (n + 1)
+    blob = payload[pos:]
+
+    segments: List[Dict] = []
+    for i in range(n):
+        confidence = confidences[i]
+        segments.append({
+            "id": i,
+            "start": round(starts[i], 3),
+            "end": round(ends[i], 3),
+            "text": blob[offsets[i]:offsets[i + 1]].decode("utf-8"),
+            "confidence": None if math.isnan(confidence) else round(confidence, 4)
+        })
+
+    data = dict(header)
+    data["text"] = header.get("text") or "".join(s["text"] for s in segments)
+    data["segments"] = segments
+    return data
+
+
+def chunk_key(job_id: str, chunk_id: int) -> str:
+    """S3 key of a chunk result: transcriptions/{job_id}/chunks/chunk_001.tcb"""
+    return f"transcriptions/{job_id}/chunks/chunk_{chunk_id:03d}{SUFFIX}"
@@ -0,0 +1,227 @@
+"""
+Per-user token buckets for admission control, kept in DynamoDB
+
+Tokens are seconds of media. Each tier has a capacity (burst) and a refill
+rate; a submission takes its estimated duration up front and the
+post-processor settles the difference once the real duration is known.
+Writes are conditional on the bucket's version, so concurrent url_processor
+containers never spend the same tokens twice. Each container remembers the
+last state it wrote or read: admissions write against it without reading
+first, and for a few seconds obvious rejections are answered locally.
+"""
+import json
+import math
+import os
+import time
+from decimal import Decimal
+
+from botocore.exceptions import ClientError
+
+import aws_clients
+
+RATE_LIMITS_TABLE = os.getenv("RATE_LIMITS_TABLE")
+bucket_table = aws_clients.table(RATE_LIMITS_TABLE) if RATE_LIMITS_TABLE else None
+
+# tier -> capacity and refill, in minutes of media
+DEFAULT_LIMITS = {
+    "premium": {"capacityMinutes": 3000, "refillMinutesPerHour": 1500},
+    "standard": {"capacityMinutes": 600, "refillMinutesPerHour": 300},
+    "batch": {"capacityMinutes": 1200, "refillMinutesPerHour": 240},
+}
+LIMITS = {**DEFAULT_LIMITS, **json.loads(os.getenv("RATE_LIMITS") or "{}")}
+DEFAULT_TIER = os.getenv("DEFAULT_TIER", "standard")
+
+MAX_WRITE_ATTEMPTS = 3
+# Local state younger than this answers rejections without a read
+LOCAL_STATE_SECONDS = 5
+# Rejection counters are written at most this often per user
+REJECTION_FLUSH_SECONDS = 5
+
+# userId -> {"tokens", "updatedAt", "version", "seenAt"}
+local_state = {}
+# userId -> [unwritten rejections, last flush ms]
+pending_rejections = {}
+
+
+def enabled() -> bool:
+    return bucket_table is not None
+
+
+def limits(tier: str):
+    """(capacity, refill per second) in seconds of media"""
+    config = LIMITS.get(tier) or LIMITS[DEFAULT_TIER]
+    return config["capacityMinutes"] * 60, config["refillMinutesPerHour"] / 60
+
+
+def available(state: dict, capacity: float, rate: float, now_ms: int) -> float:
+    """Tokens in the bucket at now_ms: a user never seen before starts full"""
+    if state.get("updatedAt") is None:
+        return capacity
+    elapsed = max(0, now_ms - state["updatedAt"]) / 1000
+    return min(capacity, state["tokens"] + elapsed * rate)
+
+
+def take(user_id: str, tier: str, cost: float) -> dict:
+    """
+    Spend `cost` seconds of media from the user's bucket. Returns
+    {"allowed", "limit", "remaining"} plus "retryAfter" (seconds) when not
+    allowed. A cost above the capacity is capped, so a long file still
+    gets in on a full bucket.
+    """
+    capacity, rate = limits(tier)
+    cost = min(cost, capacity)
+    now = now_ms()
+
+    state = local_state.get(user_id)
+    if state and now - state["seenAt"] < LOCAL_STATE_SECONDS * 1000:
+        tokens = available(state, capacity, rate, now)
+        if tokens < cost:
+            return reject(user_id, tokens, cost, capacity, rate, now)
+    else:
+        state = None
+
+    for _ in range(MAX_WRITE_ATTEMPTS):
+        if state is None:
+            state = read(user_id, now)
+        tokens = available(state, capacity, rate, now)
+        if tokens < cost:
+            return reject(user_id, tokens, cost, capacity, rate, now)
+
+        remaining = tokens - cost
+        try:
+            write(user_id, tier, state, remaining, cost, now)
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                raise
+            # Another container spent from this bucket: start from its state
+            state = None
+            now = now_ms()
+            continue
+
+        local_state[user_id] = {
+            "tokens": remaining,
+            "updatedAt": now,
+            "version": (state.get("version") or 0) + 1,
+            "seenAt": now
+        }
+        return {"allowed": True, "limit": capacity, "remaining": remaining}
+
+    # Heavily contended bucket: ask the caller to come back shortly
+    return {"allowed": False, "limit": capacity, "remaining": 0, "retryAfter": 1}
+
+
+def settle(user_id: str, delta: float):
+    """
+    Return (positive) or charge (negative) the difference between the
+    estimated and the real duration. Bumps the version so an admission
+    computed from the old state retries instead of overwriting it.
+    """
+    try:
+        bucket_table.update_item(
+            Key={"userId": user_id},
+            UpdateExpression="ADD tokens :delta, version :one, consumedSeconds :charged",
+            ConditionExpression="attribute_exists(version)",
+            ExpressionAttributeValues={
+                ":delta": to_decimal(delta),
+                ":charged": to_decimal(-delta),
+                ":one": 1
+            }
+        )
+    except ClientError as e:
+        if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+            raise
+    local_state.pop(user_id, None)
+
+
+def usage(user_id: str) -> dict:
+    """Current bucket and consumption counters of a user"""
+    item = bucket_table.get_item(Key={"userId": user_id}, ConsistentRead=True).get("Item") or {}
+    tier = item.get("tier", DEFAULT_TIER)
+    capacity, rate = limits(tier)
+    state = {
+        "tokens": float(item.get("tokens", 0)),
+        "updatedAt": int(item["updatedAt"]) if "updatedAt" in item else None
+    }
+    return {
+        "userId": user_id,
+        "tier": tier,
+        "limitMinutes": capacity / 60,
+        "refillMinutesPerHour": rate * 60,
+        "availableMinutes": round(available(state, capacity, rate, now_ms()) / 60, 1),
+        "admitted": int(item.get("admitted", 0)),
+        "rejected": int(item.get("rejected", 0)),
+        "consumedMinutes": round(float(item.get("consumedSeconds", 0)) / 60, 1),
+        "lastAdmittedAt": int(item["lastAdmittedAt"]) // 1000 if "lastAdmittedAt" in item else None,
+        "lastRejectedAt": int(item["lastRejectedAt"]) // 1000 if "lastRejectedAt" in item else None
+    }
+
+
+def read(user_id: str, now: int) -> dict:
+    item = bucket_table.get_item(Key={"userId": user_id}, ConsistentRead=True).get("Item")
+    if not item:
+        return {"tokens": 0, "updatedAt": None, "version": None, "seenAt": now}
+    state = {
+        "tokens": float(item.get("tokens", 0)),
+        "updatedAt": int(item["updatedAt"]) if "updatedAt" in item else None,
+        "version": int(item["version"]) if "version" in item else None,
+        "seenAt": now
+    }
+    local_state[user_id] = state
+    return state
+
+
+def write(user_id: str, tier: str, state: dict, remaining: float, cost: float, now: int):
+    if state.get("version") is None:
+        condition = "attribute_not_exists(version)"
+        values = {}
+    else:
+        condition = "version = :version"
+        values = {":version": state["version"]}
+
+    bucket_table.update_item(
+        Key={"userId": user_id},
+        UpdateExpression=(
+            "SET tokens = :tokens, updatedAt = :now, tier = :tier, lastAdmittedAt = :now "
+            "ADD version :one, admitted :one, consumedSeconds :cost"
+        ),
+        ConditionExpression=condition,
+        ExpressionAttributeValues={
+            ":tokens": to_decimal(remaining),
+            ":now": now,
+            ":tier": tier,
+            ":cost": to_decimal(cost),
+            ":one": 1,
+            **values
+        }
+    )
+
+
+def reject(user_id: str, tokens: float, cost: float, capacity: float, rate: float, now: int) -> dict:
+    pending = pending_rejections.setdefault(user_id, [0, 0])
+    pending[0] += 1
+    if now - pending[1] >= REJECTION_FLUSH_SECONDS * 1000:
+        try:
+            bucket_table.update_item(
+                Key={"userId": user_id},
+                UpdateExpression="SET lastRejectedAt = :now ADD rejected :count",
+                ExpressionAttributeValues={":now": now, ":count": pending[0]}
+            )
+            pending[0], pending[1] = 0, now
+        except Exception as e:
+            print(f"Could not record rejections for {user_id}: {e}")
+
+    return {
+        "allowed": False,
+        "limit": capacity,
+        "remaining": max(0, tokens),
+        "retryAfter": max(1, math.ceil((cost - tokens) / rate))
+    }
+
+
+def now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def to_decimal(value: float) -> Decimal:
+    # DynamoDB numbers: boto3 rejects floats
+    return Decimal(str(round(value, 3)))
@@ -0,0 +1,88 @@
+"""
+Inverted index over completed transcripts
+
+One posting list per (term, job): the start times of the segments where
+the term occurs, in centiseconds, delta + varint encoded and zlib
+compressed when that pays off. The post-processor writes them to the
+search table (hash key term, range key jobId), so a term's postings are
+sharded by job and a query reads one partition per term.
+"""
+import re
+import unicodedata
+import zlib
+from typing import Dict, Iterable, List
+
+# Postings longer than this (bytes) are worth compressing
+COMPRESS_MIN_BYTES = 64
+RAW, ZLIB = 0, 1
+
+MIN_TERM_LENGTH = 2
+MAX_TERM_LENGTH = 40
+
+# Too frequent to be worth indexing (English and Spanish podcasts)
+STOPWORDS = frozenset("""
+a an and are as at be but by for from has have he her his i if in is it its
+me my no not of on or our she so that the their them they this to was we
+were what when which who will with you your yeah um uh oh
+al como con de del el en es esta este ha la las le les lo los mas me mi no
+nos o para pero por que se si sin su sus te tu un una uno y ya yo
+""".split())
+
+_WORD = re.compile(r"\w+")
+
+
+def normalize(text: str) -> str:
+    """Lowercase without accents, so 'Canción' matches 'cancion'"""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def tokenize(text: str) -> List[str]:
+    return [
+        term for term in _WORD.findall(normalize(text))
+        if MIN_TERM_LENGTH <= len(term) <= MAX_TERM_LENGTH and term not in STOPWORDS
+    ]
+
+
+def build_postings(segments: Iterable[Dict]) -> Dict[str, List[int]]:
+    """term -> sorted segment start times (centiseconds) for one transcript"""
+    postings: Dict[str, set] = {}
+    for seg in segments:
+        start = int(round(float(seg.get("start") or 0) * 100))
+        for term in tokenize(seg.get("text") or ""):
+            postings.setdefault(term, set()).add(start)
+    return {term: sorted(starts) for term, starts in postings.items()}
+
+
+def encode_postings(starts: List[int]) -> bytes:
+    out = bytearray()
+    previous = 0
+    for value in starts:
+        delta = value - previous
+        previous = value
+        while delta >= 0x80:
+            out.append((delta & 0x7F) | 0x80)
+            delta >>= 7
+        out.append(delta)
+
+    if len(out) >= COMPRESS_MIN_BYTES:
+        packed = zlib.compress(bytes(out), 6)
+        if len(packed) < len(out):
+            return bytes([ZLIB]) + packed
+    return bytes([RAW]) + bytes(out)
+
+
+def decode_postings(data: bytes) -> List[int]:
+    data = bytes(data)
+    body = zlib.decompress(data[1:]) if data[0] == ZLIB else data[1:]
+    starts = []
+    value = shift = delta = 0
+    for byte in body:
+        delta |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        value += delta
+        starts.append(value)
+        delta = shift = 0
+    return starts
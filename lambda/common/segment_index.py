@@ -0,0 +1,82 @@
+"""
+Time index over a job's transcript segments, for time-range reads
+
+The post-processor writes transcriptions/{job_id}/segments.jsonl (one
+segment per line, in time order) and segments.index.json, which maps
+each BUCKET_SECONDS bucket to the byte range of the segments starting in
+it. Readers fetch the index, then only the bytes of the requested window
+with a ranged GET.
+"""
+import json
+from typing import Dict, List, Optional, Tuple
+
+INDEX_VERSION = 1
+BUCKET_SECONDS = 60
+SEGMENTS_NAME = "segments.jsonl"
+INDEX_NAME = "segments.index.json"
+
+
+def build(segments: List[Dict], bucket_seconds: int = BUCKET_SECONDS) -> Tuple[bytes, Dict]:
+    """segments.jsonl body and its index, segments sorted by start time"""
+    ordered = sorted(segments, key=lambda s: s.get("start") or 0)
+    lines = []
+    buckets = []  # [offset, length] per bucket
+    offset = 0
+    for seg in ordered:
+        start = float(seg.get("start") or 0)
+        line = json.dumps({
+            "id": seg.get("id"),
+            "start": round(start, 2),
+            "end": round(float(seg.get("end") or start), 2),
+            "text": seg.get("text", ""),
+            "confidence": seg.get("confidence")
+        }, separators=(",", ":"), ensure_ascii=False).encode("utf-8") + b"\n"
+
+        bucket = int(start // bucket_seconds)
+        while len(buckets) <= bucket:
+            buckets.append([offset, 0])
+        buckets[bucket][1] += len(line)
+        lines.append(line)
+        offset += len(line)
+
+    index = {
+        "version": INDEX_VERSION,
+        "bucketSeconds": bucket_seconds,
+        "size": offset,
+        "segments": len(ordered),
+        "duration": round(max((float(s.get("end") or 0) for s in ordered), default=0), 2),
+        "buckets": buckets
+    }
+    return b"".join(lines), index
+
+
+def byte_range(index: Dict, start: float, end: float) -> Optional[Tuple[int, int]]:
+    """
+    Inclusive (first, last) byte range holding every segment that overlaps
+    [start, end). The bucket before `start` is included for segments that
+    begin earlier and run into the window. None if nothing can overlap.
+    """
+    buckets = index["buckets"]
+    size = index["bucketSeconds"]
+    first = max(0, int(start // size) - 1)
+    last = min(len(buckets) - 1, int(end // size))
+    if first > last:
+        return None
+
+    begin = buckets[first][0]
+    stop = buckets[last][0] + buckets[last][1]
+    if stop <= begin:
+        return None
+    return begin, stop - 1
+
+
+def parse(body: bytes, start: float, end: float) -> List[Dict]:
+    """Segments of a ranged read that overlap [start, end)"""
+    segments = []
+    for line in body.splitlines():
+        if not line:
+            continue
+        seg = json.loads(line)
+        if seg["end"] > start and seg["start"] < end:
+            segments.append(seg)
+    return segments
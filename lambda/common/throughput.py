@@ -0,0 +1,126 @@
+"""
+Rolling pipeline throughput and job ETAs
+
+The post-processor records each completed job's stage times into hourly
+aggregates (one item per metric and hour, atomic ADDs, expiring after two
+days): seconds spent per second of media for ingest (fog node), for
+transcription (per whisper model and profile) and for the merge. Reading
+the last WINDOW_HOURS of a metric gives its current rate; url_processor
+combines the rates with the backlog to estimate a new job's ETA.
+"""
+import os
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+from boto3.dynamodb.conditions import Key
+
+import aws_clients
+
+THROUGHPUT_TABLE = os.getenv("THROUGHPUT_TABLE")
+throughput_table = aws_clients.table(THROUGHPUT_TABLE) if THROUGHPUT_TABLE else None
+
+WINDOW_HOURS = 24
+RETENTION_SECONDS = 2 * 24 * 3600
+# Rates are re-read at most this often per container
+RATES_CACHE_SECONDS = 60
+# Fewer media seconds than this in the window: not enough data yet
+MIN_SAMPLE_SECONDS = 600
+
+# Used until the window has data (seconds per media second)
+DEFAULT_RATES = {
+    "ingest": 0.05,
+    "merge": 0.002,
+    "rtf": 0.3,
+    "rtf#tiny": 0.05,
+    "rtf#base": 0.1,
+    "rtf#small": 0.3,
+    "rtf#medium": 0.8,
+    "rtf#large": 1.6,
+}
+
+# metric -> (rate, read at)
+rates_cache: Dict[str, Tuple[Optional[float], float]] = {}
+
+
+def enabled() -> bool:
+    return throughput_table is not None
+
+
+def transcription_metrics(model: str, profile: str) -> Iterable[str]:
+    """Transcription is recorded overall, per model and per model+profile"""
+    return ("rtf", f"rtf#{model}", f"rtf#{model}#{profile}")
+
+
+def record(samples: Dict[str, Tuple[float, float]]):
+    """
+    Add one job's observations: metric -> (seconds spent, media seconds).
+    Integers only (milliseconds), boto3 rejects floats.
+    """
+    hour = int(time.time()) // 3600
+    for metric, (seconds, media_seconds) in samples.items():
+        if media_seconds <= 0:
+            continue
+        throughput_table.update_item(
+            Key={"metric": metric, "hour": hour},
+            UpdateExpression="ADD spentMs :spent, mediaMs :media, jobs :one SET #ttl = :ttl",
+            ExpressionAttributeNames={"#ttl": "ttl"},
+            ExpressionAttributeValues={
+                ":spent": int(seconds * 1000),
+                ":media": int(media_seconds * 1000),
+                ":one": 1,
+                ":ttl": hour * 3600 + RETENTION_SECONDS
+            }
+        )
+
+
+def rate(metric: str) -> Optional[float]:
+    """Seconds per media second over the window, None without enough data"""
+    cached = rates_cache.get(metric)
+    if cached and time.time() - cached[1] < RATES_CACHE_SECONDS:
+        return cached[0]
+
+    since = int(time.time()) // 3600 - WINDOW_HOURS
+    response = throughput_table.query(
+        KeyConditionExpression=Key("metric").eq(metric) & Key("hour").gt(since)
+    )
+    spent = sum(int(item.get("spentMs", 0)) for item in response.get("Items", []))
+    media = sum(int(item.get("mediaMs", 0)) for item in response.get("Items", []))
+    value = spent / media if media >= MIN_SAMPLE_SECONDS * 1000 else None
+
+    rates_cache[metric] = (value, time.time())
+    return value
+
+
+def first_rate(*metrics: str) -> float:
+    """Observed rate of the most specific metric with data, else its default"""
+    if enabled():
+        for metric in metrics:
+            try:
+                value = rate(metric)
+            except Exception as e:
+                print(f"Error reading throughput for {metric}: {e}")
+                break
+            if value is not None:
+                return value
+    for metric in metrics:
+        if metric in DEFAULT_RATES:
+            return DEFAULT_RATES[metric]
+    return DEFAULT_RATES["rtf"]
+
+
+def estimate(media_seconds: float, model: str, backlog_seconds: float = 0,
+             workers: int = 1) -> Dict[str, int]:
+    """
+    ETA of a new job. Chunks are transcribed while the fog node is still
+    ingesting, so the slower of the two stages dominates; whisper tasks
+    first work through the media already queued ahead of the job.
+    """
+    ingest = media_seconds * first_rate("ingest")
+    transcribe = (backlog_seconds + media_seconds) * first_rate(f"rtf#{model}", "rtf") / max(1, workers)
+    merge = media_seconds * first_rate("merge")
+    return {
+        "etaSeconds": int(max(ingest, transcribe) + merge) + 1,
+        "ingestSeconds": int(ingest),
+        "transcribeSeconds": int(transcribe),
+        "mergeSeconds": int(merge) + 1
+    }
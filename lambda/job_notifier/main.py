@@ -0,0 +1,192 @@
+"""
+Job Notifier Lambda - Estado de jobs por WebSocket
+Registra conexiones (rutas $connect/$disconnect/$default del API WebSocket) y
+reenvia los cambios del stream de la tabla de jobs a quien los esta mirando
+"""
+import json
+import os
+import time
+from decimal import Decimal
+
+from boto3.dynamodb.conditions import Key
+from boto3.dynamodb.types import TypeDeserializer
+
+import aws_clients
+
+# Built on first use (see aws_clients)
+connections_table = aws_clients.table(os.getenv("CONNECTIONS_TABLE", "connections"))
+jobs_table = aws_clients.table(os.getenv("JOBS_TABLE", "jobs"))
+
+# API Gateway closes WebSocket connections after 2 hours
+CONNECTION_TTL_SECONDS = 2 * 3600
+# At most one push per connection per interval; terminal states always go out
+MIN_PUSH_INTERVAL_SECONDS = float(os.getenv("MIN_PUSH_INTERVAL_SECONDS", "2"))
+TERMINAL_STATUSES = {"completed", "failed"}
+
+# Job fields pushed to the browser (download URLs still come from GET /jobs/{id})
+PUSHED_FIELDS = ("jobId", "status", "progress", "message", "totalChunks",
+                 "ingestProgress", "etaSeconds", "estimatedCompletionAt",
+                 "transcriptionKey", "updatedAt")
+
+deserializer = TypeDeserializer()
+# Last push per connection. Module level: a shard's records always reach
+# the same warm container.
+last_push = {}
+
+
+def handler(event, context):
+    """
+    WebSocket route events carry requestContext.routeKey; everything else
+    is a batch from the jobs table stream
+    """
+    route = event.get("requestContext", {}).get("routeKey")
+    if route:
+        return handle_route(route, event)
+    return fan_out(event.get("Records", []))
+
+
+# =========================
+# CONNECTION REGISTRY
+# =========================
+
+def handle_route(route: str, event: dict) -> dict:
+    request = event["requestContext"]
+    connection_id = request["connectionId"]
+
+    if route == "$connect":
+        job_id = (event.get("queryStringParameters") or {}).get("jobId")
+        register(connection_id, f"https://{request['domainName']}/{request['stage']}", job_id)
+        return {"statusCode": 200}
+
+    if route == "$disconnect":
+        connections_table.delete_item(Key={"connectionId": connection_id})
+        last_push.pop(connection_id, None)
+        return {"statusCode": 200}
+
+    # $default: {"action": "subscribe", "jobId": ...} or {"action": "ping"}
+    try:
+        body = json.loads(event.get("body") or "{}")
+    except ValueError:
+        return {"statusCode": 400, "body": "Invalid message"}
+
+    if body.get("action") == "subscribe" and body.get("jobId"):
+        endpoint = f"https://{request['domainName']}/{request['stage']}"
+        register(connection_id, endpoint, body["jobId"])
+        # Current state right away; later changes come from the stream
+        job = jobs_table.get_item(Key={"jobId": body["jobId"]}).get("Item")
+        if job:
+            push({"connectionId": connection_id, "endpoint": endpoint}, snapshot(job))
+    return {"statusCode": 200}
+
+
+def register(connection_id: str, endpoint: str, job_id: str = None):
+    now = int(time.time())
+    item = {
+        "connectionId": connection_id,
+        "endpoint": endpoint,
+        "connectedAt": now,
+        "ttl": now + CONNECTION_TTL_SECONDS
+    }
+    if job_id:
+        # JobIndex is sparse: only subscribed connections are indexed
+        item["jobId"] = job_id
+    connections_table.put_item(Item=item)
+    print(f"Connection {connection_id} watching {job_id}")
+
+
+# =========================
+# STREAM FAN-OUT
+# =========================
+
+def fan_out(records: list) -> dict:
+    """
+    Coalesce the batch to the newest image per job, then push it to the
+    job's watchers. Reads scale with changed jobs, not with open tabs.
+    Connections inside their push interval get the snapshot once the
+    interval has passed (trailing push): otherwise the last change before
+    a quiet period would never reach them.
+    """
+    latest = {}
+    for record in records:
+        image = record.get("dynamodb", {}).get("NewImage")
+        if image:
+            job = {k: deserializer.deserialize(v) for k, v in image.items()}
+            latest[job["jobId"]] = job
+
+    sent = 0
+    # connectionId -> (connection, newest snapshot) held back by the interval
+    deferred = {}
+    for job_id, job in latest.items():
+        payload = snapshot(job)
+        terminal = job.get("status") in TERMINAL_STATUSES
+        for connection in watchers(job_id):
+            if not terminal and not due(connection["connectionId"]):
+                deferred[connection["connectionId"]] = (connection, payload)
+                continue
+            if push(connection, payload):
+                sent += 1
+
+    if deferred:
+        # At most one interval: the stream's next batch waits for this one
+        time.sleep(max(0, max(wait_time(c) for c in deferred)))
+        for connection, payload in deferred.values():
+            if push(connection, payload):
+                sent += 1
+
+    print(f"{len(records)} changes, {len(latest)} jobs: {sent} pushed, {len(deferred)} deferred")
+    return {"jobs": len(latest), "pushed": sent, "deferred": len(deferred)}
+
+
+def watchers(job_id: str) -> list:
+    items = []
+    kwargs = {
+        "IndexName": "JobIndex",
+        "KeyConditionExpression": Key("jobId").eq(job_id)
+    }
+    while True:
+        response = connections_table.query(**kwargs)
+        items.extend(response.get("Items", []))
+        if "LastEvaluatedKey" not in response:
+            return items
+        kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def due(connection_id: str) -> bool:
+    return wait_time(connection_id) <= 0
+
+
+def wait_time(connection_id: str) -> float:
+    """Seconds until the connection may be pushed to again"""
+    return last_push.get(connection_id, 0) + MIN_PUSH_INTERVAL_SECONDS - time.time()
+
+
+def snapshot(job: dict) -> dict:
+    return {"type": "job", **{k: job[k] for k in PUSHED_FIELDS if k in job}}
+
+
+def push(connection: dict, payload: dict) -> bool:
+    """Send to one connection; forget it if the browser is gone"""
+    connection_id = connection["connectionId"]
+    endpoint = connection["endpoint"]
+    # One management API client per callback endpoint
+    client = aws_clients.get_client("apigatewaymanagementapi", endpoint_url=endpoint)
+
+    try:
+        client.post_to_connection(
+            ConnectionId=connection_id,
+            Data=json.dumps(payload, default=decimal_default).encode("utf-8")
+        )
+        last_push[connection_id] = time.time()
+        return True
+    except client.exceptions.GoneException:
+        connections_table.delete_item(Key={"connectionId": connection_id})
+        last_push.pop(connection_id, None)
+    except Exception as e:
+        print(f"Error pushing to {connection_id}: {e}")
+    return False
+
+
+def decimal_default(value):
+    if isinstance(value, Decimal):
+        return int(value) if value == int(value) else float(value)
+    return str(value)
@@ -1,11 +1,21 @@
 import json
+import math
 import os
-import boto3
+import time
 from datetime import datetime
-from typing import List
+from typing import List, Tuple
+from botocore.exceptions import ClientError
 
-s3 = boto3.client("s3")
-dynamodb = boto3.resource("dynamodb")
+import aws_clients
+import chunk_format
+import rate_limit
+import search_index
+import segment_index
+import throughput
+
+# Built on first use (see aws_clients)
+s3 = aws_clients.client("s3")
+dynamodb = aws_clients.resource("dynamodb")
 
 # =========================
 # ENV VARS
@@ -26,6 +36,9 @@ OUTPUT_PREFIX = os.environ.get(
     "OUTPUT_PREFIX", "transcriptions"
 )
 
+# Inverted index for GET /search (optional)
+SEARCH_TABLE = os.environ.get("SEARCH_TABLE")
+
 
 # =========================
 # UTILS
@@ -38,41 +51,49 @@ def get_job_metadata(job_id: str) -> dict:
     return response.get("Item", {})
 
 def list_chunk_files(bucket: str, prefix: str) -> List[str]:
-    """List all JSON chunk files in S3"""
+    """List all chunk result files (.tcb) in S3"""
     paginator = s3.get_paginator("list_objects_v2")
     pages = paginator.paginate(Bucket=bucket, Prefix=prefix)
 
     keys = []
     for page in pages:
         for obj in page.get("Contents", []):
-            if obj["Key"].endswith(".json"):
+            if obj["Key"].endswith(chunk_format.SUFFIX):
                 keys.append(obj["Key"])
     
     return sorted(keys)
 
 
-def read_chunk(bucket: str, key: str) -> str:
+def read_chunk(bucket: str, key: str) -> dict:
     obj = s3.get_object(Bucket=bucket, Key=key)
-    data = json.loads(obj["Body"].read())
-    return data.get("text", "")
+    return chunk_format.decode_chunk(obj["Body"].read())
 
 
-def merge_chunks(bucket: str, chunk_keys: List[str]) -> str:
+def merge_chunks(bucket: str, chunk_keys: List[str]) -> Tuple[str, List[dict], List[dict]]:
     texts = []
-    # Ensure numerical sorting if chunk names like chunk_001.json
+    segments = []
+    telemetry = []
+    # Ensure numerical sorting if chunk names like chunk_001.tcb
     # They should already be sorted by S3 string sort, but being explicit is safer if needed.
-    # For now, string sort of "chunk_000.json" works perfectly.
+    # For now, string sort of "chunk_000.tcb" works perfectly.
     
     print(f"Merging {len(chunk_keys)} chunks...")
     for key in chunk_keys:
         try:
-            text = read_chunk(bucket, key)
+            chunk = read_chunk(bucket, key)
+            text = chunk.get("text", "")
             if text:
                 texts.append(text.strip())
+            segments.extend(chunk.get("segments", []))
+            if chunk.get("telemetry"):
+                telemetry.append(chunk["telemetry"])
         except Exception as e:
             print(f"Error reading chunk {key}: {e}")
+
+    for idx, seg in enumerate(segments):
+        seg["id"] = idx
             
-    return " ".join(texts)
+    return " ".join(texts), segments, telemetry
 
 def upload_text(bucket: str, key: str, content: str):
     s3.put_object(
@@ -90,24 +111,124 @@ def upload_json(bucket: str, key: str, payload: dict):
         ContentType="application/json"
     )
 
+def index_transcript(job: dict, segments: List[dict]):
+    """
+    Posting lists for every term of the transcript (one search table item
+    per term and job), plus the job's transcriptions table record
+    """
+    job_id = job["jobId"]
+    postings = search_index.build_postings(segments)
+    expires = job.get("ttl")
+
+    with dynamodb.Table(SEARCH_TABLE).batch_writer() as writer:
+        for term, starts in postings.items():
+            item = {
+                "term": term,
+                "jobId": job_id,
+                "postings": search_index.encode_postings(starts),
+                "hits": len(starts)
+            }
+            if expires:
+                item["ttl"] = expires
+            writer.put_item(Item=item)
+
+    record = {
+        "transcriptionId": job_id,
+        "jobId": job_id,
+        "url": job.get("url"),
+        "segments": len(segments),
+        "terms": len(postings),
+        "indexedAt": int(datetime.utcnow().timestamp())
+    }
+    if expires:
+        record["ttl"] = expires
+    dynamodb.Table(TRANSCRIPTIONS_TABLE).put_item(Item=record)
+    print(f"Indexed {len(postings)} terms for search")
+
+def settle_admission(job: dict, duration: float):
+    """
+    Charge or refund the difference between the duration the submission
+    paid for and the real one. Marking the job first keeps a repeated
+    completion event from settling twice.
+    """
+    table = dynamodb.Table(os.environ["JOBS_TABLE"])
+    try:
+        table.update_item(
+            Key={"jobId": job["jobId"]},
+            UpdateExpression="SET admissionSettledAt = :now",
+            ConditionExpression="attribute_not_exists(admissionSettledAt)",
+            ExpressionAttributeValues={":now": int(datetime.utcnow().timestamp())}
+        )
+    except ClientError as e:
+        if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+            return
+        raise
+
+    delta = int(job["admissionSeconds"]) - math.ceil(duration)
+    rate_limit.settle(job.get("userId", "anonymous"), delta)
+    print(f"Settled admission: {delta:+d}s of media for {job.get('userId')}")
+
+def record_throughput(job: dict, duration: float, telemetry: List[dict], merge_seconds: float):
+    """
+    Stage times of this job into the rolling aggregates behind the ETAs:
+    ingest (reported by the fog node), transcription per model and
+    profile (chunk telemetry) and this merge. Marked on the job first, like
+    settle_admission: a duplicate completion event must not count twice.
+    """
+    table = dynamodb.Table(os.environ["JOBS_TABLE"])
+    try:
+        table.update_item(
+            Key={"jobId": job["jobId"]},
+            UpdateExpression="SET throughputRecordedAt = :now",
+            ConditionExpression="attribute_not_exists(throughputRecordedAt)",
+            ExpressionAttributeValues={":now": int(datetime.utcnow().timestamp())}
+        )
+    except ClientError as e:
+        if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+            return
+        raise
+
+    samples = {"merge": (merge_seconds, duration)}
+    if job.get("ingestSeconds") is not None and job.get("mediaSeconds"):
+        samples["ingest"] = (float(job["ingestSeconds"]), float(job["mediaSeconds"]))
+
+    by_profile = {}
+    for t in telemetry:
+        if t.get("processing_seconds") is None or not t.get("audio_seconds"):
+            continue
+        spent, audio = by_profile.get((t.get("model"), t.get("profile")), (0.0, 0.0))
+        by_profile[(t.get("model"), t.get("profile"))] = (
+            spent + t["processing_seconds"], audio + t["audio_seconds"])
+    for (model, profile), (spent, audio) in by_profile.items():
+        for metric in throughput.transcription_metrics(model, profile):
+            previous = samples.get(metric, (0.0, 0.0))
+            samples[metric] = (previous[0] + spent, previous[1] + audio)
+
+    throughput.record(samples)
+
 def update_job_status(job_id: str, status: str, output_key: str):
     table = dynamodb.Table(os.environ["JOBS_TABLE"])
-    timestamp = datetime.utcnow().isoformat()
+    timestamp = int(datetime.utcnow().timestamp())
     
     table.update_item(
         Key={"jobId": job_id},
-        UpdateExpression="SET #s = :status, updatedAt = :t, transcriptionKey = :k",
+        UpdateExpression=(
+            "SET #s = :status, updatedAt = :t, transcriptionKey = :k,"
+            " progress = :done, etaSeconds = :zero"
+        ),
         ExpressionAttributeNames={"#s": "status"},
         ExpressionAttributeValues={
             ":status": status,
             ":t": timestamp,
-            ":k": output_key
+            ":k": output_key,
+            ":done": 100,
+            ":zero": 0
         }
     )
 
 def extract_job_id_from_s3_event(event) -> str:
     try:
-        # Key format: transcriptions/{job_id}/chunks/chunk_XXX.json
+        # Key format: transcriptions/{job_id}/chunks/chunk_XXX.tcb
         key = event["Records"][0]["s3"]["object"]["key"]
         parts = key.split("/")
         if len(parts) > 1:
@@ -162,7 +283,8 @@ def handler(event, context):
     
     # 5. Perform Merge
     print("All chunks present. Starting merge...")
-    full_text = merge_chunks(TRANSCRIPTIONS_BUCKET, found_chunks)
+    merge_started = time.time()
+    full_text, segments, telemetry = merge_chunks(TRANSCRIPTIONS_BUCKET, found_chunks)
     
     # 6. Save Outputs
     base_key = f"transcriptions/{job_id}"
@@ -170,16 +292,48 @@ def handler(event, context):
     # Text File
     upload_text(TRANSCRIPTIONS_BUCKET, f"{base_key}/transcription.txt", full_text)
     
-    # JSON Metadata
+    # JSON export (rendered only here, chunk results stay binary)
     upload_json(TRANSCRIPTIONS_BUCKET, f"{base_key}/transcription.json", {
         "jobId": job_id,
         "text": full_text,
+        "segments": segments,
         "chunks": len(found_chunks),
         "completedAt": datetime.utcnow().isoformat()
     })
     
+    # Time index for GET /jobs/{id}/segments (ranged reads by time window)
+    segments_body, index = segment_index.build(segments)
+    s3.put_object(
+        Bucket=TRANSCRIPTIONS_BUCKET,
+        Key=f"{base_key}/{segment_index.SEGMENTS_NAME}",
+        Body=segments_body,
+        ContentType="application/x-ndjson"
+    )
+    upload_json(TRANSCRIPTIONS_BUCKET, f"{base_key}/{segment_index.INDEX_NAME}", index)
+
+    # Search is best effort: an indexing failure must not fail the job
+    if SEARCH_TABLE:
+        try:
+            index_transcript(job_data, segments)
+        except Exception as e:
+            print(f"Error indexing transcript for search: {e}")
+
+    merge_seconds = time.time() - merge_started
+
     # 7. Update DynamoDB
     update_job_status(job_id, "completed", f"{base_key}/transcription.json")
+
+    if throughput.enabled():
+        try:
+            record_throughput(job_data, index["duration"], telemetry, merge_seconds)
+        except Exception as e:
+            print(f"Error recording throughput: {e}")
+
+    if rate_limit.enabled() and "admissionSeconds" in job_data:
+        try:
+            settle_admission(job_data, index["duration"])
+        except Exception as e:
+            print(f"Error settling admission cost: {e}")
     
     print("Job completed successfully!")
     return {"statusCode": 200, "body": "Job completed"}
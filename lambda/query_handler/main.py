@@ -1,60 +1,613 @@
+import base64
+import bisect
+import hashlib
 import json
+import math
 import os
-import boto3
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
 
-dynamodb = boto3.resource("dynamodb")
-jobs_table = dynamodb.Table(os.getenv("JOBS_TABLE", "jobs"))
+from boto3.dynamodb.conditions import Attr, Key
+from botocore.exceptions import ClientError
+
+import aws_clients
+import chunk_format
+import rate_limit
+import search_index
+import segment_index
+
+# Built on first use (see aws_clients): status polls never build the S3 client
+dynamodb = aws_clients.resource("dynamodb")
+s3_client = aws_clients.client("s3")
+jobs_table = aws_clients.table(os.getenv("JOBS_TABLE", "jobs"))
+BATCHES_TABLE = os.getenv("BATCHES_TABLE")
+batches_table = aws_clients.table(BATCHES_TABLE) if BATCHES_TABLE else None
+TRANSCRIPTIONS_BUCKET = os.environ.get("TRANSCRIPTIONS_BUCKET")
+
+# Long polling (?wait=N): API Gateway gives up after 29 s
+MAX_WAIT_SECONDS = int(os.getenv("MAX_WAIT_SECONDS", "20"))
+WAIT_POLL_SECONDS = (0.5, 1, 2)
+
+# Presigned download URLs are reused until shortly before they expire
+PRESIGN_EXPIRES_SECONDS = 3600
+PRESIGN_REFRESH_MARGIN = 300
+presigned_cache = {}
+
+# POST /jobs/status: ids per request, keys per BatchGetItem call (API max)
+MAX_STATUS_JOB_IDS = int(os.getenv("MAX_STATUS_JOB_IDS", "500"))
+BATCH_GET_SIZE = 100
+BATCH_GET_WORKERS = 8
+BATCH_GET_MAX_RETRIES = 6
+
+# GET /jobs listing page size
+DEFAULT_LIST_LIMIT = 50
+MAX_LIST_LIMIT = 200
+LISTED_FIELDS = "jobId, #s, progress, createdAt, updatedAt, userId"
+
+# GET /jobs/{jobId}/segments: widest window per request, cached indexes
+MAX_SEGMENT_WINDOW_SECONDS = int(os.getenv("MAX_SEGMENT_WINDOW_SECONDS", "1800"))
+SEGMENT_INDEX_CACHE_SIZE = 256
+segment_index_cache = {}
+# Jobs still in progress: their window is read from the chunk results
+CHUNK_SECONDS = 30
+CHUNK_READ_WORKERS = 8
+
+# GET /search
+SEARCH_TABLE = os.getenv("SEARCH_TABLE")
+search_table = aws_clients.table(SEARCH_TABLE) if SEARCH_TABLE else None
+MAX_QUERY_TERMS = 8
+MAX_JOBS_PER_TERM = 5000
+MAX_HITS_PER_JOB = 20
+# Terms of a multi-word query must occur within this many centiseconds
+HIT_WINDOW_CS = 1500
+
+CORS_HEADERS = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Expose-Headers": "ETag"
+}
 
 def handler(event, context):
+    if event.get("resource") == "/jobs/status":
+        return get_job_statuses(event)
+
+    if event.get("resource") == "/jobs/{jobId}/segments":
+        return get_segments(event["pathParameters"]["jobId"], event.get("queryStringParameters") or {})
+
+    if event.get("resource") == "/search":
+        return search(event.get("queryStringParameters") or {})
+
+    if event.get("resource") == "/users/{userId}/usage":
+        return get_usage(event["pathParameters"]["userId"])
+
+    if event.get("resource") == "/jobs" and event.get("httpMethod") == "GET":
+        return list_jobs(event.get("queryStringParameters") or {})
+
+    if "batchId" in (event.get("pathParameters") or {}):
+        return get_batch(event["pathParameters"]["batchId"])
+
     try:
         job_id = event["pathParameters"]["jobId"]
+        headers = {k.lower(): v for k, v in (event.get("headers") or {}).items()}
+        client_etag = headers.get("if-none-match")
+        params = event.get("queryStringParameters") or {}
+        try:
+            wait = max(0, min(int(params.get("wait", 0)), MAX_WAIT_SECONDS))
+        except ValueError:
+            wait = 0
 
-        response = jobs_table.get_item(Key={"jobId": job_id})
-
-        if "Item" not in response:
+        item = jobs_table.get_item(Key={"jobId": job_id}).get("Item")
+        if not item:
             return {
                 "statusCode": 404,
                 "body": json.dumps({"error": "Job not found"})
             }
 
-        item = response["Item"]
+        etag = item_etag(item)
+        if wait:
+            # Block until the job differs from what the client (or this
+            # request's first read) has seen, or the wait runs out
+            seen = client_etag or etag
+            deadline = time.time() + wait
+            attempt = 0
+            while etag == seen and item.get("status") not in ("completed", "failed"):
+                pause = WAIT_POLL_SECONDS[min(attempt, len(WAIT_POLL_SECONDS) - 1)]
+                if time.time() + pause > deadline:
+                    break
+                time.sleep(pause)
+                attempt += 1
+                item = jobs_table.get_item(Key={"jobId": job_id}).get("Item") or item
+                etag = item_etag(item)
+
+        if client_etag == etag:
+            return {
+                "statusCode": 304,
+                "headers": dict(CORS_HEADERS, ETag=etag),
+                "body": ""
+            }
 
-        # If job is completed, generate presigned URLs for the artifacts
-        if item.get("status") == "completed":
+        # If job is completed, add presigned URLs for the artifacts
+        # (transcriptions/{job_id}/transcription.json|txt)
+        if item.get("status") == "completed" and TRANSCRIPTIONS_BUCKET:
             try:
-                s3_client = boto3.client('s3')
-                bucket = os.environ.get("TRANSCRIPTIONS_BUCKET")
-                
-                # We assume the keys based on the standard naming convention
-                # transcriptions/{job_id}/transcription.json
-                # transcriptions/{job_id}/transcription.txt
-                
-                if bucket:
-                    # Generate Presigned URL for JSON
-                    json_key = f"transcriptions/{job_id}/transcription.json"
-                    item["downloadUrlJson"] = s3_client.generate_presigned_url(
-                        'get_object',
-                        Params={'Bucket': bucket, 'Key': json_key},
-                        ExpiresIn=3600
-                    )
-                    
-                    # Generate Presigned URL for TXT
-                    txt_key = f"transcriptions/{job_id}/transcription.txt"
-                    item["downloadUrlTxt"] = s3_client.generate_presigned_url(
-                        'get_object',
-                        Params={'Bucket': bucket, 'Key': txt_key},
-                        ExpiresIn=3600
-                    )
+                item["downloadUrlJson"] = presigned_url(f"transcriptions/{job_id}/transcription.json")
+                item["downloadUrlTxt"] = presigned_url(f"transcriptions/{job_id}/transcription.txt")
             except Exception as e:
                 print(f"Error generating presigned URLs: {e}")
 
+        return {
+            "statusCode": 200,
+            "headers": dict(CORS_HEADERS, **{"Content-Type": "application/json", "ETag": etag}),
+            "body": json.dumps(item, default=str)
+        }
+
+    except Exception as e:
+        return {
+            "statusCode": 500,
+            "body": json.dumps({"error": str(e)})
+        }
+
+def item_etag(item: dict) -> str:
+    """
+    Weak ETag over the stored job (updatedAt, status, progress and the
+    counters some writers bump without touching updatedAt)
+    """
+    digest = hashlib.sha1(json.dumps(item, sort_keys=True, default=str).encode("utf-8"))
+    return f'W/"{digest.hexdigest()[:16]}"'
+
+def presigned_url(key: str) -> str:
+    """Signing is local but not free; warm containers reuse a URL while it is still valid"""
+    now = time.time()
+    cached = presigned_cache.get(key)
+    if cached and cached[1] - PRESIGN_REFRESH_MARGIN > now:
+        return cached[0]
+
+    url = s3_client.generate_presigned_url(
+        'get_object',
+        Params={'Bucket': TRANSCRIPTIONS_BUCKET, 'Key': key},
+        ExpiresIn=PRESIGN_EXPIRES_SECONDS
+    )
+    if len(presigned_cache) > 1000:
+        presigned_cache.clear()
+    presigned_cache[key] = (url, now + PRESIGN_EXPIRES_SECONDS)
+    return url
+
+def get_job_statuses(event):
+    """
+    POST /jobs/status {"jobIds": [...], "links": false} - compact status of
+    many jobs in one call, read with parallel BatchGetItem. Presigned links
+    are only added for completed jobs, and only when asked for.
+    """
+    try:
+        body = json.loads(event.get("body") or "{}")
+    except ValueError:
+        return {"statusCode": 400, "headers": CORS_HEADERS, "body": json.dumps({"error": "Invalid JSON"})}
+
+    job_ids = body.get("jobIds")
+    if not isinstance(job_ids, list) or not job_ids or not all(isinstance(j, str) and j for j in job_ids):
+        return {"statusCode": 400, "headers": CORS_HEADERS,
+                "body": json.dumps({"error": "jobIds must be a non-empty list of ids"})}
+    job_ids = list(dict.fromkeys(job_ids))
+    if len(job_ids) > MAX_STATUS_JOB_IDS:
+        return {"statusCode": 400, "headers": CORS_HEADERS,
+                "body": json.dumps({"error": f"At most {MAX_STATUS_JOB_IDS} jobIds per request"})}
+
+    try:
+        groups = [job_ids[i:i + BATCH_GET_SIZE] for i in range(0, len(job_ids), BATCH_GET_SIZE)]
+        with ThreadPoolExecutor(max_workers=min(BATCH_GET_WORKERS, len(groups))) as executor:
+            items = [item for group in executor.map(batch_get_jobs, groups) for item in group]
+
+        jobs = {}
+        for item in items:
+            job = {k: item[k] for k in ("status", "progress", "etaSeconds", "estimatedCompletionAt", "updatedAt") if k in item}
+            if body.get("links") and item.get("status") == "completed" and TRANSCRIPTIONS_BUCKET:
+                job["downloadUrlJson"] = presigned_url(f"transcriptions/{item['jobId']}/transcription.json")
+                job["downloadUrlTxt"] = presigned_url(f"transcriptions/{item['jobId']}/transcription.txt")
+            jobs[item["jobId"]] = job
+
+        return {
+            "statusCode": 200,
+            "headers": dict(CORS_HEADERS, **{"Content-Type": "application/json"}),
+            "body": json.dumps({
+                "jobs": jobs,
+                "missing": [j for j in job_ids if j not in jobs]
+            }, default=str)
+        }
+
+    except Exception as e:
+        return {
+            "statusCode": 500,
+            "body": json.dumps({"error": str(e)})
+        }
+
+def batch_get_jobs(job_ids: list) -> list:
+    """One BatchGetItem of up to 100 keys, retrying UnprocessedKeys with jittered backoff"""
+    request = {
+        jobs_table.name: {
+            "Keys": [{"jobId": job_id} for job_id in job_ids],
+            "ProjectionExpression": "jobId, #s, progress, etaSeconds, estimatedCompletionAt, updatedAt",
+            "ExpressionAttributeNames": {"#s": "status"}
+        }
+    }
+    items = []
+    for attempt in range(BATCH_GET_MAX_RETRIES + 1):
+        response = dynamodb.batch_get_item(RequestItems=request)
+        items.extend(response.get("Responses", {}).get(jobs_table.name, []))
+        request = response.get("UnprocessedKeys")
+        if not request:
+            return items
+        time.sleep(random.uniform(0, min(1.0, 0.05 * 2 ** attempt)))
+    raise Exception(f"{len(request[jobs_table.name]['Keys'])} keys still unprocessed after retries")
+
+def list_jobs(params: dict):
+    """
+    GET /jobs?status=|userId=[&from=&to=&updatedBefore=&order=&limit=&cursor=]
+    Always an index query, never a scan: UserIndex when userId is given
+    (status then becomes a filter), StatusIndex otherwise. from/to bound
+    createdAt (epoch seconds), updatedBefore finds stale jobs, e.g.
+    status=streaming&updatedBefore=<now-300>. Newest first by default;
+    pass the returned cursor to get the next page.
+    """
+    status = params.get("status")
+    user_id = params.get("userId")
+    if not status and not user_id:
+        return {"statusCode": 400, "headers": CORS_HEADERS,
+                "body": json.dumps({"error": "status or userId is required"})}
+
+    try:
+        limit = max(1, min(int(params.get("limit", DEFAULT_LIST_LIMIT)), MAX_LIST_LIMIT))
+        start = int(params["from"]) if params.get("from") else None
+        end = int(params["to"]) if params.get("to") else None
+        updated_before = int(params["updatedBefore"]) if params.get("updatedBefore") else None
+        cursor = decode_cursor(params["cursor"]) if params.get("cursor") else None
+    except (ValueError, TypeError):
+        return {"statusCode": 400, "headers": CORS_HEADERS,
+                "body": json.dumps({"error": "Invalid limit, from, to, updatedBefore or cursor"})}
+
+    try:
+        if user_id:
+            index, condition = "UserIndex", Key("userId").eq(user_id)
+        else:
+            index, condition = "StatusIndex", Key("status").eq(status)
+
+        if start is not None and end is not None:
+            condition = condition & Key("createdAt").between(start, end)
+        elif start is not None:
+            condition = condition & Key("createdAt").gte(start)
+        elif end is not None:
+            condition = condition & Key("createdAt").lte(end)
+
+        filters = []
+        if user_id and status:
+            filters.append(Attr("status").eq(status))
+        if updated_before is not None:
+            filters.append(Attr("updatedAt").lt(updated_before))
+
+        kwargs = {
+            "IndexName": index,
+            "KeyConditionExpression": condition,
+            "ProjectionExpression": LISTED_FIELDS,
+            "ExpressionAttributeNames": {"#s": "status"},
+            "ScanIndexForward": params.get("order") == "asc",
+            "Limit": limit
+        }
+        if filters:
+            expression = filters[0]
+            for f in filters[1:]:
+                expression = expression & f
+            kwargs["FilterExpression"] = expression
+        if cursor:
+            kwargs["ExclusiveStartKey"] = cursor
+
+        response = jobs_table.query(**kwargs)
+        last_key = response.get("LastEvaluatedKey")
+
+        return {
+            "statusCode": 200,
+            "headers": dict(CORS_HEADERS, **{"Content-Type": "application/json"}),
+            "body": json.dumps({
+                "jobs": response.get("Items", []),
+                # Filtered pages can come back short; keep going while a cursor is returned
+                "cursor": encode_cursor(last_key) if last_key else None
+            }, default=str)
+        }
+
+    except Exception as e:
+        return {
+            "statusCode": 500,
+            "body": json.dumps({"error": str(e)})
+        }
+
+def encode_cursor(key: dict) -> str:
+    """Opaque page token from a LastEvaluatedKey (index and table keys)"""
+    plain = {k: int(v) if hasattr(v, "as_integer_ratio") else v for k, v in key.items()}
+    return base64.urlsafe_b64encode(json.dumps(plain, sort_keys=True).encode("utf-8")).decode("ascii")
+
+def decode_cursor(cursor: str) -> dict:
+    key = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    if not isinstance(key, dict) or "jobId" not in key:
+        raise ValueError("Invalid cursor")
+    return key
+
+def get_segments(job_id: str, params: dict):
+    """
+    GET /jobs/{jobId}/segments?start=&end= (seconds) - transcript segments
+    overlapping the window, read from segments.jsonl with one ranged GET
+    located by the job's time index, so the cost follows the window length.
+    Until the post-processor has merged the job, the segments come from the
+    chunk results transcribed so far ("partial": true).
+    """
+    try:
+        start = max(0.0, float(params.get("start", 0)))
+        end = float(params["end"]) if params.get("end") else start + 300
+    except ValueError:
+        return {"statusCode": 400, "headers": CORS_HEADERS,
+                "body": json.dumps({"error": "start and end must be seconds"})}
+    if end <= start or end - start > MAX_SEGMENT_WINDOW_SECONDS:
+        return {"statusCode": 400, "headers": CORS_HEADERS,
+                "body": json.dumps({"error": f"end must be after start, window at most {MAX_SEGMENT_WINDOW_SECONDS}s"})}
+
+    try:
+        index = load_segment_index(job_id)
+        if index is None:
+            return get_partial_segments(job_id, start, end)
+
+        segments = []
+        span = segment_index.byte_range(index, start, end)
+        if span:
+            response = s3_client.get_object(
+                Bucket=TRANSCRIPTIONS_BUCKET,
+                Key=f"transcriptions/{job_id}/{segment_index.SEGMENTS_NAME}",
+                Range=f"bytes={span[0]}-{span[1]}"
+            )
+            segments = segment_index.parse(response["Body"].read(), start, end)
+
+        return {
+            "statusCode": 200,
+            "headers": dict(CORS_HEADERS, **{
+                "Content-Type": "application/json",
+                # Transcripts do not change once written
+                "Cache-Control": "max-age=3600"
+            }),
+            "body": json.dumps({
+                "jobId": job_id,
+                "start": start,
+                "end": end,
+                "duration": index.get("duration"),
+                "segments": segments
+            }, ensure_ascii=False)
+        }
+
+    except Exception as e:
+        return {
+            "statusCode": 500,
+            "body": json.dumps({"error": str(e)})
+        }
+
+def get_partial_segments(job_id: str, start: float, end: float):
+    """Window of an in-progress job, decoded from the chunks it covers"""
+    segments = read_chunk_segments(job_id, start, end)
+    if segments is None:
+        return {"statusCode": 404, "headers": CORS_HEADERS,
+                "body": json.dumps({"error": "No segments transcribed yet"})}
+
+    return {
+        "statusCode": 200,
+        "headers": dict(CORS_HEADERS, **{
+            "Content-Type": "application/json",
+            "Cache-Control": "no-cache"
+        }),
+        "body": json.dumps({
+            "jobId": job_id,
+            "start": start,
+            "end": end,
+            "partial": True,
+            "segments": segments
+        }, ensure_ascii=False)
+    }
+
+def read_chunk_segments(job_id: str, start: float, end: float):
+    """
+    Segments overlapping [start, end) from the job's .tcb chunk results
+    (already on the job's timeline), None when none of the chunks exist
+    """
+    if not TRANSCRIPTIONS_BUCKET:
+        return None
+
+    def read(chunk_id):
+        try:
+            response = s3_client.get_object(
+                Bucket=TRANSCRIPTIONS_BUCKET,
+                Key=chunk_format.chunk_key(job_id, chunk_id)
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("NoSuchKey", "404"):
+                return None
+            raise
+        return chunk_format.decode_chunk(response["Body"].read())
+
+    chunk_ids = range(int(start // CHUNK_SECONDS), int(math.ceil(end / CHUNK_SECONDS)))
+    with ThreadPoolExecutor(max_workers=CHUNK_READ_WORKERS) as executor:
+        chunks = [c for c in executor.map(read, chunk_ids) if c is not None]
+    if not chunks:
+        return None
+
+    return [
+        {k: seg[k] for k in ("start", "end", "text", "confidence")}
+        for chunk in chunks
+        for seg in chunk["segments"]
+        if seg["end"] > start and seg["start"] < end
+    ]
+
+def load_segment_index(job_id: str):
+    """The job's segments.index.json, None until the post-processor wrote it"""
+    index = segment_index_cache.get(job_id)
+    if index is not None:
+        return index
+    if not TRANSCRIPTIONS_BUCKET:
+        return None
+
+    try:
+        response = s3_client.get_object(
+            Bucket=TRANSCRIPTIONS_BUCKET,
+            Key=f"transcriptions/{job_id}/{segment_index.INDEX_NAME}"
+        )
+    except ClientError as e:
+        if e.response["Error"]["Code"] in ("NoSuchKey", "404"):
+            return None
+        raise
+
+    index = json.loads(response["Body"].read())
+    if len(segment_index_cache) >= SEGMENT_INDEX_CACHE_SIZE:
+        segment_index_cache.pop(next(iter(segment_index_cache)))
+    segment_index_cache[job_id] = index
+    return index
+
+def search(params: dict):
+    """
+    GET /search?q=&limit= - jobs whose transcripts contain every query term,
+    with the timestamps (seconds) where the terms occur together. One
+    partition query per term, then posting lists intersected in memory.
+    """
+    if not search_table:
+        return {"statusCode": 404, "headers": CORS_HEADERS, "body": json.dumps({"error": "Search not enabled"})}
+
+    terms = list(dict.fromkeys(search_index.tokenize(params.get("q") or "")))[:MAX_QUERY_TERMS]
+    if not terms:
+        return {"statusCode": 400, "headers": CORS_HEADERS,
+                "body": json.dumps({"error": "q must contain at least one searchable word"})}
+    try:
+        limit = max(1, min(int(params.get("limit", 20)), 100))
+    except ValueError:
+        limit = 20
+
+    try:
+        started = time.time()
+        with ThreadPoolExecutor(max_workers=len(terms)) as executor:
+            lists = list(executor.map(term_postings, terms))
+
+        lists.sort(key=len)
+        candidates = set(lists[0])
+        for postings in lists[1:]:
+            candidates &= postings.keys()
+
+        results = []
+        for job_id in candidates:
+            decoded = sorted((search_index.decode_postings(p[job_id]) for p in lists), key=len)
+            hits = [t for t in decoded[0] if all(near(other, t) for other in decoded[1:])]
+            if hits:
+                results.append({
+                    "jobId": job_id,
+                    "score": len(hits),
+                    "hits": [t / 100 for t in hits[:MAX_HITS_PER_JOB]]
+                })
+        results.sort(key=lambda r: -r["score"])
+
+        return {
+            "statusCode": 200,
+            "headers": dict(CORS_HEADERS, **{"Content-Type": "application/json"}),
+            "body": json.dumps({
+                "query": params.get("q"),
+                "terms": terms,
+                "total": len(results),
+                "results": results[:limit],
+                "tookMs": round(1000 * (time.time() - started))
+            })
+        }
+
+    except Exception as e:
+        return {
+            "statusCode": 500,
+            "body": json.dumps({"error": str(e)})
+        }
+
+def get_usage(user_id: str):
+    """GET /users/{userId}/usage - submission rate limit bucket and consumption"""
+    if not rate_limit.enabled():
+        return {"statusCode": 404, "headers": CORS_HEADERS, "body": json.dumps({"error": "Rate limiting not enabled"})}
+    try:
+        return {
+            "statusCode": 200,
+            "headers": dict(CORS_HEADERS, **{"Content-Type": "application/json"}),
+            "body": json.dumps(rate_limit.usage(user_id))
+        }
+    except Exception as e:
+        return {
+            "statusCode": 500,
+            "body": json.dumps({"error": str(e)})
+        }
+
+def term_postings(term: str) -> dict:
+    """jobId -> encoded postings for one term"""
+    postings = {}
+    kwargs = {
+        "KeyConditionExpression": Key("term").eq(term),
+        "ProjectionExpression": "jobId, postings"
+    }
+    while len(postings) < MAX_JOBS_PER_TERM:
+        response = search_table.query(**kwargs)
+        for item in response.get("Items", []):
+            postings[item["jobId"]] = bytes(item["postings"])
+        if "LastEvaluatedKey" not in response:
+            break
+        kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+    return postings
+
+def near(starts: list, t: int) -> bool:
+    """Whether a sorted posting list has an entry within HIT_WINDOW_CS of t"""
+    i = bisect.bisect_left(starts, t - HIT_WINDOW_CS)
+    return i < len(starts) and starts[i] <= t + HIT_WINDOW_CS
+
+def get_batch(batch_id):
+    """
+    GET /batches/{batchId} - aggregate progress of a bulk submission,
+    from the batch record plus its jobs on the BatchIndex GSI
+    """
+    try:
+        if not batches_table:
+            return {"statusCode": 404, "body": json.dumps({"error": "Batches not enabled"})}
+
+        batch = batches_table.get_item(Key={"batchId": batch_id}).get("Item")
+        if not batch:
+            return {"statusCode": 404, "body": json.dumps({"error": "Batch not found"})}
+
+        jobs = []
+        kwargs = {
+            "IndexName": "BatchIndex",
+            "KeyConditionExpression": Key("batchId").eq(batch_id),
+            "ProjectionExpression": "jobId, #s, progress, transcriptionKey",
+            "ExpressionAttributeNames": {"#s": "status"}
+        }
+        while True:
+            response = jobs_table.query(**kwargs)
+            jobs.extend(response.get("Items", []))
+            if "LastEvaluatedKey" not in response:
+                break
+            kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+        by_status = {}
+        for job in jobs:
+            by_status[job.get("status", "unknown")] = by_status.get(job.get("status", "unknown"), 0) + 1
+        # A job is done once the post-processor wrote its transcription
+        transcribed = sum(1 for job in jobs if job.get("transcriptionKey"))
+        total = int(batch.get("totalJobs", len(jobs)))
+
+        batch["jobsByStatus"] = by_status
+        batch["transcribedJobs"] = transcribed
+        batch["failedJobs"] = by_status.get("failed", 0)
+        batch["progress"] = round(100 * transcribed / total, 1) if total else 0
+        batch["jobs"] = [
+            {"jobId": job["jobId"], "status": job.get("status"), "progress": job.get("progress", 0)}
+            for job in jobs
+        ]
+
         return {
             "statusCode": 200,
             "headers": {
                 "Content-Type": "application/json",
                 "Access-Control-Allow-Origin": "*"
             },
-            "body": json.dumps(item, default=str)
+            "body": json.dumps(batch, default=str)
         }
 
     except Exception as e:
@@ -0,0 +1,111 @@
+"""
+Straggler detection over the chunk dispatch ledger.
+
+Every dispatched chunk has a ledger item (jobId, chunkId) that carries
+`outstanding` until a whisper instance wins the conditional completion
+write. A chunk is a straggler when it has been outstanding longer than
+the job's latency percentile (or a default while the job has too few
+finished chunks), or when its last attempt failed.
+"""
+import math
+import os
+import time
+
+from boto3.dynamodb.conditions import Key
+
+# Never hedge chunks younger than this
+HEDGE_MIN_SECONDS = float(os.getenv("HEDGE_MIN_SECONDS", "60"))
+# Threshold used until a job has HEDGE_MIN_SAMPLES finished chunks
+HEDGE_DEFAULT_SECONDS = float(os.getenv("HEDGE_DEFAULT_SECONDS", "180"))
+HEDGE_PERCENTILE = float(os.getenv("HEDGE_PERCENTILE", "95"))
+HEDGE_MIN_SAMPLES = int(os.getenv("HEDGE_MIN_SAMPLES", "5"))
+# Hedged copies per chunk, and share of a job's chunks that may be hedged
+HEDGE_MAX_PER_CHUNK = int(os.getenv("HEDGE_MAX_PER_CHUNK", "2"))
+HEDGE_MAX_FRACTION = float(os.getenv("HEDGE_MAX_FRACTION", "0.1"))
+
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def straggler_threshold(latencies: list) -> float:
+    if len(latencies) < HEDGE_MIN_SAMPLES:
+        return HEDGE_DEFAULT_SECONDS
+    return max(HEDGE_MIN_SECONDS, percentile(latencies, HEDGE_PERCENTILE))
+
+
+def query_all(table, **kwargs) -> list:
+    items = []
+    while True:
+        response = table.query(**kwargs)
+        items.extend(response.get("Items", []))
+        if "LastEvaluatedKey" not in response:
+            return items
+        kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def find_stragglers(ledger, now: float = None) -> list:
+    """
+    Ledger items that should get a hedged copy, oldest first.
+    Failed attempts are always candidates; slow ones only past the
+    job's threshold and within its hedge budget. Chunks that would need
+    another copy but already used HEDGE_MAX_PER_CHUNK come back marked
+    `exhausted`: nothing will finish them, so their job has to fail.
+    """
+    now = now or time.time()
+
+    outstanding = query_all(
+        ledger,
+        IndexName="OutstandingIndex",
+        KeyConditionExpression=Key("outstanding").eq("1")
+        & Key("dispatchedAt").lt(int(now - HEDGE_MIN_SECONDS))
+    )
+    failed = query_all(
+        ledger,
+        IndexName="OutstandingIndex",
+        KeyConditionExpression=Key("outstanding").eq("1"),
+        FilterExpression="attribute_exists(failedAt)"
+    )
+
+    candidates = {}
+    for item in outstanding + failed:
+        candidates[(item["jobId"], int(item["chunkId"]))] = item
+
+    by_job = {}
+    for item in candidates.values():
+        by_job.setdefault(item["jobId"], []).append(item)
+
+    stragglers = []
+    for job_id, items in by_job.items():
+        chunks = query_all(
+            ledger,
+            KeyConditionExpression=Key("jobId").eq(job_id),
+            ProjectionExpression="dispatchedAt, completedAt, hedges"
+        )
+        latencies = [
+            float(c["completedAt"]) - float(c["dispatchedAt"])
+            for c in chunks if "completedAt" in c and "dispatchedAt" in c
+        ]
+        threshold = straggler_threshold(latencies)
+        budget = max(1, int(HEDGE_MAX_FRACTION * len(chunks)))
+        budget -= sum(1 for c in chunks if int(c.get("hedges", 0)) > 0)
+
+        for item in sorted(items, key=lambda i: float(i["dispatchedAt"])):
+            # A running hedge gets the same threshold before another one
+            started = float(item.get("hedgedAt") or item["dispatchedAt"])
+            if "failedAt" not in item and now - started < threshold:
+                continue
+            if int(item.get("hedges", 0)) >= HEDGE_MAX_PER_CHUNK:
+                stragglers.append(dict(item, exhausted=True))
+                continue
+            # Retrying failures is not optional, slow chunks are budgeted
+            if "failedAt" not in item and int(item.get("hedges", 0)) == 0:
+                if budget <= 0:
+                    continue
+                budget -= 1
+            stragglers.append(dict(item, threshold=round(threshold, 1)))
+
+    return stragglers
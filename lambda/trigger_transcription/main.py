@@ -1,66 +1,555 @@
 import json
 import os
-import urllib.request
+import socket
+import threading
+import time
 import urllib.parse
-import boto3
+import zlib
+import http.client
+from concurrent.futures import ThreadPoolExecutor
+from botocore.exceptions import ClientError
 
+import aws_clients
+import hedging
+from router import InstanceRouter
 
-def handler(event, context):
+# Built on first use (see aws_clients)
+s3 = aws_clients.client("s3")
+
+# Chunk dispatch ledger used for straggler hedging (optional)
+CHUNKS_TABLE = os.getenv("CHUNKS_TABLE")
+JOBS_TABLE = os.getenv("JOBS_TABLE")
+ledger = aws_clients.table(CHUNKS_TABLE) if CHUNKS_TABLE else None
+jobs_table = aws_clients.table(JOBS_TABLE) if JOBS_TABLE else None
+LEDGER_TTL_SECONDS = 7 * 24 * 3600
+
+# e.g. whisper-service.podcast-transcription.local
+WHISPER_SERVICE_DNS = os.getenv("WHISPER_SERVICE_DNS")
+WHISPER_PORT = 8080
+
+# Chunks sent per /transcribe call. Long jobs are split into several
+# batches so they still spread across whisper instances.
+MAX_KEYS_PER_REQUEST = int(os.getenv("MAX_KEYS_PER_REQUEST", "8"))
+# Batches in flight at once
+DISPATCH_CONCURRENCY = int(os.getenv("DISPATCH_CONCURRENCY", "8"))
+HTTP_TIMEOUT = 10
+
+# Load-aware placement: "p2c" (power of two choices), "least" or "dns"
+ROUTING_POLICY = os.getenv("ROUTING_POLICY", "p2c")
+# How long an instance's /stats stay cached, and when they count as stale
+STATS_TTL_SECONDS = float(os.getenv("STATS_TTL_SECONDS", "2"))
+STATS_MAX_AGE_SECONDS = float(os.getenv("STATS_MAX_AGE_SECONDS", "10"))
+STATS_TIMEOUT = 0.5
+
+
+class ConnectionPool:
     """
-    Trigger Whisper Service when new chunk is uploaded
+    Keep-alive HTTP connections per host. Lives at module level so warm
+    invocations reuse the connections of previous ones.
     """
-    print("Received event:", json.dumps(event))
 
-    # e.g. whisper-service.podcast-transcription.local
-    WHISPER_Service_DNS = os.getenv("WHISPER_SERVICE_DNS")
+    def __init__(self, port: int, timeout: float):
+        self.port = port
+        self.timeout = timeout
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def post_json(self, host: str, path: str, payload: dict) -> dict:
+        return self._request(
+            host, "POST", path,
+            body=json.dumps(payload).encode("utf-8"),
+            headers={"Content-Type": "application/json"}
+        )
+
+    def get_json(self, host: str, path: str) -> dict:
+        return self._request(host, "GET", path)
+
+    def _request(self, host: str, method: str, path: str, body: bytes = None,
+                 headers: dict = None) -> dict:
+        conn = self._acquire(host)
+        try:
+            conn.request(method, path, body=body, headers=headers or {})
+            response = conn.getresponse()
+            data = response.read()
+        except Exception:
+            conn.close()
+            raise
+
+        if response.will_close:
+            conn.close()
+        else:
+            self._release(host, conn)
+
+        if response.status >= 300:
+            raise Exception(f"HTTP {response.status}: {data[:200]!r}")
+        return json.loads(data or b"{}")
 
+    def _acquire(self, host: str) -> http.client.HTTPConnection:
+        with self._lock:
+            idle = self._idle.get(host)
+            if idle:
+                return idle.pop()
+        return http.client.HTTPConnection(host, self.port, timeout=self.timeout)
+
+    def _release(self, host: str, conn: http.client.HTTPConnection):
+        with self._lock:
+            self._idle.setdefault(host, []).append(conn)
+
+
+pool = ConnectionPool(WHISPER_PORT, HTTP_TIMEOUT)
+# Separate pool so slow stats probes never hold dispatch connections
+stats_pool = ConnectionPool(WHISPER_PORT, STATS_TIMEOUT)
+
+router = InstanceRouter(
+    lambda host: stats_pool.get_json(host, "/stats"),
+    policy=ROUTING_POLICY,
+    ttl=STATS_TTL_SECONDS,
+    max_age=STATS_MAX_AGE_SECONDS
+)
+
+
+def resolve_instances(dns: str) -> list:
+    """All whisper task IPs behind the Cloud Map name (MULTIVALUE routing)"""
     try:
-        # 1. Parse S3 Event
-        for record in event['Records']:
-            s3_bucket = record['s3']['bucket']['name']
-            s3_key = urllib.parse.unquote_plus(record['s3']['object']['key'])
+        infos = socket.getaddrinfo(dns, WHISPER_PORT, proto=socket.IPPROTO_TCP)
+        return sorted({info[4][0] for info in infos}) or [dns]
+    except OSError as e:
+        print(f"Could not resolve {dns}: {e}")
+        return [dns]
 
-            print(f"Processing object: {s3_key}")
 
-            # Expected key format: audio/{job_id}/chunks/chunk_{num}.wav
-            parts = s3_key.split('/')
-            if len(parts) < 4 or parts[0] != "audio" or parts[2] != "chunks":
-                print(f"Skipping non-chunk file: {s3_key}")
-                continue
+def parse_records(event) -> list:
+    """
+    (sqs message id, bucket, key) for every object event. Accepts S3
+    notifications delivered through the chunk events queue or directly.
+    """
+    items = []
+    for record in event.get("Records", []):
+        if record.get("eventSource") == "aws:sqs":
+            body = json.loads(record["body"])
+            # s3:TestEvent messages carry no Records
+            for s3_record in body.get("Records", []):
+                items.append((
+                    record["messageId"],
+                    s3_record["s3"]["bucket"]["name"],
+                    urllib.parse.unquote_plus(s3_record["s3"]["object"]["key"])
+                ))
+        elif "s3" in record:
+            items.append((
+                None,
+                record["s3"]["bucket"]["name"],
+                urllib.parse.unquote_plus(record["s3"]["object"]["key"])
+            ))
+    return items
+
+
+def expand_object(message_id: str, bucket: str, s3_key: str) -> list:
+    """
+    Work units for one uploaded object.
 
-            job_id = parts[1]
+    Expected key formats:
+      audio/{job_id}/chunks/chunk_{num}.wav
+      audio/{job_id}/packs/pack_{num}.index.json (chunk pack mode)
+    """
+    parts = s3_key.split('/')
+    if len(parts) < 4 or parts[0] != "audio":
+        print(f"Skipping non-chunk file: {s3_key}")
+        return []
 
-            # 2. Call Whisper Service API
-            # Ideally we might batched this, but for now 1:1 trigger is fine for architecture v3.0
-            # S3 event-driven architecture
+    job_id = parts[1]
 
-            url = f"http://{WHISPER_Service_DNS}:8080/transcribe"
+    if parts[2] == "chunks":
+        return [{
+            "job_id": job_id,
+            "chunk_id": parse_chunk_id(s3_key),
+            "s3_key": s3_key,
+            "message_id": message_id
+        }]
 
-            payload = {
+    if parts[2] == "packs" and s3_key.endswith(".index.json"):
+        obj = s3.get_object(Bucket=bucket, Key=s3_key)
+        index = json.loads(obj["Body"].read())
+        print(f"Pack {index['pack_key']} holds {len(index['chunks'])} chunks")
+        return [
+            {
                 "job_id": job_id,
-                "s3_keys": [s3_key],
-                "model_size": "small"  # could be dynamic
+                "chunk_id": c["chunk_id"],
+                "pack_key": index["pack_key"],
+                "chunk": {
+                    "chunk_id": c["chunk_id"],
+                    "offset": c["offset"],
+                    "length": c["length"]
+                },
+                "message_id": message_id
             }
+            for c in index["chunks"]
+        ]
+
+    print(f"Skipping non-chunk file: {s3_key}")
+    return []
+
+
+def parse_chunk_id(s3_key: str) -> int:
+    """Chunk ID from key (audio/{job_id}/chunks/chunk_001.wav)"""
+    try:
+        return int(s3_key.rsplit('_', 1)[1].split('.')[0])
+    except (IndexError, ValueError):
+        return 0  # Same fallback as the whisper service
+
+
+def build_batches(units: list, instances: list) -> list:
+    """
+    Coalesce work units into multi-key /transcribe requests: grouped by
+    job (and pack), split into MAX_KEYS_PER_REQUEST slices, and the slices
+    spread over the instances starting at a per-job offset. That DNS-based
+    placement is the fallback; route_batches() overrides it with load.
+    """
+    groups = {}
+    for unit in units:
+        groups.setdefault((unit["job_id"], unit.get("pack_key")), []).append(unit)
+
+    batches = []
+    for (job_id, pack_key), group in groups.items():
+        start = zlib.crc32(job_id.encode("utf-8"))
+        for n, i in enumerate(range(0, len(group), MAX_KEYS_PER_REQUEST)):
+            piece = group[i:i + MAX_KEYS_PER_REQUEST]
+            payload = {"job_id": job_id, "model_size": "small"}  # could be dynamic
+            if pack_key:
+                payload["pack_key"] = pack_key
+                payload["chunks"] = [u["chunk"] for u in piece]
+            else:
+                payload["s3_keys"] = [u["s3_key"] for u in piece]
+
+            batches.append({
+                "host": instances[(start + n) % len(instances)],
+                "payload": payload,
+                "units": piece,
+                "message_ids": {u["message_id"] for u in piece if u["message_id"]}
+            })
+    return batches
+
+
+def batch_size(batch: dict) -> int:
+    payload = batch["payload"]
+    return len(payload.get("s3_keys") or payload.get("chunks"))
+
+
+def route_batches(batches: list, instances: list) -> int:
+    """
+    Move batches to the least-loaded instances according to the router's
+    view. Batches keep their DNS placement when the stats are stale.
+    Returns how many batches were placed by load.
+    """
+    router.refresh(instances)
+    routed = 0
+    for batch in batches:
+        host = router.pick(batch_size(batch))
+        if host:
+            batch["host"] = host
+            routed += 1
+    return routed
+
+
+def send_batch(batch: dict):
+    """POST one batch; returns the error instead of raising"""
+    payload = batch["payload"]
+    try:
+        print(f"Calling Whisper Service {batch['host']} for job "
+              f"{payload['job_id']} ({batch_size(batch)} chunks)...")
+        response = pool.post_json(batch["host"], "/transcribe", payload)
+        print("Response:", json.dumps(response))
+    except Exception as e:
+        print(f"Error dispatching batch for job {payload['job_id']}: {e}")
+        router.forget(batch["host"])
+        return e
+
+    try:
+        record_dispatch(batch)
+    except Exception as e:
+        # The chunks are on their way; they just cannot be hedged
+        print(f"Error recording dispatch for job {payload['job_id']}: {e}")
+    return None
+
 
-            data = json.dumps(payload).encode('utf-8')
+def record_dispatch(batch: dict):
+    """Add the batch's chunks to the dispatch ledger as outstanding"""
+    if not ledger:
+        return
 
-            req = urllib.request.Request(
-                url,
-                data=data,
-                headers={'Content-Type': 'application/json'}
+    now = int(time.time())
+    for unit in batch["units"]:
+        if unit.get("pack_key"):
+            source = {"pack_key": unit["pack_key"], **unit["chunk"]}
+        else:
+            source = {"s3_key": unit["s3_key"]}
+        try:
+            ledger.update_item(
+                Key={"jobId": unit["job_id"], "chunkId": unit["chunk_id"]},
+                UpdateExpression=(
+                    "SET dispatchedAt = :now, instance = :host, #src = :src,"
+                    " outstanding = :one, #ttl = :ttl REMOVE failedAt"
+                ),
+                # Redelivered events must not reopen finished chunks
+                ConditionExpression="attribute_not_exists(completedAt)",
+                ExpressionAttributeNames={"#src": "source", "#ttl": "ttl"},
+                ExpressionAttributeValues={
+                    ":now": now,
+                    ":host": batch["host"],
+                    ":src": source,
+                    ":one": "1",
+                    ":ttl": now + LEDGER_TTL_SECONDS
+                }
             )
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                raise
+
+
+def hedge_stragglers() -> dict:
+    """
+    Scheduled sweep: send a hedged copy of every straggler chunk to a
+    different instance. Whichever copy finishes first wins the ledger's
+    conditional completion write; whisper discards the other one.
+    """
+    if not ledger:
+        return {"hedged": 0}
+
+    stragglers = hedging.find_stragglers(ledger)
+    if not stragglers:
+        return {"hedged": 0}
+
+    instances = resolve_instances(WHISPER_SERVICE_DNS)
+    router.refresh(instances)
+
+    hedged = 0
+    failed_jobs = set()
+    for item in stragglers:
+        job_id, chunk_id = item["jobId"], int(item["chunkId"])
+        if item.get("exhausted"):
+            if retire_chunk(item) and job_id not in failed_jobs:
+                print(f"Chunk {chunk_id} of job {job_id} used its "
+                      f"{hedging.HEDGE_MAX_PER_CHUNK} hedges, failing the job")
+                update_job_status(
+                    job_id, "failed",
+                    f"Chunk {chunk_id} failed after "
+                    f"{hedging.HEDGE_MAX_PER_CHUNK} retries"
+                )
+                failed_jobs.add(job_id)
+            continue
+        if job_id in failed_jobs:
+            continue  # no point hedging the rest of a failed job
+
+        host = pick_hedge_host(item, instances)
+        if not host:
+            print(f"No other instance to hedge chunk {chunk_id} of job {job_id}")
+            continue
+        if not claim_hedge(item, host):
+            continue  # finished or hedged concurrently
+
+        source = item["source"]
+        payload = {"job_id": job_id, "model_size": "small", "hedge": True}
+        if source.get("pack_key"):
+            payload["pack_key"] = source["pack_key"]
+            payload["chunks"] = [{
+                "chunk_id": chunk_id,
+                "offset": int(source["offset"]),
+                "length": int(source["length"])
+            }]
+        else:
+            payload["s3_keys"] = [source["s3_key"]]
+
+        reason = "failed" if "failedAt" in item else f">{item['threshold']}s"
+        print(f"Hedging chunk {chunk_id} of job {job_id} "
+              f"({item['instance']} -> {host}, {reason})")
+        if send_batch({"host": host, "payload": payload, "units": []}):
+            # The copy never left: give the attempt back
+            release_hedge(item, host)
+            continue
+
+        hedged += 1
+        if jobs_table:
+            jobs_table.update_item(
+                Key={"jobId": job_id},
+                UpdateExpression="ADD hedgedChunks :one",
+                ExpressionAttributeValues={":one": 1}
+            )
+
+    print(f"Hedged {hedged} of {len(stragglers)} straggler chunks")
+    return {"hedged": hedged, "stragglers": len(stragglers),
+            "failedJobs": len(failed_jobs)}
+
+
+def pick_hedge_host(item: dict, instances: list) -> str:
+    """Least-loaded instance other than the one holding the chunk"""
+    busy = {item.get("instance"), item.get("hedgeInstance")}
+    host = router.pick(1, exclude=busy)
+    if host:
+        return host
+    others = [i for i in instances if i not in busy]
+    if others:
+        return others[zlib.crc32(item["jobId"].encode("utf-8")) % len(others)]
+    # Retrying a failure on the same instance still beats waiting
+    return instances[0] if "failedAt" in item else None
+
+
+def claim_hedge(item: dict, host: str) -> bool:
+    """Record the hedge, unless the chunk completed or was hedged meanwhile"""
+    try:
+        ledger.update_item(
+            Key={"jobId": item["jobId"], "chunkId": item["chunkId"]},
+            UpdateExpression=(
+                "SET hedges = if_not_exists(hedges, :zero) + :one,"
+                " hedgedAt = :now, hedgeInstance = :host REMOVE failedAt"
+            ),
+            ConditionExpression=(
+                "attribute_not_exists(completedAt) AND "
+                "(attribute_not_exists(hedges) OR hedges = :seen)"
+            ),
+            ExpressionAttributeValues={
+                ":zero": 0,
+                ":one": 1,
+                ":now": int(time.time()),
+                ":host": host,
+                ":seen": int(item.get("hedges", 0))
+            }
+        )
+        return True
+    except ClientError as e:
+        if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+            return False
+        raise
+
+
+def release_hedge(item: dict, host: str):
+    """Undo claim_hedge after the hedged copy could not be sent"""
+    values = {
+        ":one": 1,
+        ":claimed": int(item.get("hedges", 0)) + 1,
+        ":host": host
+    }
+    sets, removes = ["hedges = hedges - :one"], []
+    # Put back what the claim replaced, so the chunk is retried as before
+    for attr in ("hedgedAt", "hedgeInstance", "failedAt"):
+        if attr in item:
+            sets.append(f"{attr} = :{attr}")
+            values[f":{attr}"] = item[attr]
+        elif attr != "failedAt":
+            removes.append(attr)
+    expr = "SET " + ", ".join(sets)
+    if removes:
+        expr += " REMOVE " + ", ".join(removes)
+
+    try:
+        ledger.update_item(
+            Key={"jobId": item["jobId"], "chunkId": item["chunkId"]},
+            UpdateExpression=expr,
+            ConditionExpression=(
+                "attribute_not_exists(completedAt) AND "
+                "hedges = :claimed AND hedgeInstance = :host"
+            ),
+            ExpressionAttributeValues=values
+        )
+    except ClientError as e:
+        # Completed or hedged again meanwhile: nothing to give back
+        if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+            raise
+
+
+def retire_chunk(item: dict) -> bool:
+    """
+    Take a chunk that ran out of hedges off the outstanding index, unless
+    it completed or got another attempt meanwhile
+    """
+    try:
+        ledger.update_item(
+            Key={"jobId": item["jobId"], "chunkId": item["chunkId"]},
+            UpdateExpression="REMOVE outstanding",
+            ConditionExpression=(
+                "attribute_not_exists(completedAt) AND hedges = :seen"
+            ),
+            ExpressionAttributeValues={":seen": int(item.get("hedges", 0))}
+        )
+        return True
+    except ClientError as e:
+        if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+            return False
+        raise
+
+
+def update_job_status(job_id: str, status: str, message: str):
+    """Update job status in DynamoDB, leaving completed jobs alone"""
+    if not jobs_table:
+        return
+
+    try:
+        jobs_table.update_item(
+            Key={"jobId": job_id},
+            UpdateExpression="SET #status = :status, message = :message, updatedAt = :updated",
+            ConditionExpression="#status <> :completed",
+            ExpressionAttributeNames={"#status": "status"},
+            ExpressionAttributeValues={
+                ":status": status,
+                ":message": message,
+                ":completed": "completed",
+                ":updated": int(time.time())
+            }
+        )
+    except ClientError as e:
+        if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+            print(f"Error updating job status: {e}")
 
-            print(f"Calling Whisper Service for job {job_id}...")
-            response = urllib.request.urlopen(req)
-            print("Response:", response.read().decode('utf-8'))
 
+def handler(event, context):
+    """
+    Trigger Whisper Service for newly uploaded chunks.
+    Normally fed by the chunk events SQS queue (batched S3 events); failed
+    batches are reported per message so only those are redelivered.
+    The EventBridge schedule invokes it to hedge straggler chunks.
+    """
+    if event.get("source") == "aws.events":
+        return hedge_stragglers()
+
+    items = parse_records(event)
+    from_queue = any(r.get("eventSource") == "aws:sqs" for r in event.get("Records", []))
+    print(f"Received {len(items)} object events")
+
+    failed_messages = set()
+    units = []
+    for message_id, bucket, s3_key in items:
+        try:
+            units.extend(expand_object(message_id, bucket, s3_key))
+        except Exception as e:
+            print(f"Error reading {s3_key}: {e}")
+            if not from_queue:
+                raise
+            failed_messages.add(message_id)
+
+    instances = resolve_instances(WHISPER_SERVICE_DNS)
+    batches = build_batches(units, instances)
+    routed = route_batches(batches, instances) if batches else 0
+    print(f"Dispatching {len(units)} chunks in {len(batches)} requests "
+          f"({routed} placed by load)")
+
+    if batches:
+        with ThreadPoolExecutor(max_workers=min(DISPATCH_CONCURRENCY, len(batches))) as executor:
+            errors = list(executor.map(send_batch, batches))
+
+        for batch, error in zip(batches, errors):
+            if error:
+                failed_messages |= batch["message_ids"]
+
+        if not from_queue and any(errors):
+            # Direct S3 invocation: let Lambda retry the event
+            raise next(e for e in errors if e)
+
+    if from_queue:
         return {
-            'statusCode': 200,
-            'body': json.dumps('Transcription triggered successfully')
+            "batchItemFailures": [
+                {"itemIdentifier": message_id} for message_id in sorted(failed_messages)
+            ]
         }
 
-    except Exception as e:
-        print(f"Error: {str(e)}")
-        # We don't want to retry indefinitely if it's a logic error,
-        # but for network errors λ retry is good.
-        raise e
+    return {
+        'statusCode': 200,
+        'body': json.dumps('Transcription triggered successfully')
+    }
@@ -0,0 +1,114 @@
+"""
+Load-aware routing of chunk batches to whisper instances.
+
+Keeps a short-lived view of each instance's outstanding work (from its
+/stats endpoint) and places batches with power-of-two-choices or
+least-outstanding-work. When no fresh stats are available the caller
+falls back to plain Cloud Map DNS round-robin.
+"""
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Seconds per chunk assumed for instances that have not reported one yet
+DEFAULT_CHUNK_SECONDS = 10.0
+
+
+class InstanceRouter:
+    """
+    `fetch_stats(host) -> dict` returns an instance's /stats payload.
+    The view lives at module level, so warm invocations only refresh it
+    every `ttl` seconds; entries older than `max_age` are ignored.
+    """
+
+    def __init__(self, fetch_stats, policy: str = "p2c", ttl: float = 2.0,
+                 max_age: float = 10.0, max_workers: int = 8):
+        self.fetch_stats = fetch_stats
+        self.policy = policy
+        self.ttl = ttl
+        self.max_age = max_age
+        self.max_workers = max_workers
+        self._view = {}  # host -> {"stats": dict, "fetched_at": float, "assigned": float}
+        self._lock = threading.Lock()
+
+    def refresh(self, instances: list):
+        """Fetch /stats, in parallel, from every instance whose entry is older than ttl"""
+        if self.policy == "dns":
+            return
+
+        now = time.time()
+        with self._lock:
+            # Instances no longer in DNS are dropped from the view
+            for host in set(self._view) - set(instances):
+                del self._view[host]
+            due = [
+                host for host in instances
+                if now - self._view.get(host, {}).get("fetched_at", 0) >= self.ttl
+            ]
+        if not due:
+            return
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(due))) as executor:
+            results = list(executor.map(self._fetch, due))
+
+        with self._lock:
+            for host, stats in zip(due, results):
+                if stats is None:
+                    continue  # keep the previous entry until it goes stale
+                self._view[host] = {
+                    "stats": stats,
+                    "fetched_at": time.time(),
+                    # Work we placed since the instance last reported
+                    "assigned": 0.0
+                }
+
+    def pick(self, chunks: int, exclude: set = frozenset()) -> str:
+        """
+        Host for a batch of `chunks` chunks, or None when there is no fresh
+        load information (caller should use DNS).
+        """
+        with self._lock:
+            now = time.time()
+            fresh = [
+                host for host, entry in self._view.items()
+                if now - entry["fetched_at"] <= self.max_age
+                and entry["stats"].get("accepting", True)
+                and host not in exclude
+            ]
+            if not fresh or self.policy == "dns":
+                return None
+
+            if self.policy == "least" or len(fresh) <= 2:
+                host = min(fresh, key=self._score)
+            else:
+                # Power of two choices: cheap, and avoids herding onto the
+                # single least-loaded instance between refreshes
+                host = min(random.sample(fresh, 2), key=self._score)
+
+            entry = self._view[host]
+            entry["assigned"] += chunks * self._chunk_seconds(entry)
+            return host
+
+    def forget(self, host: str):
+        """Drop an instance after a failed dispatch so it is re-probed"""
+        with self._lock:
+            self._view.pop(host, None)
+
+    def _fetch(self, host: str):
+        try:
+            return self.fetch_stats(host)
+        except Exception as e:
+            print(f"Could not read stats from {host}: {e}")
+            return None
+
+    def _chunk_seconds(self, entry: dict) -> float:
+        return entry["stats"].get("ewma_chunk_seconds") or DEFAULT_CHUNK_SECONDS
+
+    def _score(self, host: str) -> float:
+        """Estimated seconds of work queued on the instance"""
+        entry = self._view[host]
+        reported = entry["stats"].get("outstanding_seconds")
+        if reported is None:
+            reported = entry["stats"].get("pending_chunks", 0) * self._chunk_seconds(entry)
+        return reported + entry["assigned"]
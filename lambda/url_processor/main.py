@@ -1,16 +1,34 @@
 """
 URL Processor Lambda - Usa Service Discovery en lugar de ALB
 """
+import hashlib
 import json
 import os
-import boto3
+import time
 import uuid
 from datetime import datetime
+from urllib.parse import parse_qsl, urlencode, urlparse
 import urllib3
+from boto3.dynamodb.conditions import Key
+from boto3.dynamodb.types import TypeDeserializer
+from botocore.exceptions import ClientError
 
-dynamodb = boto3.resource("dynamodb")
-ecs_client = boto3.client("ecs")
-table = dynamodb.Table(os.getenv("JOBS_TABLE"))
+import aws_clients
+import rate_limit
+import throughput
+
+# Built on first use (see aws_clients)
+ecs_client = aws_clients.client("ecs")
+sqs = aws_clients.client("sqs")
+table = aws_clients.table(os.getenv("JOBS_TABLE"))
+BATCHES_TABLE = os.getenv("BATCHES_TABLE")
+batches_table = aws_clients.table(BATCHES_TABLE) if BATCHES_TABLE else None
+# Submission dedup (optional): idempotency key -> jobId
+IDEMPOTENCY_TABLE = os.getenv("IDEMPOTENCY_TABLE")
+idempotency_table = aws_clients.table(IDEMPOTENCY_TABLE) if IDEMPOTENCY_TABLE else None
+# Chunks still in flight (OutstandingIndex), part of the backlog behind a new job
+CHUNKS_TABLE = os.getenv("CHUNKS_TABLE")
+chunks_table = aws_clients.table(CHUNKS_TABLE) if CHUNKS_TABLE else None
 
 # HTTP client
 http = urllib3.PoolManager()
@@ -18,11 +36,34 @@ http = urllib3.PoolManager()
 FOG_NODES_DNS = os.getenv("FOG_NODES_DNS")  # fog-nodes.podcast-transcription.local
 ECS_CLUSTER = os.getenv("ECS_CLUSTER_NAME")
 ECS_SERVICE = os.getenv("ECS_SERVICE_NAME")
+JOBS_QUEUE_URL = os.getenv("JOBS_QUEUE_URL")  # fog nodes pull work from here
+# userId or API key -> priority tier used by the whisper fair scheduler
+PRIORITY_TIERS = json.loads(os.getenv("PRIORITY_TIERS") or "{}")
+DEFAULT_TIER = os.getenv("DEFAULT_TIER", "standard")
+# Bulk submissions: max URLs/sources per POST /batches
+MAX_BATCH_URLS = int(os.getenv("MAX_BATCH_URLS", "1000"))
+# Same submission within this window returns the existing job
+IDEMPOTENCY_WINDOW_SECONDS = int(os.getenv("IDEMPOTENCY_WINDOW_SECONDS", str(24 * 3600)))
+# A claimed key whose job is not written yet belongs to a request in flight
+IDEMPOTENCY_IN_FLIGHT_SECONDS = 60
+# Admission cost (seconds of media) when the client gives no duration hint
+DEFAULT_ESTIMATED_MEDIA_SECONDS = int(os.getenv("DEFAULT_ESTIMATED_MEDIA_SECONDS", "3600"))
+MAX_ESTIMATED_MEDIA_SECONDS = 12 * 3600
+# ETA: whisper tasks sharing the backlog, seconds of audio per chunk
+WHISPER_TASKS = int(os.getenv("WHISPER_TASKS", "1"))
+CHUNK_SECONDS = 30
+BACKLOG_CACHE_SECONDS = 15
+backlog_cache = {}
+# Query parameters that don't change what gets transcribed
+TRACKING_PARAMS = {"si", "feature", "fbclid", "gclid", "igshid", "ref", "t"}
 
 def handler(event, context):
     """
     Process incoming URL submission
     """
+    if event.get("resource") == "/batches":
+        return handle_batch(event)
+
     try:
         # Parse request body
         body = json.loads(event.get("body", "{}"))
@@ -38,10 +79,36 @@ def handler(event, context):
         if not is_valid_url(url):
             return error_response(400, "Invalid URL format")
         
+        tier = resolve_tier(event, user_id)
+
         # Create job
         job_id = str(uuid.uuid4())
         created_at = int(datetime.utcnow().timestamp())
-        
+
+        # Retries, double clicks and replays get the job already started
+        idempotency_key = None
+        if idempotency_table:
+            request_hash = submission_hash(user_id, url, model_size)
+            client_key = header(event, "idempotency-key") or body.get("idempotencyKey")
+            idempotency_key = (
+                hashlib.sha256(f"{user_id}\n{client_key}".encode("utf-8")).hexdigest()
+                if client_key else request_hash
+            )
+            existing = claim_idempotency_key(idempotency_key, request_hash, job_id, created_at)
+            if existing:
+                return existing
+
+        # Admission control: the user's bucket pays the estimated duration,
+        # the post-processor settles it against the real one
+        estimated_media = estimate_media_seconds(body)
+        admission = None
+        if rate_limit.enabled():
+            admission = rate_limit.take(user_id, tier, estimated_media)
+            if not admission["allowed"]:
+                if idempotency_key:
+                    release_idempotency_key(idempotency_key, job_id)
+                return rate_limited_response(admission)
+
         job_data = {
             "jobId": job_id,
             "createdAt": created_at,
@@ -49,36 +116,340 @@ def handler(event, context):
             "url": url,
             "status": "pending",
             "progress": 0,
-            "message": "Job created, routing to fog node",
+            "message": "Job created, queued for a fog node" if JOBS_QUEUE_URL
+                       else "Job created, routing to fog node",
             "modelSize": model_size,
+            "tier": tier,
             "ttl": created_at + (30 * 24 * 60 * 60)  # 30 days
         }
-        
-        # Save to DynamoDB
-        table.put_item(Item=job_data)
-        
-        print(f"Created job {job_id} for URL: {url}")
-        
-        # Route to fog node via Service Discovery
+        if admission:
+            job_data["admissionSeconds"] = int(min(estimated_media, admission["limit"]))
+
+        # Initial ETA; the whisper service refines it as chunks complete
+        eta = throughput.estimate(estimated_media, model_size, backlog_seconds(), WHISPER_TASKS)
+        job_data["etaSeconds"] = eta["etaSeconds"]
+        job_data["estimatedCompletionAt"] = created_at + eta["etaSeconds"]
+        job_data["etaMergeSeconds"] = eta["mergeSeconds"]
+
         try:
-            fog_response = route_to_fog_node(job_id, url, model_size)
-            print(f"Fog node response: {fog_response}")
-        except Exception as e:
-            print(f"Warning: Could not route to fog node immediately: {e}")
-            # Job is still created, can be processed later
+            # Save to DynamoDB
+            table.put_item(Item=job_data)
+
+            print(f"Created job {job_id} for URL: {url}")
+
+            if JOBS_QUEUE_URL:
+                # Durable hand-off: fog nodes long-poll the queue by capacity.
+                # If this fails the request fails, so no job is left orphaned.
+                enqueue_job(job_id, url, model_size)
+        except Exception:
+            # Let the client's retry start the job instead of finding this one
+            if idempotency_key:
+                release_idempotency_key(idempotency_key, job_id)
+            if admission:
+                rate_limit.settle(user_id, job_data["admissionSeconds"])
+            raise
+
+        if not JOBS_QUEUE_URL:
+            # Route to fog node via Service Discovery
+            try:
+                fog_response = route_to_fog_node(job_id, url, model_size)
+                print(f"Fog node response: {fog_response}")
+            except Exception as e:
+                print(f"Warning: Could not route to fog node immediately: {e}")
         
-        return success_response({
+        response = success_response({
             "jobId": job_id,
             "status": "pending",
             "message": "Job submitted successfully - streaming mode",
-            "estimatedTime": "10-15 minutes",
+            "estimatedTime": format_eta(eta["etaSeconds"]),
+            "estimatedSeconds": eta["etaSeconds"],
+            "estimatedCompletionAt": job_data["estimatedCompletionAt"],
             "processing_method": "streaming_no_download"
         })
+        if admission:
+            response["headers"].update(rate_limit_headers(admission))
+        return response
         
     except Exception as e:
         print(f"Error processing request: {str(e)}")
         return error_response(500, f"Internal server error: {str(e)}")
 
+def handle_batch(event):
+    """
+    POST /batches - bulk submission
+    Body: {"urls": [media URLs]} and/or {"sources": [playlist/feed URLs]}
+    (a single "url" counts as a source). One queue message carries the
+    whole batch; a fog node expands the sources with one yt-dlp session,
+    creates the jobs and enqueues them, "send_concurrency" SendMessageBatch
+    calls at a time.
+    """
+    try:
+        if not (JOBS_QUEUE_URL and batches_table):
+            return error_response(503, "Bulk ingestion requires the jobs queue")
+
+        body = json.loads(event.get("body") or "{}")
+        urls = body.get("urls") or []
+        sources = body.get("sources") or ([body["url"]] if body.get("url") else [])
+        user_id = body.get("userId", "anonymous")
+        model_size = body.get("modelSize", "medium")
+
+        if not urls and not sources:
+            return error_response(400, "urls or sources are required")
+        if len(urls) + len(sources) > MAX_BATCH_URLS:
+            return error_response(400, f"At most {MAX_BATCH_URLS} URLs per batch")
+        invalid = [u for u in urls + sources if not isinstance(u, str) or not is_valid_url(u)]
+        if invalid:
+            return error_response(400, f"Invalid URL format: {invalid[0]}")
+
+        tier = resolve_tier(event, user_id)
+
+        # Every URL or source costs one default estimate up front. The fog
+        # node spreads what was paid over the expanded jobs (admissionSeconds)
+        # and the post-processor settles each one against its real duration,
+        # so a playlist ends up charged for all of its episodes.
+        admission = None
+        if rate_limit.enabled():
+            cost = (len(urls) + len(sources)) * DEFAULT_ESTIMATED_MEDIA_SECONDS
+            admission = rate_limit.take(user_id, tier, cost)
+            if not admission["allowed"]:
+                return rate_limited_response(admission)
+            admission_seconds = int(min(cost, admission["limit"]))
+
+        batch_id = str(uuid.uuid4())
+        created_at = int(datetime.utcnow().timestamp())
+
+        message = {
+            "type": "expand_batch",
+            "batch_id": batch_id,
+            "urls": urls,
+            "sources": sources,
+            "user_id": user_id,
+            "model_size": model_size,
+            "tier": tier,
+            "send_concurrency": body.get("send_concurrency")
+        }
+        if admission:
+            message["admission_seconds"] = admission_seconds
+
+        try:
+            batches_table.put_item(Item={
+                "batchId": batch_id,
+                "createdAt": created_at,
+                "userId": user_id,
+                "status": "pending",
+                "message": "Batch queued for expansion",
+                "requestedUrls": len(urls),
+                "sources": sources,
+                "modelSize": model_size,
+                "tier": tier,
+                "ttl": created_at + (30 * 24 * 60 * 60)  # 30 days
+            })
+            sqs.send_message(QueueUrl=JOBS_QUEUE_URL, MessageBody=json.dumps(message))
+        except Exception:
+            # Nothing was queued: give the tokens back
+            if admission:
+                rate_limit.settle(user_id, admission_seconds)
+            raise
+        print(f"Created batch {batch_id}: {len(urls)} URLs, {len(sources)} sources")
+
+        response = success_response({
+            "batchId": batch_id,
+            "status": "pending",
+            "message": "Batch submitted - jobs are created as sources are expanded"
+        }, 202)
+        if admission:
+            response["headers"].update(rate_limit_headers(admission))
+        return response
+
+    except Exception as e:
+        print(f"Error processing batch: {str(e)}")
+        return error_response(500, f"Internal server error: {str(e)}")
+
+def estimate_media_seconds(body: dict) -> int:
+    """
+    Admission cost of a submission: the client's durationSeconds hint,
+    clamped, or a typical episode. Underestimates are charged later.
+    """
+    try:
+        hint = int(body.get("durationSeconds") or 0)
+    except (TypeError, ValueError):
+        hint = 0
+    if hint <= 0:
+        return DEFAULT_ESTIMATED_MEDIA_SECONDS
+    return max(60, min(hint, MAX_ESTIMATED_MEDIA_SECONDS))
+
+def backlog_seconds() -> float:
+    """
+    Seconds of media queued ahead of a new job: chunks in flight plus jobs
+    waiting for a fog node (at the default estimate each). Cached briefly;
+    an unavailable source counts as empty.
+    """
+    cached = backlog_cache.get("seconds")
+    if cached and time.time() - cached[1] < BACKLOG_CACHE_SECONDS:
+        return cached[0]
+
+    seconds = 0
+    if chunks_table:
+        try:
+            kwargs = {
+                "IndexName": "OutstandingIndex",
+                "KeyConditionExpression": Key("outstanding").eq("1"),
+                "Select": "COUNT"
+            }
+            while True:
+                response = chunks_table.query(**kwargs)
+                seconds += response.get("Count", 0) * CHUNK_SECONDS
+                if "LastEvaluatedKey" not in response:
+                    break
+                kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+        except Exception as e:
+            print(f"Error counting outstanding chunks: {e}")
+    if JOBS_QUEUE_URL:
+        try:
+            attributes = sqs.get_queue_attributes(
+                QueueUrl=JOBS_QUEUE_URL,
+                AttributeNames=["ApproximateNumberOfMessages"]
+            )["Attributes"]
+            seconds += int(attributes["ApproximateNumberOfMessages"]) * DEFAULT_ESTIMATED_MEDIA_SECONDS
+        except Exception as e:
+            print(f"Error reading jobs queue depth: {e}")
+
+    backlog_cache["seconds"] = (seconds, time.time())
+    return seconds
+
+def format_eta(seconds: int) -> str:
+    minutes = max(1, round(seconds / 60))
+    if minutes < 90:
+        return f"about {minutes} minutes" if minutes > 1 else "about 1 minute"
+    return f"about {round(minutes / 60, 1)} hours"
+
+def rate_limit_headers(admission: dict) -> dict:
+    headers = {
+        "X-RateLimit-Limit": str(int(admission["limit"])),
+        "X-RateLimit-Remaining": str(int(admission["remaining"])),
+        "Access-Control-Expose-Headers": "Retry-After, X-RateLimit-Limit, X-RateLimit-Remaining"
+    }
+    if "retryAfter" in admission:
+        headers["Retry-After"] = str(admission["retryAfter"])
+    return headers
+
+def rate_limited_response(admission: dict):
+    """429 with Retry-After (seconds until the bucket holds the cost)"""
+    response = error_response(429, "Submission rate limit exceeded for this user, retry later")
+    response["headers"].update(rate_limit_headers(admission))
+    return response
+
+def normalize_url(url: str) -> str:
+    """
+    Canonical form of a media URL for dedup: lowercase host without www/m,
+    no fragment, tracking parameters or trailing slash, sorted query, and
+    youtu.be links rewritten to youtube.com/watch?v=
+    """
+    parsed = urlparse(url.strip())
+    host = (parsed.hostname or "").lower()
+    for prefix in ("www.", "m."):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    if parsed.port and parsed.port not in (80, 443):
+        host = f"{host}:{parsed.port}"
+
+    path = parsed.path.rstrip("/") or "/"
+    query = [
+        (k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True)
+        if k not in TRACKING_PARAMS and not k.startswith("utm_")
+    ]
+    if host == "youtu.be" and path != "/":
+        host, query = "youtube.com", query + [("v", path[1:])]
+        path = "/watch"
+
+    scheme = "https" if parsed.scheme.lower() in ("http", "https") else parsed.scheme.lower()
+    return f"{scheme}://{host}{path}" + (f"?{urlencode(sorted(query))}" if query else "")
+
+def submission_hash(user_id: str, url: str, model_size: str) -> str:
+    """Idempotency key derived from who submits what with which options"""
+    canonical = json.dumps([user_id, normalize_url(url), model_size])
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+def claim_idempotency_key(key: str, request_hash: str, job_id: str, now: int):
+    """
+    Conditionally map the key to the new job. Returns None when this request
+    owns the key (create the job), or the response for a duplicate. DynamoDB
+    TTL deletes lazily, so expired keys are checked with expiresAt.
+    """
+    item = {
+        "idempotencyKey": key,
+        "jobId": job_id,
+        "requestHash": request_hash,
+        "createdAt": now,
+        "expiresAt": now + IDEMPOTENCY_WINDOW_SECONDS,
+        "ttl": now + IDEMPOTENCY_WINDOW_SECONDS
+    }
+    try:
+        idempotency_table.put_item(
+            Item=item,
+            ConditionExpression="attribute_not_exists(idempotencyKey) OR expiresAt < :now",
+            ExpressionAttributeValues={":now": now},
+            ReturnValuesOnConditionCheckFailure="ALL_OLD"
+        )
+        return None
+    except ClientError as e:
+        if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+            raise
+        previous = deserialize_item(e.response.get("Item") or {})
+
+    if previous.get("requestHash") != request_hash:
+        return error_response(422, "Idempotency-Key was already used for a different request")
+
+    existing_id = previous["jobId"]
+    job = table.get_item(Key={"jobId": existing_id}).get("Item")
+    in_flight = not job and now - int(previous["createdAt"]) < IDEMPOTENCY_IN_FLIGHT_SECONDS
+    if (job and job.get("status") != "failed") or in_flight:
+        print(f"Duplicate submission, returning job {existing_id}")
+        response = success_response({
+            "jobId": existing_id,
+            "status": job.get("status", "pending") if job else "pending",
+            "message": "Duplicate submission - returning the existing job",
+            "duplicate": True
+        })
+        response["headers"]["Idempotent-Replayed"] = "true"
+        return response
+
+    # The previous job failed or was never written: this request takes over
+    try:
+        idempotency_table.put_item(
+            Item=item,
+            ConditionExpression="jobId = :previous",
+            ExpressionAttributeValues={":previous": existing_id}
+        )
+        return None
+    except ClientError as e:
+        if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+            raise
+        # Another retry took it over first
+        return error_response(409, "A retry of this submission is already in progress")
+
+def release_idempotency_key(key: str, job_id: str):
+    try:
+        idempotency_table.delete_item(
+            Key={"idempotencyKey": key},
+            ConditionExpression="jobId = :job",
+            ExpressionAttributeValues={":job": job_id}
+        )
+    except Exception as e:
+        print(f"Could not release idempotency key for {job_id}: {e}")
+
+def deserialize_item(item: dict) -> dict:
+    """Low-level attribute values (conditional check failures) to plain values"""
+    deserializer = TypeDeserializer()
+    return {k: deserializer.deserialize(v) for k, v in item.items()}
+
+def header(event: dict, name: str):
+    """Case-insensitive request header"""
+    for key, value in (event.get("headers") or {}).items():
+        if key.lower() == name:
+            return value
+    return None
+
 def is_valid_url(url: str) -> bool:
     """Validate URL format"""
     try:
@@ -88,6 +459,35 @@ def is_valid_url(url: str) -> bool:
     except:
         return False
 
+def resolve_tier(event: dict, user_id: str) -> str:
+    """
+    Priority tier for the request: the API key's tier wins over the
+    user's, anything unknown gets the default tier
+    """
+    headers = {k.lower(): v for k, v in (event.get("headers") or {}).items()}
+    api_key = (
+        headers.get("x-api-key")
+        or event.get("requestContext", {}).get("identity", {}).get("apiKey")
+    )
+    if api_key and api_key in PRIORITY_TIERS:
+        return PRIORITY_TIERS[api_key]
+    return PRIORITY_TIERS.get(user_id, DEFAULT_TIER)
+
+def enqueue_job(job_id: str, url: str, model_size: str):
+    """
+    Put the job on the fog nodes' work queue
+    """
+    sqs.send_message(
+        QueueUrl=JOBS_QUEUE_URL,
+        MessageBody=json.dumps({
+            "type": "process",
+            "url": url,
+            "job_id": job_id,
+            "model_size": model_size
+        })
+    )
+    print(f"Enqueued job {job_id}")
+
 def route_to_fog_node(job_id: str, url: str, model_size: str) -> dict:
     """
     Route job to fog node using Service Discovery DNS
@@ -11,6 +11,8 @@ cd "$PROJECT_ROOT/docker/fog-node"
 docker build -t podcast-fog-node:latest .
 
 cd "$PROJECT_ROOT/docker/whisper-service"
+# Chunk result codec, shared with the Lambdas (single source in lambda/common)
+cp "$PROJECT_ROOT/lambda/common/chunk_format.py" src/
 docker build -t podcast-whisper:latest .
 
 echo "✅ Docker images built successfully"
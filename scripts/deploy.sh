@@ -32,6 +32,8 @@ docker push "$FOG_REPO:latest"
 
 echo "🔨 Building & Pushing Whisper Service..."
 cd ../whisper-service
+# Chunk result codec, shared with the Lambdas (single source in lambda/common)
+cp ../../lambda/common/chunk_format.py src/
 docker build -t "$WHISPER_REPO:latest" . --quiet
 docker push "$WHISPER_REPO:latest"
 
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Lambda Init Benchmark
+Mide el tiempo de init (import del handler en un interprete nuevo, como en un
+cold start) de cada Lambda, antes y despues: "antes" es el codigo de una
+revision de git, "despues" los zips de lambda/dist (o el arbol de trabajo si
+no existen). Reporta la mediana por funcion, modulos cargados y tamano del
+artefacto.
+
+    ./scripts/package-lambdas.sh
+    python scripts/lambda_init_bench.py --baseline <git ref> --runs 7 --output init.json
+
+How it measures:
+  - Each run is a fresh `python -B` with only the function code (and the
+    runtime path) importable, PYTHONDONTWRITEBYTECODE set: the Lambda file
+    system is read only, so code shipped without bytecode is compiled again
+    on every cold start, and the benchmark must not warm a local cache.
+  - The Lambda runtime ships boto3 precompiled. Point --runtime-path at an
+    equivalent site-packages (e.g. `pip install -t /tmp/rt boto3`) when this
+    interpreter has no boto3 of its own; vendored copies in a function
+    always win over it, as they do on Lambda.
+  - Clients built lazily are not counted: init is what the request asks
+    about; the first call that needs a client pays for building it.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+import zipfile
+from pathlib import Path
+
+REPO = Path(__file__).resolve().parents[1]
+FUNCTIONS = ["url_processor", "query_handler", "post_processor",
+             "trigger_transcription", "job_notifier"]
+
+# Handlers read table names etc. at import; values only need to be plausible
+HANDLER_ENV = {
+    "AWS_DEFAULT_REGION": "us-east-1",
+    "AWS_ACCESS_KEY_ID": "bench",
+    "AWS_SECRET_ACCESS_KEY": "bench",
+    "JOBS_TABLE": "bench-jobs",
+    "TRANSCRIPTIONS_TABLE": "bench-transcriptions",
+    "CHUNKS_TABLE": "bench-chunks",
+    "BATCHES_TABLE": "bench-batches",
+    "CONNECTIONS_TABLE": "bench-connections",
+    "SEARCH_TABLE": "bench-search",
+    "TRANSCRIPTIONS_BUCKET": "bench-transcriptions",
+    "WHISPER_SERVICE_DNS": "whisper.bench.local",
+}
+
+# Runs in the child interpreter
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import main
+elapsed = time.perf_counter() - start
+print(json.dumps({"initMs": round(elapsed * 1000, 1), "modules": len(sys.modules)}))
+"""
+
+
+def extract_revision(ref: str, func: str, dest: Path) -> list:
+    """Function directory and lambda/common as of a git revision"""
+    paths = [f"lambda/{func}", "lambda/common"]
+    existing = subprocess.run(["git", "ls-tree", "--name-only", ref, *paths],
+                              cwd=REPO, capture_output=True, text=True, check=True)
+    paths = existing.stdout.split()
+    archive = subprocess.run(["git", "archive", ref, *paths],
+                             cwd=REPO, capture_output=True, check=True)
+    tar_path = dest / "src.tar"
+    tar_path.write_bytes(archive.stdout)
+    with tarfile.open(tar_path) as tar:
+        tar.extractall(dest)
+    tar_path.unlink()
+    return [dest / "lambda" / func, dest / "lambda" / "common"]
+
+
+def current_code(func: str, dest: Path) -> list:
+    """The packaged zip when there is one, else the working tree"""
+    artifact = REPO / "lambda" / "dist" / f"{func}.zip"
+    if artifact.exists():
+        with zipfile.ZipFile(artifact) as zf:
+            zf.extractall(dest)
+        return [dest]
+    return [REPO / "lambda" / func, REPO / "lambda" / "common"]
+
+
+def footprint(paths: list) -> dict:
+    files = size = 0
+    for path in paths:
+        for item in Path(path).rglob("*"):
+            if item.is_file():
+                files += 1
+                size += item.stat().st_size
+    return {"files": files, "sizeMb": round(size / 2**20, 2)}
+
+
+def measure(paths: list, runs: int, runtime_path: str) -> dict:
+    python_path = [str(p) for p in paths]
+    if runtime_path:
+        python_path.append(runtime_path)
+    env = dict(os.environ, **HANDLER_ENV,
+               PYTHONPATH=os.pathsep.join(python_path), PYTHONDONTWRITEBYTECODE="1")
+
+    samples = []
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, "-B", "-c", PROBE], cwd=paths[0],
+                                env=env, capture_output=True, text=True)
+        if result.returncode != 0:
+            return {"error": result.stderr.strip().splitlines()[-1]}
+        samples.append(json.loads(result.stdout))
+
+    init = [s["initMs"] for s in samples]
+    return {
+        "initMs": statistics.median(init),
+        "minInitMs": min(init),
+        "modules": samples[-1]["modules"],
+        **footprint(paths)
+    }
+
+
+def print_report(report: dict):
+    print(f"\n{'function':<24}{'before ms':>11}{'after ms':>10}{'change':>9}"
+          f"{'modules':>15}{'size MB':>15}")
+    for func, row in report.items():
+        before, after = row["before"], row["after"]
+        if "error" in before or "error" in after:
+            print(f"{func:<24}  {before.get('error') or after.get('error')}")
+            continue
+        change = (after["initMs"] - before["initMs"]) / before["initMs"] * 100
+        print(f"{func:<24}{before['initMs']:>11.1f}{after['initMs']:>10.1f}{change:>8.0f}%"
+              f"{before['modules']:>8} -> {after['modules']:<4}"
+              f"{before['sizeMb']:>7} -> {after['sizeMb']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--baseline", required=True, help="git revision to compare against")
+    parser.add_argument("--functions", nargs="+", default=FUNCTIONS)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--runtime-path", help="site-packages standing in for the Lambda runtime")
+    parser.add_argument("--output", help="also write the report as JSON")
+    args = parser.parse_args()
+
+    report = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for func in args.functions:
+            before_dir = Path(tmp) / "before" / func
+            after_dir = Path(tmp) / "after" / func
+            before_dir.mkdir(parents=True)
+            after_dir.mkdir(parents=True)
+
+            print(f"Measuring {func}...")
+            report[func] = {
+                "before": measure(extract_revision(args.baseline, func, before_dir),
+                                  args.runs, args.runtime_path),
+                "after": measure(current_code(func, after_dir), args.runs, args.runtime_path)
+            }
+
+    print_report(report)
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,839 @@
+#!/usr/bin/env python3
+"""
+Load Test
+Pipeline completo en local: url_processor -> cola -> fog node -> trigger ->
+whisper-service -> post-processor, contra S3/DynamoDB/SQS simulados (moto),
+sin red ni cuenta de AWS. Genera audio sintetico parecido a voz, lanza N
+jobs concurrentes y reporta latencia extremo a extremo (percentiles),
+throughput por etapa, peticiones a S3/DynamoDB/SQS y memoria pico.
+
+    pip install -r scripts/loadtest/requirements.txt
+    python scripts/loadtest/load_test.py --jobs 8 --durations 60 300 --output report.json
+
+How the pieces are wired:
+  - moto runs as a subprocess; every service talks to it through a counting
+    proxy (AWS_ENDPOINT_URL), which also plays S3 event notifications: a new
+    audio/ object invokes the trigger Lambda (SQS-style batches), a new .tcb
+    invokes the post-processor.
+  - The fog node and whisper-service run as real uvicorn processes on
+    127.0.0.2 and 127.0.0.3 (port 8080 is hardcoded by their callers).
+    Whisper uses whisper_stub.py unless --whisper-model names a cached model.
+  - The Lambdas run in this process with a bounded pool per function.
+  - Synthetic audio is served over HTTP from a local server, so yt-dlp and
+    ffmpeg go through the same code paths as for a real podcast URL.
+
+Exits non-zero when a job fails or times out, or when --max-p95 is exceeded,
+so it can gate CI.
+"""
+import argparse
+import array
+import http.client
+import importlib.util
+import json
+import math
+import os
+import queue
+import random
+import re
+import resource
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+import uuid
+import wave
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import boto3
+
+HERE = Path(__file__).resolve().parent
+REPO = HERE.parents[1]
+
+PROJECT = "loadtest"
+REGION = "us-east-1"
+PROCESSED_BUCKET = f"{PROJECT}-processed-audio"
+TRANSCRIPTIONS_BUCKET = f"{PROJECT}-transcriptions"
+JOBS_TABLE = f"{PROJECT}-jobs"
+TRANSCRIPTIONS_TABLE = f"{PROJECT}-transcriptions"
+CHUNKS_TABLE = f"{PROJECT}-chunks"
+JOBS_QUEUE = f"{PROJECT}-jobs"
+
+# Loopback aliases: both services must listen on 8080
+FOG_HOST = "127.0.0.2"
+WHISPER_HOST = "127.0.0.3"
+SERVICE_PORT = 8080
+
+AUDIO_RATE = 22050  # sources are resampled to 16 kHz by the fog node
+
+# SQS event source mapping for the chunk events queue
+TRIGGER_BATCH_SIZE = 10
+TRIGGER_BATCH_WINDOW = 0.2
+TRIGGER_MAX_RECEIVES = 5
+TRIGGER_VISIBILITY_SECONDS = 5
+
+
+# =========================
+# SYNTHETIC AUDIO
+# =========================
+
+# (F1, F2) of a few vowels, Hz
+VOWELS = [(730, 1090), (270, 2290), (300, 870), (530, 1840), (640, 1190), (490, 1350)]
+
+
+def synth_syllable(rng: random.Random, f0: float, seconds: float) -> array.array:
+    """A voiced syllable: formant-weighted harmonics of f0 under a rise/fall envelope"""
+    n = int(seconds * AUDIO_RATE)
+    formants = rng.choice(VOWELS)
+    harmonics = []
+    k = 1
+    while k * f0 < 4000:
+        freq = k * f0
+        gain = sum(1.0 / (1.0 + ((freq - f) / 90.0) ** 2) for f in formants) / k ** 0.5
+        harmonics.append((2 * math.pi * freq / AUDIO_RATE, gain, rng.random() * 2 * math.pi))
+        k += 1
+    norm = sum(g for _, g, _ in harmonics) or 1.0
+
+    samples = array.array('h', bytes(2 * n))
+    # Plosive-like burst on some onsets
+    burst = int(0.02 * AUDIO_RATE) if rng.random() < 0.4 else 0
+    for i in range(n):
+        env = math.sin(math.pi * i / n) ** 0.6
+        value = sum(g * math.sin(w * i + p) for w, g, p in harmonics) / norm
+        if i < burst:
+            value += rng.uniform(-0.6, 0.6)
+        samples[i] = int(9000 * env * value + rng.gauss(0, 60))
+    return samples
+
+
+def write_speech_wav(path: Path, seconds: int, seed: int):
+    """
+    Speech-like WAV: words of 1-4 syllables from a small syllable bank,
+    short gaps between words and longer pauses between phrases
+    """
+    rng = random.Random(seed)
+    bank = [
+        synth_syllable(rng, rng.uniform(95, 220), rng.uniform(0.12, 0.28))
+        for _ in range(48)
+    ]
+    silence = lambda s: array.array('h', [int(rng.gauss(0, 40)) for _ in range(int(s * AUDIO_RATE))])
+    total = seconds * AUDIO_RATE
+    written = 0
+
+    with wave.open(str(path), 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(AUDIO_RATE)
+        words = 0
+        while written < total:
+            word = array.array('h')
+            for _ in range(rng.randint(1, 4)):
+                word.extend(rng.choice(bank))
+                word.extend(silence(0.02))
+            words += 1
+            word.extend(silence(rng.uniform(0.4, 0.9) if words % 8 == 0 else rng.uniform(0.08, 0.2)))
+            word = word[:total - written]
+            wav.writeframes(word.tobytes())
+            written += len(word)
+
+
+class AudioHandler(SimpleHTTPRequestHandler):
+    """Serves /<job>/<seconds>s.wav from the audio directory (one file per length)"""
+
+    def translate_path(self, path):
+        name = urllib.parse.urlparse(path).path.rsplit('/', 1)[-1]
+        return str(Path(self.server.audio_dir) / name)
+
+    def log_message(self, format, *args):
+        pass
+
+
+# =========================
+# AWS STAND-INS
+# =========================
+
+def s3_operation(method: str, path: str, query: dict) -> str:
+    bucket, _, key = path.lstrip('/').partition('/')
+    if method == 'PUT':
+        if 'partNumber' in query:
+            return 'UploadPart'
+        return 'PutObject' if key else 'CreateBucket'
+    if method == 'POST':
+        if 'uploads' in query:
+            return 'CreateMultipartUpload'
+        if 'uploadId' in query:
+            return 'CompleteMultipartUpload'
+        return 'DeleteObjects' if 'delete' in query else 'PostObject'
+    if method == 'GET':
+        if key:
+            return 'GetObject'
+        return 'ListObjectsV2' if query.get('list-type') == ['2'] else 'ListObjects'
+    if method == 'HEAD':
+        return 'HeadObject' if key else 'HeadBucket'
+    if method == 'DELETE':
+        if 'uploadId' in query:
+            return 'AbortMultipartUpload'
+        return 'DeleteObject' if key else 'DeleteBucket'
+    return method
+
+
+class ProxyHandler(BaseHTTPRequestHandler):
+    """Forwards AWS API calls to moto, counting them and emitting S3 events"""
+
+    protocol_version = "HTTP/1.1"
+
+    def _read_body(self) -> bytes:
+        if self.headers.get('Transfer-Encoding', '').lower() == 'chunked':
+            data = b''
+            while True:
+                size = int(self.rfile.readline().split(b';')[0], 16)
+                if not size:
+                    self.rfile.readline()
+                    return data
+                data += self.rfile.read(size)
+                self.rfile.readline()
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length) if length else b''
+
+    def _forward(self):
+        body = self._read_body()
+        path, _, raw_query = self.path.partition('?')
+        query = urllib.parse.parse_qs(raw_query, keep_blank_values=True)
+
+        match = re.search(r'Credential=[^/]+/[^/]+/[^/]+/([^/]+)/', self.headers.get('Authorization', ''))
+        service = match.group(1) if match else 'unknown'
+        target = self.headers.get('X-Amz-Target')
+        if target:
+            operation = target.rsplit('.', 1)[-1]
+        elif service == 's3':
+            operation = s3_operation(self.command, path, query)
+        else:
+            form = urllib.parse.parse_qs(body.decode('utf-8', 'replace'))
+            operation = (form.get('Action') or query.get('Action') or [self.command])[0]
+        self.server.counter.record(service, operation)
+
+        headers = {k: v for k, v in self.headers.items()
+                   if k.lower() not in ('transfer-encoding', 'content-length', 'connection')}
+        if body or self.command in ('PUT', 'POST'):
+            headers['Content-Length'] = str(len(body))
+
+        conn = self.server.upstream()
+        try:
+            conn.request(self.command, self.path, body=body or None, headers=headers)
+            response = conn.getresponse()
+            data = response.read()
+        except Exception:
+            conn.close()
+            self.server.local.conn = None
+            raise
+
+        self.send_response_only(response.status, response.reason)
+        for name, value in response.getheaders():
+            if name.lower() in ('transfer-encoding', 'connection', 'date', 'server'):
+                continue
+            if name.lower() == 'content-length' and self.command != 'HEAD':
+                continue
+            self.send_header(name, value)
+        if self.command != 'HEAD':
+            self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(data)
+
+        if service == 's3' and response.status == 200 and operation in ('PutObject', 'CompleteMultipartUpload'):
+            bucket, _, key = path.lstrip('/').partition('/')
+            self.server.on_object_created(bucket, urllib.parse.unquote(key), len(body))
+
+    do_GET = do_PUT = do_POST = do_HEAD = do_DELETE = _forward
+
+    def log_message(self, format, *args):
+        pass
+
+
+class AwsProxy(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, upstream_port: int, counter: "RequestCounter", on_object_created):
+        super().__init__(('127.0.0.1', 0), ProxyHandler)
+        self.upstream_port = upstream_port
+        self.counter = counter
+        self.on_object_created = on_object_created
+        self.local = threading.local()
+
+    def upstream(self) -> http.client.HTTPConnection:
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = self.local.conn = http.client.HTTPConnection('127.0.0.1', self.upstream_port, timeout=60)
+        return conn
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class RequestCounter:
+    def __init__(self):
+        self.counts = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, service: str, operation: str):
+        with self._lock:
+            self.counts[(service, operation)] += 1
+
+    def by_service(self) -> dict:
+        summary = defaultdict(dict)
+        for (service, operation), n in sorted(self.counts.items()):
+            summary[service][operation] = n
+        return {
+            service: dict(operations, total=sum(operations.values()))
+            for service, operations in summary.items()
+        }
+
+
+def s3_event(bucket: str, key: str, size: int) -> dict:
+    return {
+        "eventSource": "aws:s3",
+        "eventName": "ObjectCreated:Put",
+        "s3": {
+            "bucket": {"name": bucket},
+            "object": {"key": urllib.parse.quote_plus(key), "size": size}
+        }
+    }
+
+
+class LambdaStandIn:
+    """
+    One Lambda function fed by events: up to `concurrency` invocations at
+    once. With batch_size > 1 records are delivered as SQS messages of an
+    event source mapping (batch window, partial batch failures, redrive).
+    """
+
+    def __init__(self, name: str, handler, concurrency: int, batch_size: int = 1,
+                 batch_window: float = 0.0):
+        self.name = name
+        self.handler = handler
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix=name)
+        self.records = queue.Queue()
+        self.stats = Counter()
+        self.durations = []
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        threading.Thread(target=self._dispatch, daemon=True).start()
+
+    def submit(self, record: dict, receive_count: int = 0):
+        self.records.put((record, receive_count))
+
+    def invoke(self, event: dict):
+        """Synchronous invocation (API Gateway / EventBridge)"""
+        return self._run(event)
+
+    def _dispatch(self):
+        while not self._stopped.is_set():
+            try:
+                batch = [self.records.get(timeout=0.5)]
+            except queue.Empty:
+                continue
+            deadline = time.time() + self.batch_window
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.records.get(timeout=max(0, deadline - time.time())))
+                except queue.Empty:
+                    break
+            self.pool.submit(self._deliver, batch)
+
+    def _deliver(self, batch: list):
+        if self.batch_size == 1:
+            try:
+                self._run({"Records": [batch[0][0]]})
+            except Exception:
+                pass
+            return
+
+        messages = {str(uuid.uuid4()): item for item in batch}
+        event = {"Records": [
+            {"eventSource": "aws:sqs", "messageId": message_id,
+             "body": json.dumps({"Records": [record]})}
+            for message_id, (record, _) in messages.items()
+        ]}
+        try:
+            result = self._run(event) or {}
+            failed = {f["itemIdentifier"] for f in result.get("batchItemFailures", [])}
+        except Exception:
+            failed = set(messages)
+
+        for message_id in failed:
+            record, receives = messages[message_id]
+            if receives + 1 >= TRIGGER_MAX_RECEIVES:
+                with self._lock:
+                    self.stats["dead_lettered"] += 1
+                continue
+            timer = threading.Timer(TRIGGER_VISIBILITY_SECONDS, self.submit, (record, receives + 1))
+            timer.daemon = True
+            timer.start()
+
+    def _run(self, event: dict):
+        start = time.time()
+        try:
+            return self.handler(event, None)
+        except Exception as e:
+            with self._lock:
+                self.stats["errors"] += 1
+            print(f"[{self.name}] invocation failed: {e}")
+            raise
+        finally:
+            with self._lock:
+                self.stats["invocations"] += 1
+                self.durations.append(time.time() - start)
+
+    def summary(self) -> dict:
+        with self._lock:
+            durations = sorted(self.durations)
+            return dict(
+                self.stats,
+                p50_ms=round(1000 * percentile(durations, 50)),
+                p95_ms=round(1000 * percentile(durations, 95)),
+                max_ms=round(1000 * durations[-1]) if durations else 0
+            )
+
+    def stop(self):
+        self._stopped.set()
+        self.pool.shutdown(wait=False)
+
+
+def load_lambda(name: str):
+    """Import lambda/<name>/main.py under a unique module name"""
+    directory = REPO / "lambda" / name
+    # Appended, so installed boto3 wins over copies vendored in the Lambda dirs
+    for path in (str(directory), str(REPO / "lambda" / "common")):
+        if path not in sys.path:
+            sys.path.append(path)
+    spec = importlib.util.spec_from_file_location(f"{name}_main", directory / "main.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def create_resources(endpoint: str) -> str:
+    """Buckets, tables (keys and indexes as in terraform/modules/storage) and the jobs queue"""
+    s3 = boto3.client("s3", endpoint_url=endpoint, region_name=REGION)
+    dynamodb = boto3.client("dynamodb", endpoint_url=endpoint, region_name=REGION)
+    sqs = boto3.client("sqs", endpoint_url=endpoint, region_name=REGION)
+
+    for bucket in (PROCESSED_BUCKET, TRANSCRIPTIONS_BUCKET):
+        s3.create_bucket(Bucket=bucket)
+
+    def gsi(name, hash_key, range_key=None):
+        schema = [{"AttributeName": hash_key, "KeyType": "HASH"}]
+        if range_key:
+            schema.append({"AttributeName": range_key, "KeyType": "RANGE"})
+        return {"IndexName": name, "KeySchema": schema, "Projection": {"ProjectionType": "ALL"}}
+
+    tables = [
+        (JOBS_TABLE, [("jobId", "HASH")],
+         {"jobId": "S", "status": "S", "createdAt": "N", "batchId": "S"},
+         [gsi("StatusIndex", "status", "createdAt"), gsi("BatchIndex", "batchId", "createdAt")]),
+        (TRANSCRIPTIONS_TABLE, [("transcriptionId", "HASH")],
+         {"transcriptionId": "S", "jobId": "S"},
+         [gsi("JobIndex", "jobId")]),
+        (CHUNKS_TABLE, [("jobId", "HASH"), ("chunkId", "RANGE")],
+         {"jobId": "S", "chunkId": "N", "outstanding": "S", "dispatchedAt": "N"},
+         [gsi("OutstandingIndex", "outstanding", "dispatchedAt")]),
+    ]
+    for name, keys, attributes, indexes in tables:
+        dynamodb.create_table(
+            TableName=name,
+            BillingMode="PAY_PER_REQUEST",
+            KeySchema=[{"AttributeName": a, "KeyType": t} for a, t in keys],
+            AttributeDefinitions=[{"AttributeName": a, "AttributeType": t} for a, t in attributes.items()],
+            GlobalSecondaryIndexes=indexes
+        )
+
+    return sqs.create_queue(QueueName=JOBS_QUEUE, Attributes={"VisibilityTimeout": "300"})["QueueUrl"]
+
+
+# =========================
+# PROCESSES
+# =========================
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def wait_http(host: str, port: int, path: str, timeout: float, process: subprocess.Popen = None):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process and process.poll() is not None:
+            raise RuntimeError(f"{host}:{port} exited with code {process.returncode}")
+        try:
+            conn = http.client.HTTPConnection(host, port, timeout=2)
+            conn.request("GET", path)
+            if conn.getresponse().status < 500:
+                return
+        except OSError:
+            pass
+        time.sleep(0.5)
+    raise TimeoutError(f"{host}:{port}{path} not ready after {timeout}s")
+
+
+def start_process(argv: list, cwd: Path, env: dict, log_path: Path) -> subprocess.Popen:
+    log = open(log_path, 'wb')
+    return subprocess.Popen(argv, cwd=str(cwd), env=env, stdout=log, stderr=subprocess.STDOUT)
+
+
+def peak_rss_mb(pid: int) -> float:
+    """VmHWM (peak resident set) of a live process"""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return 0.0
+
+
+def stop_process(process: subprocess.Popen):
+    if process.poll() is None:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+# =========================
+# MEASUREMENT
+# =========================
+
+def percentile(values: list, p: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    rank = (len(values) - 1) * p / 100
+    low = int(rank)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (rank - low)
+
+
+class Timeline:
+    """When each job's objects appeared, as seen by the S3 stand-in"""
+
+    def __init__(self):
+        self.jobs = defaultdict(lambda: defaultdict(list))
+        self.done = {}
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+
+    def record(self, job_id: str, kind: str):
+        with self._changed:
+            self.jobs[job_id][kind].append(time.time())
+            if kind == "result":
+                self.done[job_id] = time.time()
+            self._changed.notify_all()
+
+    def wait(self, timeout: float):
+        with self._changed:
+            self._changed.wait(timeout)
+
+    def span(self, job_id: str, kind: str):
+        times = self.jobs[job_id][kind]
+        return (min(times), max(times)) if times else (None, None)
+
+
+def summarize(values: list) -> dict:
+    return {
+        "p50": round(percentile(values, 50), 2),
+        "p90": round(percentile(values, 90), 2),
+        "p95": round(percentile(values, 95), 2),
+        "p99": round(percentile(values, 99), 2),
+        "max": round(max(values), 2) if values else 0.0
+    }
+
+
+def stage_report(jobs: dict, timeline: Timeline) -> dict:
+    """
+    Per stage: wall-clock percentiles per job, and aggregate throughput
+    (audio seconds and chunks per wall second) over the whole run
+      chunking:      submit -> last audio object (fog node done)
+      transcription: first audio object -> last .tcb chunk result
+      merge:         last .tcb -> transcription.json
+    """
+    stages = {"chunking": [], "transcription": [], "merge": []}
+    bounds = {name: [math.inf, 0.0] for name in stages}
+    audio = chunks = 0
+
+    for job_id, job in jobs.items():
+        if job_id not in timeline.done:
+            continue
+        first_audio, last_audio = timeline.span(job_id, "audio")
+        _, last_tcb = timeline.span(job_id, "tcb")
+        if first_audio is None or last_tcb is None:
+            continue
+        spans = {
+            "chunking": (job["submitted"], last_audio),
+            "transcription": (first_audio, last_tcb),
+            "merge": (last_tcb, timeline.done[job_id])
+        }
+        for name, (start, end) in spans.items():
+            stages[name].append(end - start)
+            bounds[name][0] = min(bounds[name][0], start)
+            bounds[name][1] = max(bounds[name][1], end)
+        audio += job["seconds"]
+        chunks += len(timeline.jobs[job_id]["tcb"])
+
+    report = {}
+    for name, values in stages.items():
+        wall = bounds[name][1] - bounds[name][0] if values else 0
+        report[name] = dict(
+            summarize(values),
+            audio_seconds_per_second=round(audio / wall, 1) if wall > 0 else 0,
+            chunks_per_second=round(chunks / wall, 2) if wall > 0 else 0
+        )
+    return report
+
+
+# =========================
+# RUN
+# =========================
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Offline end-to-end load test of the transcription pipeline")
+    parser.add_argument("--jobs", type=int, default=4, help="concurrent jobs to submit")
+    parser.add_argument("--durations", type=int, nargs="+", default=[120],
+                        help="audio lengths in seconds, cycled across jobs")
+    parser.add_argument("--submit-interval", type=float, default=0.0,
+                        help="seconds between submissions (0 = all at once)")
+    parser.add_argument("--timeout", type=float, default=900, help="seconds to wait for all jobs")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--whisper-rtf", type=float, default=0.05,
+                        help="stub model: inference seconds per audio second")
+    parser.add_argument("--whisper-model", help="run the real whisper model (must be cached locally)")
+    parser.add_argument("--max-concurrent-jobs", type=int, default=2, help="fog node MAX_CONCURRENT_JOBS")
+    parser.add_argument("--chunk-packing", choices=["objects", "pack"], default="objects")
+    parser.add_argument("--lambda-concurrency", type=int, default=10)
+    parser.add_argument("--hedge-interval", type=float, default=60,
+                        help="seconds between straggler hedging runs (0 = off)")
+    parser.add_argument("--work-dir", help="keep audio and service logs here")
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--max-p95", type=float, help="fail if end-to-end p95 exceeds this many seconds")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    work_dir = Path(args.work_dir or tempfile.mkdtemp(prefix="loadtest-"))
+    audio_dir = work_dir / "audio"
+    audio_dir.mkdir(parents=True, exist_ok=True)
+    processes = []
+    ok = False
+
+    print(f"Work dir: {work_dir}")
+    for seconds in sorted(set(args.durations)):
+        path = audio_dir / f"{seconds}s.wav"
+        if not path.exists():
+            print(f"Generating {seconds}s of synthetic speech...")
+            write_speech_wav(path, seconds, args.seed + seconds)
+
+    audio_server = ThreadingHTTPServer(('127.0.0.1', 0), AudioHandler)
+    audio_server.daemon_threads = True
+    audio_server.audio_dir = str(audio_dir)
+    threading.Thread(target=audio_server.serve_forever, daemon=True).start()
+
+    try:
+        # S3 / DynamoDB / SQS stand-in
+        moto_port = free_port()
+        moto = start_process(
+            [sys.executable, "-m", "moto.server", "-H", "127.0.0.1", "-p", str(moto_port)],
+            REPO, dict(os.environ), work_dir / "moto.log")
+        processes.append(moto)
+        wait_http("127.0.0.1", moto_port, "/moto-api/", 60, moto)
+
+        counter = RequestCounter()
+        timeline = Timeline()
+        functions = {}
+
+        def on_object_created(bucket: str, key: str, size: int):
+            parts = key.split('/')
+            if len(parts) < 3:
+                return
+            if bucket == PROCESSED_BUCKET and parts[0] == "audio":
+                if parts[2] == "chunks" or key.endswith(".index.json"):
+                    timeline.record(parts[1], "audio")
+                functions["trigger"].submit(s3_event(bucket, key, size))
+            elif bucket == TRANSCRIPTIONS_BUCKET and parts[0] == "transcriptions":
+                if key.endswith(".tcb"):
+                    timeline.record(parts[1], "tcb")
+                    functions["post_processor"].submit(s3_event(bucket, key, size))
+                elif key.endswith("transcription.json"):
+                    timeline.record(parts[1], "result")
+
+        proxy = AwsProxy(moto_port, counter, on_object_created)
+        threading.Thread(target=proxy.serve_forever, daemon=True).start()
+        queue_url = create_resources(f"http://127.0.0.1:{moto_port}")
+
+        env = dict(
+            os.environ,
+            AWS_ACCESS_KEY_ID="loadtest",
+            AWS_SECRET_ACCESS_KEY="loadtest",
+            AWS_DEFAULT_REGION=REGION,
+            AWS_ENDPOINT_URL=proxy.url,
+            AWS_EC2_METADATA_DISABLED="true",
+            PROCESSED_AUDIO_BUCKET=PROCESSED_BUCKET,
+            TRANSCRIPTION_BUCKET=TRANSCRIPTIONS_BUCKET,
+            TRANSCRIPTIONS_BUCKET=TRANSCRIPTIONS_BUCKET,
+            JOBS_TABLE=JOBS_TABLE,
+            TRANSCRIPTIONS_TABLE=TRANSCRIPTIONS_TABLE,
+            CHUNKS_TABLE=CHUNKS_TABLE,
+            JOBS_QUEUE_URL=queue_url,
+            FOG_NODES_DNS=FOG_HOST,
+            WHISPER_SERVICE_DNS=WHISPER_HOST,
+            MAX_CONCURRENT_JOBS=str(args.max_concurrent_jobs),
+            CHUNK_PACKING=args.chunk_packing,
+        )
+        env.pop("AWS_PROFILE", None)
+
+        # Shared chunk codec, copied in as the image build does
+        shutil.copy(REPO / "lambda" / "common" / "chunk_format.py",
+                    REPO / "docker" / "whisper-service" / "src")
+
+        # Whisper first: the fog node starts pulling jobs as soon as it is up
+        if args.whisper_model:
+            whisper_argv = [sys.executable, "-m", "uvicorn", "src.main:app",
+                            "--host", WHISPER_HOST, "--port", str(SERVICE_PORT), "--log-level", "warning"]
+            whisper_env = dict(env, WHISPER_MODEL=args.whisper_model)
+        else:
+            whisper_argv = [sys.executable, str(HERE / "whisper_stub.py"),
+                            "--host", WHISPER_HOST, "--port", str(SERVICE_PORT),
+                            "--rtf", str(args.whisper_rtf)]
+            whisper_env = env
+        whisper = start_process(whisper_argv, REPO / "docker" / "whisper-service",
+                                whisper_env, work_dir / "whisper.log")
+        processes.append(whisper)
+        fog = start_process(
+            [sys.executable, "-m", "uvicorn", "src.main:app",
+             "--host", FOG_HOST, "--port", str(SERVICE_PORT), "--log-level", "warning"],
+            REPO / "docker" / "fog-node", env, work_dir / "fog.log")
+        processes.append(fog)
+        wait_http(WHISPER_HOST, SERVICE_PORT, "/", 600 if args.whisper_model else 60, whisper)
+        wait_http(FOG_HOST, SERVICE_PORT, "/", 60, fog)
+
+        # The Lambdas read their configuration at import time
+        os.environ.update(env)
+        url_processor = load_lambda("url_processor")
+        functions["trigger"] = LambdaStandIn(
+            "trigger", load_lambda("trigger_transcription").handler, args.lambda_concurrency,
+            batch_size=TRIGGER_BATCH_SIZE, batch_window=TRIGGER_BATCH_WINDOW)
+        functions["post_processor"] = LambdaStandIn(
+            "post_processor", load_lambda("post_processor").handler, args.lambda_concurrency)
+        functions["url_processor"] = LambdaStandIn(
+            "url_processor", url_processor.handler, args.lambda_concurrency)
+
+        # Submit
+        jobs = {}
+        started = time.time()
+        for n in range(args.jobs):
+            seconds = args.durations[n % len(args.durations)]
+            url = f"http://127.0.0.1:{audio_server.server_address[1]}/job{n:03d}/{seconds}s.wav"
+            response = functions["url_processor"].invoke({
+                "body": json.dumps({"url": url, "userId": "loadtest", "modelSize": "tiny"}),
+                "headers": {}
+            })
+            body = json.loads(response["body"])
+            if response["statusCode"] != 200:
+                raise RuntimeError(f"Submission rejected: {body}")
+            jobs[body["jobId"]] = {"submitted": time.time(), "seconds": seconds, "url": url}
+            if args.submit_interval:
+                time.sleep(args.submit_interval)
+        print(f"Submitted {len(jobs)} jobs ({sum(j['seconds'] for j in jobs.values())}s of audio)")
+
+        # Wait for transcription.json of every job, watching for failures
+        # (monitoring reads go straight to moto, so they are not counted)
+        monitor = boto3.resource("dynamodb", endpoint_url=f"http://127.0.0.1:{moto_port}",
+                                 region_name=REGION).Table(JOBS_TABLE)
+        failed = {}
+        next_hedge = time.time() + args.hedge_interval
+        next_poll = 0
+        while time.time() - started < args.timeout:
+            pending = [j for j in jobs if j not in timeline.done and j not in failed]
+            if not pending:
+                break
+            if time.time() >= next_poll:
+                for job_id in pending:
+                    item = monitor.get_item(Key={"jobId": job_id}).get("Item", {})
+                    if item.get("status") == "failed":
+                        failed[job_id] = item.get("message", "failed")
+                        print(f"Job {job_id} failed: {failed[job_id]}")
+                next_poll = time.time() + 2
+            if args.hedge_interval and time.time() >= next_hedge:
+                functions["trigger"].invoke({"source": "aws.events"})
+                next_hedge = time.time() + args.hedge_interval
+            timeline.wait(1.0)
+            print(f"\r{len(timeline.done)}/{len(jobs)} jobs done, {len(failed)} failed", end="", flush=True)
+        print()
+        elapsed = time.time() - started
+
+        latencies = [timeline.done[j] - jobs[j]["submitted"] for j in jobs if j in timeline.done]
+        records = {j: monitor.get_item(Key={"jobId": j}).get("Item", {}) for j in jobs}
+        per_job_rss = [float(r["peakRssPerJobMb"]) for r in records.values() if "peakRssPerJobMb" in r]
+
+        report = {
+            "config": {k: v for k, v in vars(args).items() if k not in ("work_dir", "output")},
+            "elapsed_seconds": round(elapsed, 1),
+            "jobs": {
+                "submitted": len(jobs),
+                "completed": len(latencies),
+                "failed": len(failed),
+                "timed_out": len(jobs) - len(latencies) - len(failed),
+                "audio_seconds": sum(j["seconds"] for j in jobs.values())
+            },
+            "end_to_end_seconds": summarize(latencies),
+            "realtime_factor_p50": round(percentile(
+                [(timeline.done[j] - jobs[j]["submitted"]) / jobs[j]["seconds"]
+                 for j in jobs if j in timeline.done], 50), 3),
+            "stages": stage_report(jobs, timeline),
+            "aws_requests": counter.by_service(),
+            "lambdas": {name: fn.summary() for name, fn in functions.items()},
+            "peak_memory_mb": {
+                "fog_node": peak_rss_mb(fog.pid),
+                "whisper_service": peak_rss_mb(whisper.pid),
+                "lambdas_and_harness": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+                "fog_per_job_p95": round(percentile(per_job_rss, 95), 1)
+            },
+            "failures": failed
+        }
+
+        print(json.dumps(report, indent=2, default=str))
+        if args.output:
+            Path(args.output).write_text(json.dumps(report, indent=2, default=str))
+
+        ok = len(latencies) == len(jobs)
+        if args.max_p95 is not None and report["end_to_end_seconds"]["p95"] > args.max_p95:
+            print(f"End-to-end p95 {report['end_to_end_seconds']['p95']}s exceeds {args.max_p95}s")
+            ok = False
+        for fn in functions.values():
+            fn.stop()
+
+    finally:
+        for process in reversed(processes):
+            stop_process(process)
+        audio_server.shutdown()
+        if ok and not args.work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+        elif not ok:
+            print(f"Service logs kept in {work_dir}")
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Whisper Stub
+Arranca el whisper-service real (HTTP, scheduler, S3, DynamoDB) con un modelo
+falso en lugar de openai-whisper/torch: tarda `--rtf` x la duracion del audio
+y devuelve segmentos sinteticos. Lo usa load_test.py para correr sin GPU ni red.
+"""
+import argparse
+import array
+import os
+import sys
+import time
+import types
+import wave
+
+SAMPLE_RATE = 16000
+SEGMENT_SECONDS = 5.0
+
+
+def load_audio(path: str, sr: int = SAMPLE_RATE) -> array.array:
+    """16-bit PCM samples of a WAV chunk (the fog node already resamples to 16 kHz mono)"""
+    with wave.open(path, 'rb') as wav:
+        samples = array.array('h')
+        samples.frombytes(wav.readframes(wav.getnframes()))
+    return samples
+
+
+class StubModel:
+    """Stands in for whisper.Whisper: same transcribe() result shape"""
+
+    def __init__(self, rtf: float):
+        self.rtf = rtf
+
+    def transcribe(self, audio, language=None, task=None, verbose=None, **kwargs):
+        duration = len(audio) / SAMPLE_RATE
+        time.sleep(duration * self.rtf)
+
+        segments = []
+        start = 0.0
+        while start < duration:
+            end = min(duration, start + SEGMENT_SECONDS)
+            segments.append({
+                "id": len(segments),
+                "start": start,
+                "end": end,
+                "text": f" synthetic segment {len(segments)}.",
+                "tokens": list(range(8)),
+                "avg_logprob": -0.25
+            })
+            start = end
+
+        return {
+            "text": "".join(s["text"] for s in segments),
+            "segments": segments,
+            "language": language or "en"
+        }
+
+
+def install(rtf: float):
+    """Register the fake `whisper` module before src.main imports it"""
+    module = types.ModuleType("whisper")
+    module.load_model = lambda name, **kwargs: StubModel(rtf)
+    module.load_audio = load_audio
+    module.audio = types.SimpleNamespace(SAMPLE_RATE=SAMPLE_RATE)
+    sys.modules["whisper"] = module
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--rtf", type=float, default=0.05,
+                        help="seconds of 'inference' per second of audio")
+    args = parser.parse_args()
+
+    install(args.rtf)
+
+    # Run from docker/whisper-service so `src.main` resolves like in the image
+    sys.path.insert(0, os.getcwd())
+    import uvicorn
+    uvicorn.run("src.main:app", host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
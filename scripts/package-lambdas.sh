@@ -1,19 +1,52 @@
 #!/bin/bash
+# Builds lambda/dist/<func>.zip from a clean staging directory: the handler,
+# the shared modules in lambda/common and only the requirements the Lambda
+# runtime does not already ship. boto3 & co. come from the runtime, which
+# has them precompiled; a vendored copy is compiled again on every cold start.
+set -e
 
 echo "📦 Packaging Lambda functions..."
 
+FUNCTIONS="url_processor query_handler post_processor trigger_transcription job_notifier"
+# Included in the python3.11 runtime: never packaged
+RUNTIME_PROVIDED="boto3|botocore|s3transfer|jmespath|python-dateutil|six|urllib3"
+RUNTIME_PYTHON="3.11"
+BUILD_DIR=lambda/build
+
 mkdir -p lambda/dist
 
-for func in query_handler; do
+for func in $FUNCTIONS; do
     echo "Packaging $func..."
-    cd lambda/$func
+    stage=$BUILD_DIR/$func
+    rm -rf $stage
+    mkdir -p $stage
+
+    cp lambda/$func/*.py $stage/
+    # Shared modules (chunk result format, AWS clients, ...)
+    cp lambda/common/*.py $stage/
+
+    if [ -f lambda/$func/requirements.txt ]; then
+        grep -vE "^\s*(#|$)" lambda/$func/requirements.txt \
+            | grep -viE "^\s*($RUNTIME_PROVIDED)\b" > $BUILD_DIR/$func.requirements.txt || true
+        if [ -s $BUILD_DIR/$func.requirements.txt ]; then
+            pip install -q -r $BUILD_DIR/$func.requirements.txt -t $stage \
+                --platform manylinux2014_x86_64 --implementation cp \
+                --python-version $RUNTIME_PYTHON --only-binary=:all:
+        fi
+    fi
+
+    # Nothing the handler imports at runtime
+    find $stage -depth -type d \( -name "__pycache__" -o -name "tests" -o -name "bin" \) -exec rm -rf {} +
 
-    if [ -f requirements.txt ]; then
-        pip install -r requirements.txt -t .
+    # Ship bytecode when this interpreter matches the runtime. Hash based,
+    # so it stays valid whatever mtimes the zip extraction leaves.
+    if [ "$(python3 -c 'import sys; print("%d.%d" % sys.version_info[:2])')" = "$RUNTIME_PYTHON" ]; then
+        python3 -m compileall -q --invalidation-mode unchecked-hash $stage
     fi
 
-    zip -r ../dist/${func}.zip . -x "*.pyc" "*__pycache__*"
-    cd ../..
+    rm -f lambda/dist/${func}.zip
+    (cd $stage && zip -q -r -9 -X ../../dist/${func}.zip .)
+    echo "   $(du -h lambda/dist/${func}.zip | cut -f1)"
 done
 
 echo "✅ Lambda functions packaged"
@@ -68,6 +68,12 @@ module "fog_nodes" {
   processed_bucket_arn     = module.storage.s3_bucket_arns.processed
   jobs_table_name          = module.storage.dynamodb_tables.jobs
   jobs_table_arn           = module.storage.dynamodb_table_arns.jobs
+  jobs_queue_url           = module.storage.jobs_queue_url
+  jobs_queue_arn           = module.storage.jobs_queue_arn
+  batches_table_name       = module.storage.dynamodb_tables.batches
+  batches_table_arn        = module.storage.dynamodb_table_arns.batches
+  chunks_table_name        = module.storage.dynamodb_tables.chunks
+  chunks_table_arn         = module.storage.dynamodb_table_arns.chunks
   fog_node_count           = var.fog_node_count
   tags                     = local.common_tags
 }
@@ -81,9 +87,26 @@ module "lambda" {
   jobs_table_arn            = module.storage.dynamodb_table_arns.jobs
   transcriptions_table_name = module.storage.dynamodb_tables.transcriptions
   transcriptions_table_arn  = module.storage.dynamodb_table_arns.transcriptions
+  chunks_table_name         = module.storage.dynamodb_tables.chunks
+  chunks_table_arn          = module.storage.dynamodb_table_arns.chunks
+  batches_table_name        = module.storage.dynamodb_tables.batches
+  batches_table_arn         = module.storage.dynamodb_table_arns.batches
+  connections_table_name    = module.storage.dynamodb_tables.connections
+  connections_table_arn     = module.storage.dynamodb_table_arns.connections
+  search_table_name         = module.storage.dynamodb_tables.search
+  search_table_arn          = module.storage.dynamodb_table_arns.search
+  idempotency_table_name    = module.storage.dynamodb_tables.idempotency
+  idempotency_table_arn     = module.storage.dynamodb_table_arns.idempotency
+  rate_limits_table_name    = module.storage.dynamodb_tables.rate_limits
+  rate_limits_table_arn     = module.storage.dynamodb_table_arns.rate_limits
+  throughput_table_name     = module.storage.dynamodb_tables.throughput
+  throughput_table_arn      = module.storage.dynamodb_table_arns.throughput
+  jobs_stream_arn           = module.storage.jobs_stream_arn
   transcriptions_bucket_name = module.storage.s3_buckets.transcriptions
   transcriptions_bucket_arn = module.storage.s3_bucket_arns.transcriptions
   fog_nodes_dns             = module.fog_nodes.service_discovery_dns
+  jobs_queue_url            = module.storage.jobs_queue_url
+  jobs_queue_arn            = module.storage.jobs_queue_arn
   ecs_cluster_name          = module.fog_nodes.cluster_name
   ecs_service_name          = module.fog_nodes.service_name
   private_subnet_ids        = module.networking.private_subnet_ids
@@ -91,6 +114,9 @@ module "lambda" {
 
   whisper_service_dns  = module.whisper_service.service_discovery_dns
   processed_bucket_arn = module.storage.s3_bucket_arns.processed
+  priority_tiers       = var.priority_tiers
+  rate_limits          = var.rate_limits
+  whisper_task_count   = var.whisper_service_count
 
   tags = local.common_tags
 }
@@ -117,17 +143,41 @@ module "whisper_service" {
   jobs_table_arn            = module.storage.dynamodb_table_arns.jobs
   transcriptions_table_name = module.storage.dynamodb_tables.transcriptions
   transcriptions_table_arn  = module.storage.dynamodb_table_arns.transcriptions
+  chunks_table_name         = module.storage.dynamodb_tables.chunks
+  chunks_table_arn          = module.storage.dynamodb_table_arns.chunks
+  tier_weights              = var.tier_weights
+  service_count             = var.whisper_service_count
+}
+
+# Direct streaming: fog nodes push chunks to the whisper service
+resource "aws_security_group_rule" "whisper_from_fog_nodes" {
+  type                     = "ingress"
+  from_port                = 8080
+  to_port                  = 8080
+  protocol                 = "tcp"
+  security_group_id        = module.networking.ecs_tasks_security_group_id
+  source_security_group_id = module.fog_nodes.fog_nodes_security_group_id
+  description              = "From Fog Nodes"
 }
 
 # S3 Notification (Root to avoid circular dependency)
 resource "aws_s3_bucket_notification" "processed_audio_trigger" {
   bucket = module.storage.s3_buckets.processed
 
-  lambda_function {
-    lambda_function_arn = module.lambda.trigger_transcription_function_arn
-    events              = ["s3:ObjectCreated:*"]
-    filter_prefix       = "audio/"
-    filter_suffix       = ".wav"
+  # Events are batched in SQS and consumed by trigger_transcription
+  queue {
+    queue_arn     = module.lambda.chunk_events_queue_arn
+    events        = ["s3:ObjectCreated:*"]
+    filter_prefix = "audio/"
+    filter_suffix = ".wav"
+  }
+
+  # Chunk pack mode: one event per sealed pack index
+  queue {
+    queue_arn     = module.lambda.chunk_events_queue_arn
+    events        = ["s3:ObjectCreated:*"]
+    filter_prefix = "audio/"
+    filter_suffix = ".index.json"
   }
 
   depends_on = [module.lambda] # Explicit dependency
@@ -142,9 +192,27 @@ module "api_gateway" {
   url_processor_invoke_arn    = module.lambda.url_processor_invoke_arn
   query_handler_function_name = module.lambda.query_handler_function_name
   query_handler_invoke_arn    = module.lambda.query_handler_invoke_arn
+  job_notifier_function_name  = module.lambda.job_notifier_function_name
+  job_notifier_invoke_arn     = module.lambda.job_notifier_invoke_arn
   tags                        = local.common_tags
 }
 
+# WebSocket pushes (Root to avoid circular dependency: the API needs the
+# notifier Lambda, the notifier's role needs the API)
+resource "aws_iam_role_policy" "lambda_websocket" {
+  name = "websocket-manage-connections"
+  role = module.lambda.lambda_role_id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [{
+      Effect   = "Allow"
+      Action   = ["execute-api:ManageConnections"]
+      Resource = ["${module.api_gateway.websocket_execution_arn}/*/POST/@connections/*"]
+    }]
+  })
+}
+
 # Outputs
 output "account_id" {
   description = "AWS Account ID"
@@ -196,6 +264,11 @@ output "api_gateway_url" {
   value       = module.api_gateway.api_endpoint
 }
 
+output "websocket_url" {
+  description = "WebSocket URL for job status pushes (frontend CONFIG.WS_URL)"
+  value       = module.api_gateway.websocket_url
+}
+
 output "web_bucket_name" {
   description = "Web bucket name"
   value       = module.storage.web_bucket_name
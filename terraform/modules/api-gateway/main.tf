@@ -36,6 +36,23 @@ resource "aws_api_gateway_integration" "post_jobs" {
   uri                     = var.url_processor_invoke_arn
 }
 
+# GET /jobs (listing by status or user, paginated)
+resource "aws_api_gateway_method" "get_jobs" {
+  rest_api_id   = aws_api_gateway_rest_api.main.id
+  resource_id   = aws_api_gateway_resource.jobs.id
+  http_method   = "GET"
+  authorization = "NONE"
+}
+
+resource "aws_api_gateway_integration" "get_jobs" {
+  rest_api_id             = aws_api_gateway_rest_api.main.id
+  resource_id             = aws_api_gateway_resource.jobs.id
+  http_method             = aws_api_gateway_method.get_jobs.http_method
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = var.query_handler_invoke_arn
+}
+
 # OPTIONS /jobs (CORS)
 resource "aws_api_gateway_method" "options_jobs" {
   rest_api_id   = aws_api_gateway_rest_api.main.id
@@ -75,7 +92,7 @@ resource "aws_api_gateway_integration_response" "options_jobs" {
   status_code = "200"
 
   response_parameters = {
-    "method.response.header.Access-Control-Allow-Headers" = "'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token'"
+    "method.response.header.Access-Control-Allow-Headers" = "'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token,Idempotency-Key'"
     "method.response.header.Access-Control-Allow-Methods" = "'GET,OPTIONS,POST,PUT,DELETE'"
     "method.response.header.Access-Control-Allow-Origin"  = "'*'"
   }
@@ -111,6 +128,312 @@ resource "aws_api_gateway_integration" "get_job" {
   uri                     = var.query_handler_invoke_arn
 }
 
+# GET /jobs/{jobId}/segments (transcript time window)
+resource "aws_api_gateway_resource" "job_segments" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  parent_id   = aws_api_gateway_resource.job_id.id
+  path_part   = "segments"
+}
+
+resource "aws_api_gateway_method" "get_job_segments" {
+  rest_api_id   = aws_api_gateway_rest_api.main.id
+  resource_id   = aws_api_gateway_resource.job_segments.id
+  http_method   = "GET"
+  authorization = "NONE"
+
+  request_parameters = {
+    "method.request.path.jobId" = true
+  }
+}
+
+resource "aws_api_gateway_integration" "get_job_segments" {
+  rest_api_id             = aws_api_gateway_rest_api.main.id
+  resource_id             = aws_api_gateway_resource.job_segments.id
+  http_method             = aws_api_gateway_method.get_job_segments.http_method
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = var.query_handler_invoke_arn
+}
+
+# OPTIONS /jobs/{jobId} (CORS: pollers send If-None-Match and read ETag)
+resource "aws_api_gateway_method" "options_job" {
+  rest_api_id   = aws_api_gateway_rest_api.main.id
+  resource_id   = aws_api_gateway_resource.job_id.id
+  http_method   = "OPTIONS"
+  authorization = "NONE"
+}
+
+resource "aws_api_gateway_integration" "options_job" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.job_id.id
+  http_method = aws_api_gateway_method.options_job.http_method
+  type        = "MOCK"
+
+  request_templates = {
+    "application/json" = "{\"statusCode\": 200}"
+  }
+}
+
+resource "aws_api_gateway_method_response" "options_job" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.job_id.id
+  http_method = aws_api_gateway_method.options_job.http_method
+  status_code = "200"
+
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = true
+    "method.response.header.Access-Control-Allow-Methods" = true
+    "method.response.header.Access-Control-Allow-Origin"  = true
+  }
+}
+
+resource "aws_api_gateway_integration_response" "options_job" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.job_id.id
+  http_method = aws_api_gateway_method.options_job.http_method
+  status_code = "200"
+
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = "'Content-Type,If-None-Match,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token'"
+    "method.response.header.Access-Control-Allow-Methods" = "'GET,OPTIONS'"
+    "method.response.header.Access-Control-Allow-Origin"  = "'*'"
+  }
+
+  depends_on = [aws_api_gateway_integration.options_job]
+}
+
+# /jobs/status resource: status of many jobs in one call
+resource "aws_api_gateway_resource" "jobs_status" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  parent_id   = aws_api_gateway_resource.jobs.id
+  path_part   = "status"
+}
+
+# POST /jobs/status
+resource "aws_api_gateway_method" "post_jobs_status" {
+  rest_api_id   = aws_api_gateway_rest_api.main.id
+  resource_id   = aws_api_gateway_resource.jobs_status.id
+  http_method   = "POST"
+  authorization = "NONE"
+}
+
+resource "aws_api_gateway_integration" "post_jobs_status" {
+  rest_api_id             = aws_api_gateway_rest_api.main.id
+  resource_id             = aws_api_gateway_resource.jobs_status.id
+  http_method             = aws_api_gateway_method.post_jobs_status.http_method
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = var.query_handler_invoke_arn
+}
+
+# OPTIONS /jobs/status (CORS)
+resource "aws_api_gateway_method" "options_jobs_status" {
+  rest_api_id   = aws_api_gateway_rest_api.main.id
+  resource_id   = aws_api_gateway_resource.jobs_status.id
+  http_method   = "OPTIONS"
+  authorization = "NONE"
+}
+
+resource "aws_api_gateway_integration" "options_jobs_status" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.jobs_status.id
+  http_method = aws_api_gateway_method.options_jobs_status.http_method
+  type        = "MOCK"
+
+  request_templates = {
+    "application/json" = "{\"statusCode\": 200}"
+  }
+}
+
+resource "aws_api_gateway_method_response" "options_jobs_status" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.jobs_status.id
+  http_method = aws_api_gateway_method.options_jobs_status.http_method
+  status_code = "200"
+
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = true
+    "method.response.header.Access-Control-Allow-Methods" = true
+    "method.response.header.Access-Control-Allow-Origin"  = true
+  }
+}
+
+resource "aws_api_gateway_integration_response" "options_jobs_status" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.jobs_status.id
+  http_method = aws_api_gateway_method.options_jobs_status.http_method
+  status_code = "200"
+
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = "'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token'"
+    "method.response.header.Access-Control-Allow-Methods" = "'OPTIONS,POST'"
+    "method.response.header.Access-Control-Allow-Origin"  = "'*'"
+  }
+
+  depends_on = [aws_api_gateway_integration.options_jobs_status]
+}
+
+# /batches resource (bulk submissions)
+resource "aws_api_gateway_resource" "batches" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  parent_id   = aws_api_gateway_rest_api.main.root_resource_id
+  path_part   = "batches"
+}
+
+# POST /batches
+resource "aws_api_gateway_method" "post_batches" {
+  rest_api_id   = aws_api_gateway_rest_api.main.id
+  resource_id   = aws_api_gateway_resource.batches.id
+  http_method   = "POST"
+  authorization = "NONE"
+}
+
+resource "aws_api_gateway_integration" "post_batches" {
+  rest_api_id             = aws_api_gateway_rest_api.main.id
+  resource_id             = aws_api_gateway_resource.batches.id
+  http_method             = aws_api_gateway_method.post_batches.http_method
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = var.url_processor_invoke_arn
+}
+
+# OPTIONS /batches (CORS)
+resource "aws_api_gateway_method" "options_batches" {
+  rest_api_id   = aws_api_gateway_rest_api.main.id
+  resource_id   = aws_api_gateway_resource.batches.id
+  http_method   = "OPTIONS"
+  authorization = "NONE"
+}
+
+resource "aws_api_gateway_integration" "options_batches" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.batches.id
+  http_method = aws_api_gateway_method.options_batches.http_method
+  type        = "MOCK"
+
+  request_templates = {
+    "application/json" = "{\"statusCode\": 200}"
+  }
+}
+
+resource "aws_api_gateway_method_response" "options_batches" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.batches.id
+  http_method = aws_api_gateway_method.options_batches.http_method
+  status_code = "200"
+
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = true
+    "method.response.header.Access-Control-Allow-Methods" = true
+    "method.response.header.Access-Control-Allow-Origin"  = true
+  }
+}
+
+resource "aws_api_gateway_integration_response" "options_batches" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.batches.id
+  http_method = aws_api_gateway_method.options_batches.http_method
+  status_code = "200"
+
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = "'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token'"
+    "method.response.header.Access-Control-Allow-Methods" = "'GET,OPTIONS,POST'"
+    "method.response.header.Access-Control-Allow-Origin"  = "'*'"
+  }
+
+  depends_on = [aws_api_gateway_integration.options_batches]
+}
+
+# /batches/{batchId} resource
+resource "aws_api_gateway_resource" "batch_id" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  parent_id   = aws_api_gateway_resource.batches.id
+  path_part   = "{batchId}"
+}
+
+# GET /batches/{batchId}
+resource "aws_api_gateway_method" "get_batch" {
+  rest_api_id   = aws_api_gateway_rest_api.main.id
+  resource_id   = aws_api_gateway_resource.batch_id.id
+  http_method   = "GET"
+  authorization = "NONE"
+
+  request_parameters = {
+    "method.request.path.batchId" = true
+  }
+}
+
+resource "aws_api_gateway_integration" "get_batch" {
+  rest_api_id             = aws_api_gateway_rest_api.main.id
+  resource_id             = aws_api_gateway_resource.batch_id.id
+  http_method             = aws_api_gateway_method.get_batch.http_method
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = var.query_handler_invoke_arn
+}
+
+# GET /search (full-text search over completed transcripts)
+resource "aws_api_gateway_resource" "search" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  parent_id   = aws_api_gateway_rest_api.main.root_resource_id
+  path_part   = "search"
+}
+
+resource "aws_api_gateway_method" "get_search" {
+  rest_api_id   = aws_api_gateway_rest_api.main.id
+  resource_id   = aws_api_gateway_resource.search.id
+  http_method   = "GET"
+  authorization = "NONE"
+}
+
+resource "aws_api_gateway_integration" "get_search" {
+  rest_api_id             = aws_api_gateway_rest_api.main.id
+  resource_id             = aws_api_gateway_resource.search.id
+  http_method             = aws_api_gateway_method.get_search.http_method
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = var.query_handler_invoke_arn
+}
+
+# GET /users/{userId}/usage (submission rate limit and consumption)
+resource "aws_api_gateway_resource" "users" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  parent_id   = aws_api_gateway_rest_api.main.root_resource_id
+  path_part   = "users"
+}
+
+resource "aws_api_gateway_resource" "user_id" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  parent_id   = aws_api_gateway_resource.users.id
+  path_part   = "{userId}"
+}
+
+resource "aws_api_gateway_resource" "user_usage" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  parent_id   = aws_api_gateway_resource.user_id.id
+  path_part   = "usage"
+}
+
+resource "aws_api_gateway_method" "get_user_usage" {
+  rest_api_id   = aws_api_gateway_rest_api.main.id
+  resource_id   = aws_api_gateway_resource.user_usage.id
+  http_method   = "GET"
+  authorization = "NONE"
+
+  request_parameters = {
+    "method.request.path.userId" = true
+  }
+}
+
+resource "aws_api_gateway_integration" "get_user_usage" {
+  rest_api_id             = aws_api_gateway_rest_api.main.id
+  resource_id             = aws_api_gateway_resource.user_usage.id
+  http_method             = aws_api_gateway_method.get_user_usage.http_method
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = var.query_handler_invoke_arn
+}
+
 # Lambda Permissions
 resource "aws_lambda_permission" "url_processor" {
   statement_id  = "AllowAPIGatewayInvoke"
@@ -137,8 +460,29 @@ resource "aws_api_gateway_deployment" "main" {
       aws_api_gateway_resource.jobs.id,
       aws_api_gateway_method.post_jobs.id,
       aws_api_gateway_integration.post_jobs.id,
+      aws_api_gateway_method.get_jobs.id,
+      aws_api_gateway_integration.get_jobs.id,
       aws_api_gateway_method.get_job.id,
       aws_api_gateway_integration.get_job.id,
+      aws_api_gateway_integration.options_job.id,
+      aws_api_gateway_resource.job_segments.id,
+      aws_api_gateway_method.get_job_segments.id,
+      aws_api_gateway_integration.get_job_segments.id,
+      aws_api_gateway_resource.jobs_status.id,
+      aws_api_gateway_method.post_jobs_status.id,
+      aws_api_gateway_integration.post_jobs_status.id,
+      aws_api_gateway_integration.options_jobs_status.id,
+      aws_api_gateway_resource.batches.id,
+      aws_api_gateway_method.post_batches.id,
+      aws_api_gateway_integration.post_batches.id,
+      aws_api_gateway_method.get_batch.id,
+      aws_api_gateway_integration.get_batch.id,
+      aws_api_gateway_resource.search.id,
+      aws_api_gateway_method.get_search.id,
+      aws_api_gateway_integration.get_search.id,
+      aws_api_gateway_resource.user_usage.id,
+      aws_api_gateway_method.get_user_usage.id,
+      aws_api_gateway_integration.get_user_usage.id,
     ]))
   }
 
@@ -156,6 +500,47 @@ resource "aws_api_gateway_stage" "prod" {
   tags = var.tags
 }
 
+# WebSocket API: pushes job status changes instead of clients polling
+resource "aws_apigatewayv2_api" "websocket" {
+  name                       = "${var.project_name}-ws"
+  protocol_type              = "WEBSOCKET"
+  route_selection_expression = "$request.body.action"
+
+  tags = var.tags
+}
+
+resource "aws_apigatewayv2_integration" "job_notifier" {
+  api_id             = aws_apigatewayv2_api.websocket.id
+  integration_type   = "AWS_PROXY"
+  integration_uri    = var.job_notifier_invoke_arn
+  integration_method = "POST"
+}
+
+# $connect (?jobId=...), $disconnect, and $default for subscribe/ping messages
+resource "aws_apigatewayv2_route" "websocket" {
+  for_each = toset(["$connect", "$disconnect", "$default"])
+
+  api_id    = aws_apigatewayv2_api.websocket.id
+  route_key = each.value
+  target    = "integrations/${aws_apigatewayv2_integration.job_notifier.id}"
+}
+
+resource "aws_apigatewayv2_stage" "websocket" {
+  api_id      = aws_apigatewayv2_api.websocket.id
+  name        = "prod"
+  auto_deploy = true
+
+  tags = var.tags
+}
+
+resource "aws_lambda_permission" "job_notifier" {
+  statement_id  = "AllowWebSocketInvoke"
+  action        = "lambda:InvokeFunction"
+  function_name = var.job_notifier_function_name
+  principal     = "apigateway.amazonaws.com"
+  source_arn    = "${aws_apigatewayv2_api.websocket.execution_arn}/*/*"
+}
+
 # Variables
 variable "project_name" {
   type = string
@@ -177,6 +562,14 @@ variable "query_handler_invoke_arn" {
   type = string
 }
 
+variable "job_notifier_function_name" {
+  type = string
+}
+
+variable "job_notifier_invoke_arn" {
+  type = string
+}
+
 variable "tags" {
   type = map(string)
 }
@@ -193,3 +586,11 @@ output "api_endpoint" {
 output "api_execution_arn" {
   value = aws_api_gateway_rest_api.main.execution_arn
 }
+
+output "websocket_url" {
+  value = aws_apigatewayv2_stage.websocket.invoke_url
+}
+
+output "websocket_execution_arn" {
+  value = aws_apigatewayv2_api.websocket.execution_arn
+}
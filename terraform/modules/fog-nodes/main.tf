@@ -115,6 +115,7 @@ resource "aws_iam_role_policy" "ecs_task_s3" {
         "s3:GetObject",
         "s3:PutObject",
         "s3:DeleteObject",
+        "s3:AbortMultipartUpload",
         "s3:ListBucket"
       ]
       Resource = [
@@ -125,6 +126,28 @@ resource "aws_iam_role_policy" "ecs_task_s3" {
   })
 }
 
+resource "aws_iam_role_policy" "ecs_task_sqs" {
+  name = "sqs-access"
+  role = aws_iam_role.ecs_task.id
+  
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [{
+      Effect = "Allow"
+      Action = [
+        "sqs:ReceiveMessage",
+        "sqs:DeleteMessage",
+        "sqs:ChangeMessageVisibility",
+        "sqs:SendMessage",
+        "sqs:GetQueueAttributes"
+      ]
+      Resource = [
+        var.jobs_queue_arn
+      ]
+    }]
+  })
+}
+
 resource "aws_iam_role_policy" "ecs_task_dynamodb" {
   name = "dynamodb-access"
   role = aws_iam_role.ecs_task.id
@@ -140,7 +163,10 @@ resource "aws_iam_role_policy" "ecs_task_dynamodb" {
         "dynamodb:Query"
       ]
       Resource = [
-        var.jobs_table_arn
+        var.jobs_table_arn,
+        "${var.jobs_table_arn}/index/*", # StatusIndex, stalled-job sweeper
+        var.batches_table_arn,
+        var.chunks_table_arn # ledger entries of directly streamed chunks
       ]
     }]
   })
@@ -200,6 +226,39 @@ resource "aws_ecs_task_definition" "fog_node" {
         name  = "JOBS_TABLE"
         value = var.jobs_table_name
       },
+      {
+        name  = "CHUNK_PACKING"
+        value = var.chunk_packing
+      },
+      {
+        name  = "STREAM_MODE"
+        value = var.stream_mode
+      },
+      {
+        name  = "JOBS_QUEUE_URL"
+        value = var.jobs_queue_url
+      },
+      {
+        name  = "MAX_CONCURRENT_JOBS"
+        value = tostring(var.max_concurrent_jobs)
+      },
+      {
+        name  = "BATCHES_TABLE"
+        value = var.batches_table_name
+      },
+      {
+        name  = "CHUNKS_TABLE"
+        value = var.chunks_table_name
+      },
+      {
+        name  = "BATCH_SEND_CONCURRENCY"
+        value = tostring(var.batch_send_concurrency)
+      },
+      {
+        # Same namespace as the fog nodes, see modules/whisper-service
+        name  = "WHISPER_SERVICE_DNS"
+        value = "whisper-service.${var.project_name}.local"
+      },
       {
         name  = "AWS_DEFAULT_REGION"
         value = var.aws_region
@@ -286,11 +345,59 @@ variable "jobs_table_arn" {
   type = string
 }
 
+variable "jobs_queue_url" {
+  type = string
+}
+
+variable "batches_table_name" {
+  type = string
+}
+
+variable "batches_table_arn" {
+  type = string
+}
+
+variable "chunks_table_name" {
+  type = string
+}
+
+variable "chunks_table_arn" {
+  type = string
+}
+
+variable "batch_send_concurrency" {
+  description = "SendMessageBatch calls in flight when enqueueing a batch's jobs (send rate, not a cap on running jobs)"
+  type        = number
+  default     = 4
+}
+
+variable "jobs_queue_arn" {
+  type = string
+}
+
+variable "max_concurrent_jobs" {
+  description = "Jobs a fog node pulls from the queue at once"
+  type        = number
+  default     = 2
+}
+
 variable "fog_node_count" {
   type    = number
   default = 1
 }
 
+variable "chunk_packing" {
+  description = "objects = one S3 object per chunk, pack = multipart chunk packs"
+  type        = string
+  default     = "objects"
+}
+
+variable "stream_mode" {
+  description = "s3 = chunks reach whisper via S3 events, direct = pushed to whisper with S3 as archive"
+  type        = string
+  default     = "s3"
+}
+
 variable "tags" {
   type = map(string)
 }
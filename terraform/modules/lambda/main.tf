@@ -35,21 +35,48 @@ resource "aws_iam_role_policy" "lambda_dynamodb" {
 
   policy = jsonencode({
     Version = "2012-10-17"
-    Statement = [{
-      Effect = "Allow"
-      Action = [
-        "dynamodb:GetItem",
-        "dynamodb:PutItem",
-        "dynamodb:UpdateItem",
-        "dynamodb:Query",
-        "dynamodb:Scan"
-      ]
-      Resource = [
-        var.jobs_table_arn,
-        var.transcriptions_table_arn,
-        "${var.jobs_table_arn}/index/*"
-      ]
-    }]
+    Statement = [
+      {
+        Effect = "Allow"
+        Action = [
+          "dynamodb:GetItem",
+          "dynamodb:BatchGetItem",
+          "dynamodb:BatchWriteItem",
+          "dynamodb:PutItem",
+          "dynamodb:UpdateItem",
+          "dynamodb:DeleteItem",
+          "dynamodb:Query",
+          "dynamodb:Scan"
+        ]
+        Resource = [
+          var.jobs_table_arn,
+          var.transcriptions_table_arn,
+          var.chunks_table_arn,
+          var.batches_table_arn,
+          var.connections_table_arn,
+          var.search_table_arn,
+          var.idempotency_table_arn,
+          var.rate_limits_table_arn,
+          var.throughput_table_arn,
+          "${var.jobs_table_arn}/index/*",
+          "${var.chunks_table_arn}/index/*",
+          "${var.connections_table_arn}/index/*"
+        ]
+      },
+      {
+        # Jobs table change stream feeds the WebSocket notifier
+        Effect = "Allow"
+        Action = [
+          "dynamodb:DescribeStream",
+          "dynamodb:GetRecords",
+          "dynamodb:GetShardIterator",
+          "dynamodb:ListStreams"
+        ]
+        Resource = [
+          var.jobs_stream_arn
+        ]
+      }
+    ]
   })
 }
 
@@ -72,6 +99,16 @@ resource "aws_iam_role_policy" "lambda_s3" {
           "${var.transcriptions_bucket_arn}/*"
         ]
       },
+      {
+        # Trigger reads chunk pack indexes
+        Effect = "Allow"
+        Action = [
+          "s3:GetObject"
+        ]
+        Resource = [
+          "${var.processed_bucket_arn}/*"
+        ]
+      },
       {
         Effect = "Allow"
         Action = [
@@ -88,6 +125,39 @@ resource "aws_iam_role_policy" "lambda_s3" {
 
 
 
+resource "aws_iam_role_policy" "lambda_sqs" {
+  name = "sqs-access"
+  role = aws_iam_role.lambda.id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect = "Allow"
+        # Queue depth feeds the ETA of new jobs
+        Action = [
+          "sqs:SendMessage",
+          "sqs:GetQueueAttributes"
+        ]
+        Resource = [
+          var.jobs_queue_arn
+        ]
+      },
+      {
+        Effect = "Allow"
+        Action = [
+          "sqs:ReceiveMessage",
+          "sqs:DeleteMessage",
+          "sqs:GetQueueAttributes"
+        ]
+        Resource = [
+          aws_sqs_queue.chunk_events.arn
+        ]
+      }
+    ]
+  })
+}
+
 resource "aws_iam_role_policy" "lambda_ecs" {
   name = "ecs-access"
   role = aws_iam_role.lambda.id
@@ -106,6 +176,16 @@ resource "aws_iam_role_policy" "lambda_ecs" {
   })
 }
 
+# Submission token buckets per tier, as rate_limit.py reads them
+locals {
+  rate_limits_json = jsonencode({
+    for tier, limit in var.rate_limits : tier => {
+      capacityMinutes      = limit.capacity_minutes
+      refillMinutesPerHour = limit.refill_minutes_per_hour
+    }
+  })
+}
+
 # URL Processor Lambda (CON VPC)
 resource "aws_lambda_function" "url_processor" {
   filename         = "${path.module}/../../../lambda/dist/url_processor.zip"
@@ -119,10 +199,19 @@ resource "aws_lambda_function" "url_processor" {
 
   environment {
     variables = {
-      JOBS_TABLE       = var.jobs_table_name
-      FOG_NODES_DNS    = var.fog_nodes_dns
-      ECS_CLUSTER_NAME = var.ecs_cluster_name
-      ECS_SERVICE_NAME = var.ecs_service_name
+      JOBS_TABLE        = var.jobs_table_name
+      FOG_NODES_DNS     = var.fog_nodes_dns
+      ECS_CLUSTER_NAME  = var.ecs_cluster_name
+      ECS_SERVICE_NAME  = var.ecs_service_name
+      JOBS_QUEUE_URL    = var.jobs_queue_url
+      PRIORITY_TIERS    = jsonencode(var.priority_tiers)
+      BATCHES_TABLE     = var.batches_table_name
+      IDEMPOTENCY_TABLE = var.idempotency_table_name
+      RATE_LIMITS_TABLE = var.rate_limits_table_name
+      RATE_LIMITS       = local.rate_limits_json
+      CHUNKS_TABLE      = var.chunks_table_name
+      THROUGHPUT_TABLE  = var.throughput_table_name
+      WHISPER_TASKS     = var.whisper_task_count
     }
   }
 
@@ -151,6 +240,10 @@ resource "aws_lambda_function" "query_handler" {
       JOBS_TABLE            = var.jobs_table_name
       TRANSCRIPTIONS_TABLE  = var.transcriptions_table_name
       TRANSCRIPTIONS_BUCKET = var.transcriptions_bucket_name
+      BATCHES_TABLE         = var.batches_table_name
+      SEARCH_TABLE          = var.search_table_name
+      RATE_LIMITS_TABLE     = var.rate_limits_table_name
+      RATE_LIMITS           = local.rate_limits_json
     }
   }
 
@@ -170,7 +263,16 @@ resource "aws_lambda_function" "trigger_transcription" {
 
   environment {
     variables = {
-      WHISPER_SERVICE_DNS = var.whisper_service_dns
+      WHISPER_SERVICE_DNS   = var.whisper_service_dns
+      MAX_KEYS_PER_REQUEST  = "8"
+      DISPATCH_CONCURRENCY  = "8"
+      ROUTING_POLICY        = "p2c"
+      STATS_TTL_SECONDS     = "2"
+      STATS_MAX_AGE_SECONDS = "10"
+      CHUNKS_TABLE          = var.chunks_table_name
+      JOBS_TABLE            = var.jobs_table_name
+      HEDGE_PERCENTILE      = "95"
+      HEDGE_MAX_FRACTION    = "0.1"
     }
   }
 
@@ -183,12 +285,97 @@ resource "aws_lambda_function" "trigger_transcription" {
   tags = var.tags
 }
 
-resource "aws_lambda_permission" "allow_s3" {
-  statement_id  = "AllowExecutionFromS3"
+# Chunk upload events are batched through SQS before reaching the trigger
+resource "aws_sqs_queue" "chunk_events" {
+  name                       = "${var.project_name}-chunk-events"
+  visibility_timeout_seconds = 180 # >= 6x the trigger timeout
+  message_retention_seconds  = 86400
+
+  tags = var.tags
+}
+
+resource "aws_sqs_queue_policy" "chunk_events" {
+  queue_url = aws_sqs_queue.chunk_events.id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [{
+      Effect    = "Allow"
+      Principal = { Service = "s3.amazonaws.com" }
+      Action    = "sqs:SendMessage"
+      Resource  = aws_sqs_queue.chunk_events.arn
+      Condition = {
+        ArnEquals = { "aws:SourceArn" = var.processed_bucket_arn }
+      }
+    }]
+  })
+}
+
+resource "aws_lambda_event_source_mapping" "chunk_events" {
+  event_source_arn                   = aws_sqs_queue.chunk_events.arn
+  function_name                      = aws_lambda_function.trigger_transcription.arn
+  batch_size                         = 100
+  maximum_batching_window_in_seconds = 5
+  function_response_types            = ["ReportBatchItemFailures"]
+}
+
+# Straggler sweep: hedges chunks that exceed their job's latency percentile
+resource "aws_cloudwatch_event_rule" "hedge_stragglers" {
+  name                = "${var.project_name}-hedge-stragglers"
+  schedule_expression = "rate(1 minute)"
+
+  tags = var.tags
+}
+
+resource "aws_cloudwatch_event_target" "hedge_stragglers" {
+  rule = aws_cloudwatch_event_rule.hedge_stragglers.name
+  arn  = aws_lambda_function.trigger_transcription.arn
+}
+
+resource "aws_lambda_permission" "allow_hedge_schedule" {
+  statement_id  = "AllowExecutionFromEventBridge"
   action        = "lambda:InvokeFunction"
   function_name = aws_lambda_function.trigger_transcription.function_name
-  principal     = "s3.amazonaws.com"
-  source_arn    = var.processed_bucket_arn
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.hedge_stragglers.arn
+}
+
+# Job Notifier Lambda (SIN VPC): WebSocket routes + jobs stream fan-out
+resource "aws_lambda_function" "job_notifier" {
+  filename         = "${path.module}/../../../lambda/dist/job_notifier.zip"
+  function_name    = "${var.project_name}-job-notifier"
+  role             = aws_iam_role.lambda.arn
+  handler          = "main.handler"
+  source_code_hash = filebase64sha256("${path.module}/../../../lambda/dist/job_notifier.zip")
+  runtime          = "python3.11"
+  timeout          = 30
+  memory_size      = 256
+
+  environment {
+    variables = {
+      JOBS_TABLE                = var.jobs_table_name
+      CONNECTIONS_TABLE         = var.connections_table_name
+      MIN_PUSH_INTERVAL_SECONDS = "2"
+    }
+  }
+
+  tags = var.tags
+}
+
+# Only updates matter: INSERT has no watchers yet, REMOVE is the TTL sweep
+resource "aws_lambda_event_source_mapping" "jobs_stream" {
+  event_source_arn                   = var.jobs_stream_arn
+  function_name                      = aws_lambda_function.job_notifier.arn
+  starting_position                  = "LATEST"
+  batch_size                         = 100
+  maximum_batching_window_in_seconds = 1
+  maximum_retry_attempts             = 2
+
+  filter_criteria {
+    filter {
+      pattern = jsonencode({ eventName = ["MODIFY"] })
+    }
+  }
 }
 
 resource "aws_lambda_function" "post_processor" {
@@ -206,6 +393,10 @@ resource "aws_lambda_function" "post_processor" {
       TRANSCRIPTIONS_BUCKET = var.transcriptions_bucket_name
       JOBS_TABLE            = var.jobs_table_name
       TRANSCRIPTIONS_TABLE  = var.transcriptions_table_name
+      SEARCH_TABLE          = var.search_table_name
+      RATE_LIMITS_TABLE     = var.rate_limits_table_name
+      RATE_LIMITS           = local.rate_limits_json
+      THROUGHPUT_TABLE      = var.throughput_table_name
     }
   }
 
@@ -233,7 +424,7 @@ resource "aws_s3_bucket_notification" "post_processor_trigger" {
     lambda_function_arn = aws_lambda_function.post_processor.arn
     events              = ["s3:ObjectCreated:*"]
     filter_prefix       = "transcriptions/"
-    filter_suffix       = ".json"
+    filter_suffix       = ".tcb" # chunk results only, not the final exports
   }
 
   depends_on = [
@@ -266,6 +457,80 @@ variable "transcriptions_table_arn" {
   type = string
 }
 
+variable "batches_table_name" {
+  type = string
+}
+
+variable "batches_table_arn" {
+  type = string
+}
+
+variable "chunks_table_name" {
+  type = string
+}
+
+variable "chunks_table_arn" {
+  type = string
+}
+
+variable "connections_table_name" {
+  type = string
+}
+
+variable "connections_table_arn" {
+  type = string
+}
+
+variable "search_table_name" {
+  type = string
+}
+
+variable "search_table_arn" {
+  type = string
+}
+
+variable "idempotency_table_name" {
+  type = string
+}
+
+variable "idempotency_table_arn" {
+  type = string
+}
+
+variable "rate_limits_table_name" {
+  type = string
+}
+
+variable "rate_limits_table_arn" {
+  type = string
+}
+
+variable "rate_limits" {
+  description = "tier -> submission token bucket, in minutes of media"
+  type = map(object({
+    capacity_minutes        = number
+    refill_minutes_per_hour = number
+  }))
+}
+
+variable "throughput_table_name" {
+  type = string
+}
+
+variable "throughput_table_arn" {
+  type = string
+}
+
+variable "whisper_task_count" {
+  description = "Whisper service tasks sharing the backlog, for ETAs"
+  type        = number
+  default     = 1
+}
+
+variable "jobs_stream_arn" {
+  type = string
+}
+
 variable "transcriptions_bucket_arn" {
   type = string
 }
@@ -292,6 +557,20 @@ variable "ecs_service_name" {
   type = string
 }
 
+variable "jobs_queue_url" {
+  type = string
+}
+
+variable "jobs_queue_arn" {
+  type = string
+}
+
+variable "priority_tiers" {
+  description = "userId or API key -> priority tier (premium, standard, batch)"
+  type        = map(string)
+  default     = {}
+}
+
 variable "private_subnet_ids" {
   type = list(string)
 }
@@ -338,6 +617,22 @@ output "trigger_transcription_function_arn" {
   value = aws_lambda_function.trigger_transcription.arn
 }
 
+output "chunk_events_queue_arn" {
+  value = aws_sqs_queue.chunk_events.arn
+}
+
+output "job_notifier_function_name" {
+  value = aws_lambda_function.job_notifier.function_name
+}
+
+output "job_notifier_invoke_arn" {
+  value = aws_lambda_function.job_notifier.invoke_arn
+}
+
+output "lambda_role_id" {
+  value = aws_iam_role.lambda.id
+}
+
 output "post_processor_function_name" {
   value = aws_lambda_function.post_processor.function_name
 }
@@ -98,6 +98,10 @@ resource "aws_dynamodb_table" "jobs" {
   billing_mode = "PAY_PER_REQUEST"
   hash_key     = "jobId"
 
+  # Status changes are pushed to WebSocket clients (job_notifier Lambda)
+  stream_enabled   = true
+  stream_view_type = "NEW_IMAGE"
+
   attribute {
     name = "jobId"
     type = "S"
@@ -113,6 +117,16 @@ resource "aws_dynamodb_table" "jobs" {
     type = "N"
   }
 
+  attribute {
+    name = "batchId"
+    type = "S"
+  }
+
+  attribute {
+    name = "userId"
+    type = "S"
+  }
+
   global_secondary_index {
     name            = "StatusIndex"
     hash_key        = "status"
@@ -120,6 +134,24 @@ resource "aws_dynamodb_table" "jobs" {
     projection_type = "ALL"
   }
 
+  # Jobs of a bulk submission (aggregate progress on GET /batches/{id})
+  global_secondary_index {
+    name               = "BatchIndex"
+    hash_key           = "batchId"
+    range_key          = "createdAt"
+    projection_type    = "INCLUDE"
+    non_key_attributes = ["status", "progress", "transcriptionKey"]
+  }
+
+  # A user's jobs by creation time (GET /jobs?userId=); listing fields only
+  global_secondary_index {
+    name               = "UserIndex"
+    hash_key           = "userId"
+    range_key          = "createdAt"
+    projection_type    = "INCLUDE"
+    non_key_attributes = ["status", "progress", "updatedAt"]
+  }
+
   ttl {
     attribute_name = "ttl"
     enabled        = true
@@ -166,6 +198,221 @@ resource "aws_dynamodb_table" "transcriptions" {
   })
 }
 
+# Parent records of bulk (playlist/feed/URL list) submissions
+resource "aws_dynamodb_table" "batches" {
+  name         = "${var.project_name}-batches"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "batchId"
+
+  attribute {
+    name = "batchId"
+    type = "S"
+  }
+
+  ttl {
+    attribute_name = "ttl"
+    enabled        = true
+  }
+
+  tags = merge(var.tags, {
+    Name = "Batches Table"
+  })
+}
+
+# Chunk dispatch ledger: one item per dispatched chunk, used to detect
+# and hedge stragglers. "outstanding" is removed on completion, so the
+# OutstandingIndex only holds chunks still in flight.
+resource "aws_dynamodb_table" "chunks" {
+  name         = "${var.project_name}-chunks"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "jobId"
+  range_key    = "chunkId"
+
+  attribute {
+    name = "jobId"
+    type = "S"
+  }
+
+  attribute {
+    name = "chunkId"
+    type = "N"
+  }
+
+  attribute {
+    name = "outstanding"
+    type = "S"
+  }
+
+  attribute {
+    name = "dispatchedAt"
+    type = "N"
+  }
+
+  global_secondary_index {
+    name            = "OutstandingIndex"
+    hash_key        = "outstanding"
+    range_key       = "dispatchedAt"
+    projection_type = "ALL"
+  }
+
+  ttl {
+    attribute_name = "ttl"
+    enabled        = true
+  }
+
+  tags = merge(var.tags, {
+    Name = "Chunk Dispatch Table"
+  })
+}
+
+# Open WebSocket connections and the job each one watches
+resource "aws_dynamodb_table" "connections" {
+  name         = "${var.project_name}-connections"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "connectionId"
+
+  attribute {
+    name = "connectionId"
+    type = "S"
+  }
+
+  attribute {
+    name = "jobId"
+    type = "S"
+  }
+
+  # Sparse: only connections subscribed to a job
+  global_secondary_index {
+    name            = "JobIndex"
+    hash_key        = "jobId"
+    projection_type = "ALL"
+  }
+
+  ttl {
+    attribute_name = "ttl"
+    enabled        = true
+  }
+
+  tags = merge(var.tags, {
+    Name = "WebSocket Connections Table"
+  })
+}
+
+# Submission dedup: idempotency key -> jobId for the dedup window
+resource "aws_dynamodb_table" "idempotency" {
+  name         = "${var.project_name}-idempotency"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "idempotencyKey"
+
+  attribute {
+    name = "idempotencyKey"
+    type = "S"
+  }
+
+  ttl {
+    attribute_name = "ttl"
+    enabled        = true
+  }
+
+  tags = merge(var.tags, {
+    Name = "Submission Idempotency Keys"
+  })
+}
+
+# Per-user submission token buckets (admission control in url_processor)
+resource "aws_dynamodb_table" "rate_limits" {
+  name         = "${var.project_name}-rate-limits"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "userId"
+
+  attribute {
+    name = "userId"
+    type = "S"
+  }
+
+  tags = merge(var.tags, {
+    Name = "Submission Rate Limits"
+  })
+}
+
+# Pipeline throughput per metric and hour (post-processor writes, url_processor
+# reads the last day to estimate ETAs)
+resource "aws_dynamodb_table" "throughput" {
+  name         = "${var.project_name}-throughput"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "metric"
+  range_key    = "hour"
+
+  attribute {
+    name = "metric"
+    type = "S"
+  }
+
+  attribute {
+    name = "hour"
+    type = "N"
+  }
+
+  ttl {
+    attribute_name = "ttl"
+    enabled        = true
+  }
+
+  tags = merge(var.tags, {
+    Name = "Pipeline Throughput"
+  })
+}
+
+# Inverted index for transcript search: one item per (term, job),
+# holding the encoded segment start times where the term occurs
+resource "aws_dynamodb_table" "search" {
+  name         = "${var.project_name}-search"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "term"
+  range_key    = "jobId"
+
+  attribute {
+    name = "term"
+    type = "S"
+  }
+
+  attribute {
+    name = "jobId"
+    type = "S"
+  }
+
+  ttl {
+    attribute_name = "ttl"
+    enabled        = true
+  }
+
+  tags = merge(var.tags, {
+    Name = "Transcript Search Index"
+  })
+}
+
+# SQS work queue between url_processor and the fog nodes
+resource "aws_sqs_queue" "jobs_dlq" {
+  name                      = "${var.project_name}-jobs-dlq"
+  message_retention_seconds = 1209600 # 14 days
+
+  tags = var.tags
+}
+
+resource "aws_sqs_queue" "jobs" {
+  name                       = "${var.project_name}-jobs"
+  visibility_timeout_seconds = 300   # lease, extended by fog node heartbeats
+  receive_wait_time_seconds  = 20    # long polling
+  message_retention_seconds  = 345600 # 4 days
+
+  redrive_policy = jsonencode({
+    deadLetterTargetArn = aws_sqs_queue.jobs_dlq.arn
+    maxReceiveCount     = 5
+  })
+
+  tags = var.tags
+}
+
 data "aws_caller_identity" "current" {}
 
 # Variables
@@ -200,6 +447,13 @@ output "dynamodb_tables" {
   value = {
     jobs           = aws_dynamodb_table.jobs.name
     transcriptions = aws_dynamodb_table.transcriptions.name
+    chunks         = aws_dynamodb_table.chunks.name
+    batches        = aws_dynamodb_table.batches.name
+    connections    = aws_dynamodb_table.connections.name
+    search         = aws_dynamodb_table.search.name
+    idempotency    = aws_dynamodb_table.idempotency.name
+    rate_limits    = aws_dynamodb_table.rate_limits.name
+    throughput     = aws_dynamodb_table.throughput.name
   }
 }
 
@@ -207,9 +461,28 @@ output "dynamodb_table_arns" {
   value = {
     jobs           = aws_dynamodb_table.jobs.arn
     transcriptions = aws_dynamodb_table.transcriptions.arn
+    chunks         = aws_dynamodb_table.chunks.arn
+    batches        = aws_dynamodb_table.batches.arn
+    connections    = aws_dynamodb_table.connections.arn
+    search         = aws_dynamodb_table.search.arn
+    idempotency    = aws_dynamodb_table.idempotency.arn
+    rate_limits    = aws_dynamodb_table.rate_limits.arn
+    throughput     = aws_dynamodb_table.throughput.arn
   }
 }
 
+output "jobs_stream_arn" {
+  value = aws_dynamodb_table.jobs.stream_arn
+}
+
+output "jobs_queue_url" {
+  value = aws_sqs_queue.jobs.url
+}
+
+output "jobs_queue_arn" {
+  value = aws_sqs_queue.jobs.arn
+}
+
 output "web_bucket_name" {
   value = aws_s3_bucket.web_app.id
 }
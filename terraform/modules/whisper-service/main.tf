@@ -135,7 +135,8 @@ resource "aws_iam_role_policy" "ecs_task_dynamodb" {
       ]
       Resource = [
         var.jobs_table_arn,
-        var.transcriptions_table_arn
+        var.transcriptions_table_arn,
+        var.chunks_table_arn
       ]
     }]
   })
@@ -177,6 +178,14 @@ resource "aws_ecs_task_definition" "whisper_service" {
         name  = "TRANSCRIPTIONS_TABLE"
         value = var.transcriptions_table_name
       },
+      {
+        name  = "CHUNKS_TABLE"
+        value = var.chunks_table_name
+      },
+      {
+        name  = "TIER_WEIGHTS"
+        value = jsonencode(var.tier_weights)
+      },
       {
         name  = "WHISPER_MODEL"
         value = "small" # Start small for cost/speed
@@ -248,6 +257,18 @@ variable "jobs_table_name" {}
 variable "jobs_table_arn" {}
 variable "transcriptions_table_name" {}
 variable "transcriptions_table_arn" {}
+variable "chunks_table_name" {}
+variable "chunks_table_arn" {}
+
+variable "tier_weights" {
+  description = "Chunks per fair-scheduling turn for each priority tier"
+  type        = map(number)
+  default = {
+    premium  = 4
+    standard = 2
+    batch    = 1
+  }
+}
 
 variable "service_count" {
   default = 1
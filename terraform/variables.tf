@@ -16,8 +16,52 @@ variable "environment" {
   default     = "production"
 }
 
+variable "priority_tiers" {
+  description = "userId or API key -> priority tier for the whisper fair scheduler"
+  type        = map(string)
+  default     = {}
+}
+
+variable "tier_weights" {
+  description = "Chunks per fair-scheduling turn for each priority tier"
+  type        = map(number)
+  default = {
+    premium  = 4
+    standard = 2
+    batch    = 1
+  }
+}
+
+variable "rate_limits" {
+  description = "Per-user submission token bucket for each priority tier, in minutes of media"
+  type = map(object({
+    capacity_minutes        = number
+    refill_minutes_per_hour = number
+  }))
+  default = {
+    premium = {
+      capacity_minutes        = 3000
+      refill_minutes_per_hour = 1500
+    }
+    standard = {
+      capacity_minutes        = 600
+      refill_minutes_per_hour = 300
+    }
+    batch = {
+      capacity_minutes        = 1200
+      refill_minutes_per_hour = 240
+    }
+  }
+}
+
 variable "fog_node_count" {
   description = "Number of fog nodes"
   type        = number
   default     = 3
 }
+
+variable "whisper_service_count" {
+  description = "Number of whisper service tasks"
+  type        = number
+  default     = 1
+}